@@ -0,0 +1,109 @@
+"""Compares turn-by-turn battles with the batch battle engine.
+
+Every player fights its own enemy in its own room of a ring world. The
+contestants have so much health that no battle ends, so every tick
+resolves one exchange of every battle: first through Enemy.play_turn(),
+one battle after another as interactive sessions do, then through one
+BattleEngine.step() for all of them. The world's state hash is never
+read, so neither run pays for keeping it up to date. With --moveset
+adaptive every enemy keeps a model of its player's moves.
+
+Usage:
+    python -m benchmarks.battle_bench [--battles N] [--ticks N]
+        [--moveset NAME]
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+from typing import List, Optional
+from benchmarks.multiplayer_bench import build_ring_world
+from rpg.battles import BattleEngine
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.moves import CATALOG, OpponentModel
+from rpg.player import Player
+from rpg.world import World
+
+ENDLESS = 10 ** 9
+
+
+class Session:
+    """The parts of a game that a battle turn calls back into."""
+
+    def __init__(self, world: World) -> None:
+        self.world: World = world
+
+    def enemy_defeated(self) -> None:
+        """Battles in this benchmark never end."""
+
+
+def contestants(world: World, moveset: str) -> List[Player]:
+    """
+    Puts one player in every room and makes everyone endlessly healthy.
+
+    Args:
+        world: A ring world with one enemy per room.
+        moveset: The move set the enemies reply with.
+
+    Returns:
+        List[Player]: The players, in room order.
+    """
+    players = []
+    for index, room in enumerate(world.rooms.values()):
+        player = Player(name=f"Player {index}")
+        player.enter_room(room)
+        player._health = ENDLESS
+        room.npcs[0]._health = ENDLESS
+        room.npcs[0].moveset = moveset
+        players.append(player)
+    return players
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--moveset", default="default")
+    args = parser.parse_args()
+    world = build_ring_world(args.battles)
+    players = contestants(world, args.moveset)
+    session = Session(world)
+    moves = CATALOG.player
+    enemy_moves = CATALOG.get(args.moveset)
+    models: List[Optional[OpponentModel]] = [
+        OpponentModel(len(moves)) if enemy_moves.adaptive else None
+        for _ in players
+    ]
+    rng = random.Random(0)
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            for player, model in zip(players, models):
+                enemy: Enemy = player._current_room.npcs[0]
+                enemy.play_turn(player, session,
+                                moves.moves[rng.randrange(len(moves))],
+                                enemy_moves, model=model)
+        single = time.perf_counter() - start
+
+    engine = BattleEngine(world, random.Random(0))
+    handles = [engine.start(player, player._current_room.npcs[0])
+               for player in players]
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        for handle in handles:
+            engine.choose(handle, rng.randrange(len(moves)))
+        engine.step()
+    batched = time.perf_counter() - start
+
+    turns = args.battles * args.ticks
+    print(f"{args.battles} battles, {args.ticks} ticks, "
+          f"{args.moveset} enemies")
+    print(f"  one by one:    {single / turns * 1e6:>8.2f} us per turn")
+    print(f"  batch engine:  {batched / turns * 1e6:>8.2f} us per turn")
+    print(f"  speedup:       {single / batched:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares ways of handing out the player's current room.
+
+The old Player.get_current_room deep-copied the room. Because doors link
+rooms together, that copied every reachable room. This benchmark times
+that deepcopy against the RoomView now returned by get_current_room and
+the one-room Room.clone() behind Player.clone_current_room.
+
+Usage:
+    python -m benchmarks.current_room_bench [--rooms N] [--repeats N]
+"""
+import argparse
+import sys
+import time
+from copy import deepcopy
+from typing import Callable
+from benchmarks.multiplayer_bench import build_ring_world
+from rpg.player import Player
+
+
+def per_call(repeats: int, action: Callable[[], object]) -> float:
+    """
+    Times repeated calls of an action.
+
+    Args:
+        repeats: The number of calls.
+        action: The callable to time.
+
+    Returns:
+        float: The mean time per call in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        action()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=10000)
+    args = parser.parse_args()
+
+    world = build_ring_world(args.rooms)
+    player = Player(name="Bench")
+    player.enter_room(world.start_room)
+    # deepcopy recurses once per room along the ring of doors.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.rooms * 20))
+
+    deep = per_call(3, lambda: deepcopy(player._current_room))
+    view = per_call(args.repeats, lambda: player.get_current_room)
+    clone = per_call(args.repeats, player.clone_current_room)
+
+    print(f"{args.rooms} rooms")
+    print(f"  deepcopy (old get_current_room): {deep:>12,.1f} us")
+    print(f"  get_current_room view:           {view:>12,.3f} us")
+    print(f"  clone_current_room:              {clone:>12,.3f} us")
+
+
+if __name__ == "__main__":
+    main()
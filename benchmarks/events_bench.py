@@ -0,0 +1,42 @@
+"""Measures how many battle events per second the event log sustains.
+
+Usage:
+    python -m benchmarks.events_bench [--events N] [--segment-mb N]
+"""
+import argparse
+import tempfile
+import time
+from rpg.events import EventLog, read_events, segments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--segment-mb", type=float, default=8)
+    parser.add_argument("--batch", type=int, default=4096)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = EventLog(directory, max_bytes=int(args.segment_mb * 2**20),
+                       batch=args.batch)
+        start = time.perf_counter()
+        for turn in range(args.events):
+            log.emit("move", battle=turn // 8, actor="player", move="Spin",
+                     damage=12, enemy_health=88)
+        emit_s = time.perf_counter() - start
+        log.close()
+        total_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = sum(1 for _ in read_events(directory))
+        read_s = time.perf_counter() - start
+        files = len(segments(directory))
+
+    print(f"{args.events} events, {files} segments")
+    print(f"  emit:                 {args.events / emit_s:>12,.0f} events/s")
+    print(f"  emit + close:         {args.events / total_s:>12,.0f} events/s")
+    print(f"  read back:            {count / read_s:>12,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Times generating large worlds and measures the memory they take.
+
+Usage:
+    python -m benchmarks.generator_bench [--rooms N] [--seed N]
+"""
+import argparse
+import time
+import tracemalloc
+from rpg.generator import generate_world
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true",
+                        help="also trace allocations, which is slower")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    world = generate_world(args.rooms, args.seed)
+    build_s = time.perf_counter() - start
+    doors = sum(len(room.doors) for room in world.rooms.values())
+    npcs = sum(len(room.npcs) for room in world.rooms.values())
+
+    print(f"{args.rooms} rooms, {doors} doors, {npcs} NPCs")
+    print(f"  generate:               {build_s:>10,.2f} s")
+    print(f"  per room:               {build_s / args.rooms * 1e6:>10,.2f} us")
+
+    if args.memory:
+        del world
+        tracemalloc.start()
+        world = generate_world(args.rooms, args.seed)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  memory:                 {size / 2**20:>10,.1f} MiB")
+        print(f"  per room:               {size / args.rooms:>10,.0f} B")
+
+
+if __name__ == "__main__":
+    main()
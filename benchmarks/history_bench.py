@@ -0,0 +1,78 @@
+"""Measures the memory and speed of the game history on a large world.
+
+Every command strikes an enemy or moves an NPC somewhere in a generated
+world, and a snapshot is taken after each one. The memory the snapshots
+take is compared with what full copies of the world would take.
+
+Usage:
+    python -m benchmarks.history_bench [--rooms N] [--commands N]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.history import History, PersistentVector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--commands", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = Game(world=generate_world(args.rooms, args.seed))
+    world = game.world
+    rooms = list(world.rooms.values())
+    rng = random.Random(args.seed)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    copy = PersistentVector([world.room_state(room) for room in rooms])
+    one_copy = tracemalloc.get_traced_memory()[0] - before
+    del copy
+    history = History(game, capacity=args.commands)
+    start_memory = tracemalloc.get_traced_memory()[0]
+
+    record_s = 0.0
+    for _ in range(args.commands):
+        room = rng.choice(rooms)
+        npcs = list(room.npcs)
+        if npcs:
+            npc = rng.choice(npcs)
+            if hasattr(npc, "_health"):
+                world.strike(room, npc, rng.randint(1, 20))
+            elif room.doors:
+                target = rng.choice(room.doors).leads_to
+                world.move_npc(npc, room, target)
+        start = time.perf_counter()
+        history.record(game, "command")
+        record_s += time.perf_counter() - start
+    snapshots_memory = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+
+    jumps = 200
+    start = time.perf_counter()
+    for _ in range(jumps):
+        history.goto(game, rng.randrange(len(history)))
+    goto_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(jumps):
+        history.undo(game)
+    undo_s = time.perf_counter() - start
+
+    print(f"{args.rooms} rooms, {len(history)} snapshots")
+    print(f"  record:                 "
+          f"{record_s / args.commands * 1e6:>10,.1f} us")
+    print(f"  snapshots:              {snapshots_memory / 2**20:>10,.1f} MiB")
+    print(f"  per snapshot:           "
+          f"{snapshots_memory / args.commands:>10,.0f} B")
+    print(f"  one full copy:          {one_copy / 2**20:>10,.1f} MiB")
+    print(f"  random jump:            {goto_s / jumps * 1e3:>10,.2f} ms")
+    print(f"  undo one command:       {undo_s / jumps * 1e3:>10,.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Measures shared-world throughput with many concurrent players.
+
+Every player thread walks through random doors and dances against the
+enemy in each room it reaches, respawning enemies it defeats. The run is
+repeated with one lock for the whole world to show what per-room locking
+saves.
+
+Usage:
+    python -m benchmarks.multiplayer_bench [--rooms N] [--ops N]
+"""
+import argparse
+import random
+import threading
+import time
+from typing import Dict, List
+from rpg.npcs.enemy import Enemy
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.world import World
+
+
+PLAYER_COUNTS = (1, 8, 64)
+
+
+class GlobalLockWorld(World):
+    """World variant that guards every room with one lock."""
+
+    def __init__(self, rooms: Dict[str, Room], start_room: Room) -> None:
+        super().__init__(rooms, start_room)
+        self._global_lock: threading.RLock = threading.RLock()
+
+    def lock_for(self, room: Room) -> threading.RLock:
+        return self._global_lock
+
+
+def build_ring_world(n_rooms: int, world_cls: type = World) -> World:
+    """
+    Builds a ring of rooms, each holding one enemy.
+
+    Args:
+        n_rooms: The number of rooms in the ring.
+        world_cls: The World class to instantiate.
+
+    Returns:
+        World: The generated world.
+    """
+    rooms: Dict[str, Room] = {
+        f"Room {i}": Room(description=f"Room {i}") for i in range(n_rooms)
+    }
+    ring: List[Room] = list(rooms.values())
+    for i, room in enumerate(ring):
+        room.add_door(Door(description="Next door",
+                           leads_to=ring[(i + 1) % n_rooms]))
+        room.add_door(Door(description="Previous door",
+                           leads_to=ring[i - 1]))
+        room.add_npc(Enemy(description=f"Enemy {i}",
+                           interact_message="Bring it on!"))
+    return world_cls(rooms, ring[0])
+
+
+def player_session(world: World, ops: int, seed: int,
+                   hold_seconds: float) -> None:
+    """
+    Runs one headless player through the shared world.
+
+    Args:
+        world: The shared world.
+        ops: The number of moves and strikes to perform.
+        seed: Seed of the player's random choices.
+        hold_seconds: Simulated work done while holding a room's lock.
+    """
+    rng = random.Random(seed)
+    room: Room = world.start_room
+    for _ in range(ops):
+        room = rng.choice(room.doors).leads_to
+        with world.lock_for(room):
+            enemy = room.npcs[0] if room.npcs else None
+            if hold_seconds:
+                time.sleep(hold_seconds)
+        if enemy is None:
+            continue
+        remaining = world.strike(room, enemy, rng.randint(5, 25))
+        if remaining is not None and remaining <= 0:
+            if world.remove_npc(room, enemy):
+                world.add_npc(room, Enemy(description=enemy.description,
+                                          interact_message="Again!"))
+
+
+def run(world: World, players: int, total_ops: int,
+        hold_seconds: float) -> float:
+    """
+    Runs the given number of players concurrently.
+
+    Args:
+        world: The shared world.
+        players: The number of concurrent player threads.
+        total_ops: The operations shared out between all players.
+        hold_seconds: Simulated work done while holding a room's lock.
+
+    Returns:
+        float: Throughput in operations per second.
+    """
+    ops = max(1, total_ops // players)
+    threads = [
+        threading.Thread(target=player_session,
+                         args=(world, ops, seed, hold_seconds))
+        for seed in range(players)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return ops * players / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=256)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--hold-us", type=float, default=0.0,
+                        help="simulated work inside a room's lock, in "
+                             "microseconds (sleeping releases the GIL)")
+    args = parser.parse_args()
+    hold_seconds = args.hold_us / 1e6
+
+    print(f"{'players':>8} {'per-room ops/s':>16} {'global ops/s':>14}")
+    for players in PLAYER_COUNTS:
+        per_room = run(build_ring_world(args.rooms), players,
+                       args.ops, hold_seconds)
+        global_lock = run(build_ring_world(args.rooms, GlobalLockWorld),
+                          players, args.ops, hold_seconds)
+        print(f"{players:>8} {per_room:>16,.0f} {global_lock:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
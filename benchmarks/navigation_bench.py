@@ -0,0 +1,51 @@
+"""Times building the door graph and answering route queries.
+
+Usage:
+    python -m benchmarks.navigation_bench [--rooms N] [--queries N]
+"""
+import argparse
+import random
+import time
+from rpg.generator import generate_world
+from rpg.navigation import WorldGraph, has_undefeated_enemy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    rooms = generate_world(args.rooms, npcs_per_room=0.03).rooms
+    start = time.perf_counter()
+    graph = WorldGraph(rooms)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    pairs = [(rng.randrange(args.rooms), rng.randrange(args.rooms))
+             for _ in range(args.queries)]
+    graph.route(*pairs[0])
+    start = time.perf_counter()
+    for source, goal in pairs:
+        graph.route(source, goal)
+    route_us = (time.perf_counter() - start) / len(pairs) * 1e6
+
+    start = time.perf_counter()
+    for source, _ in pairs:
+        graph.nearest(source, has_undefeated_enemy)
+    nearest_us = (time.perf_counter() - start) / len(pairs) * 1e6
+
+    start = time.perf_counter()
+    for source, goal in pairs:
+        graph.route(source, source)
+    repeat_us = (time.perf_counter() - start) / len(pairs) * 1e6
+
+    print(f"{args.rooms} rooms, {len(graph.targets)} doors")
+    print(f"  index build:              {build_ms:>10,.1f} ms")
+    print(f"  route (random pair):      {route_us:>10,.1f} us")
+    print(f"  nearest enemy:            {nearest_us:>10,.1f} us")
+    print(f"  route (same room):        {repeat_us:>10,.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Times whole party battles against today's one-on-one battle loop.
+
+The one-on-one baseline is Enemy.interact(), the loop a player goes
+through in the game, with random move choices and its output thrown
+away. Party battles of growing size then run to the end with
+PartyBattle.fight(), every player dancing random moves.
+
+Usage:
+    python -m benchmarks.party_bench [--battles N] [--sizes 1,10,50]
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+from typing import List, Tuple
+from rpg.battles import PartyBattle
+from rpg.npcs.enemy import Enemy
+from rpg.player import Player
+from rpg.room.room import Room
+from rpg.world import World
+
+
+class RandomScanner:
+    """Picks a random dance move whenever the battle asks for one."""
+
+    def __init__(self, seed: int) -> None:
+        self.rng: random.Random = random.Random(seed)
+
+    def read_int(self, prompt: str = "") -> int:
+        return self.rng.randrange(3)
+
+
+class Session:
+    """The parts of a game that a battle calls back into."""
+
+    def __init__(self, world: World) -> None:
+        self.world: World = world
+
+    def enemy_defeated(self) -> None:
+        """Wins are not counted in this benchmark."""
+
+    def reset_game(self) -> None:
+        """Losses do not restart anything in this benchmark."""
+
+    def play(self) -> None:
+        """Losses do not restart anything in this benchmark."""
+
+
+def arena(size: int) -> Tuple[World, List[Player], List[Enemy]]:
+    """
+    Builds one room holding a crew, and a party standing in it.
+
+    Args:
+        size: The number of players and of enemies.
+
+    Returns:
+        Tuple[World, List[Player], List[Enemy]]: The world, the party and
+        the crew.
+    """
+    room = Room(description="Dance hall")
+    world = World({"Dance hall": room}, room)
+    players = []
+    for index in range(size):
+        player = Player(name=f"Player {index}")
+        player.enter_room(room)
+        players.append(player)
+    enemies = [Enemy(description=f"Rival {index}", interact_message="Hi")
+               for index in range(size)]
+    for enemy in enemies:
+        world.add_npc(room, enemy)
+    return world, players, enemies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battles", type=int, default=200)
+    parser.add_argument("--sizes", default="1,10,50")
+    args = parser.parse_args()
+
+    setups = [arena(1) for _ in range(args.battles)]
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        for seed, (world, (player,), (enemy,)) in enumerate(setups):
+            random.seed(seed)
+            enemy.interact(player, RandomScanner(seed), Session(world))
+        baseline = (time.perf_counter() - start) / args.battles
+    print(f"{args.battles} battles of each kind")
+    print(f"  Enemy.interact, 1 vs 1:   {baseline * 1e3:>8.3f} ms per battle")
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        setups = [arena(size) for _ in range(args.battles)]
+        rounds = 0
+        start = time.perf_counter()
+        for seed, (world, players, enemies) in enumerate(setups):
+            battle = PartyBattle(world, players, enemies,
+                                 rng=random.Random(seed))
+            battle.fight()
+            rounds += battle.rounds
+        elapsed = (time.perf_counter() - start) / args.battles
+        print(f"  PartyBattle, {size:>2} vs {size:<2}:  "
+              f"{elapsed * 1e3:>8.3f} ms per battle, "
+              f"{rounds / args.battles:>5.1f} rounds, "
+              f"{elapsed / baseline:>5.2f}x the 1 vs 1 loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Times replaying and verifying long recorded sessions.
+
+The sessions wander the default world: they look around, walk through
+random doors and travel to random rooms, so every command does real work
+without ending the game.
+
+Usage:
+    python -m benchmarks.replay_bench [--commands N] [--recordings N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+from rpg.replay import Recording, replay, state_hash, verify, verify_files
+
+
+def wandering_session(commands: int, seed: int) -> Recording:
+    """
+    Builds a recording of a session that explores without fighting.
+
+    Args:
+        commands: The number of main menu commands.
+        seed: Seed of the session and of the command choices.
+
+    Returns:
+        Recording: The recording, with its final state hash filled in.
+    """
+    rng = random.Random(seed)
+    inputs: List[int] = []
+    for _ in range(commands):
+        command = rng.choice((0, 1, 6))
+        inputs.append(command)
+        if command == 1:
+            # Every room of the default world has at least one door.
+            inputs.append(0)
+        elif command == 6:
+            inputs.append(rng.randrange(1, 7))
+    recording = Recording(seed, inputs)
+    recording.final_hash = state_hash(replay(recording))
+    return recording
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=10000)
+    parser.add_argument("--recordings", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    recording = wandering_session(args.commands, seed=1)
+    start = time.perf_counter()
+    ok, _ = verify(recording)
+    single_ms = (time.perf_counter() - start) * 1000
+    assert ok, "a replay did not reach its recorded state"
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(args.recordings):
+            path = os.path.join(directory, f"{index}.json")
+            wandering_session(200, seed=index).save(path)
+            paths.append(path)
+        start = time.perf_counter()
+        results = verify_files(paths, args.workers)
+        batch_s = time.perf_counter() - start
+    failed = sum(1 for _, ok, _ in results if not ok)
+
+    print(f"one session of {args.commands} commands")
+    print(f"  verify:                 {single_ms:>10,.1f} ms")
+    print(f"  per command:            "
+          f"{single_ms * 1000 / args.commands:>10,.1f} us")
+    print(f"{args.recordings} sessions of 200 commands, {failed} failed")
+    print(f"  batch verify:           {batch_s:>10,.2f} s")
+    print(f"  per recording:          "
+          f"{batch_s * 1000 / args.recordings:>10,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compares rebuilding a world against resetting it in place.
+
+Before each reset, a handful of battles are simulated the way a short
+session would: a few enemies are hit, defeated and removed. The timings
+cover a full rebuild, World.reset() of the dirty rooms only and
+World.reset(everything=True).
+
+Usage:
+    python -m benchmarks.reset_bench [--sizes 1000,10000] [--battles N]
+"""
+import argparse
+import random
+import time
+from typing import Callable
+from benchmarks.multiplayer_bench import build_ring_world
+from rpg.world import World, build_default_world
+
+
+def play_battles(world: World, battles: int, rng: random.Random) -> None:
+    """
+    Defeats and removes the enemies of a few random rooms.
+
+    Args:
+        world: The world to change.
+        battles: The number of rooms to fight in.
+        rng: Source of the room choices.
+    """
+    rooms = list(world.rooms.values())
+    for room in rng.sample(rooms, min(battles, len(rooms))):
+        for npc in list(room.npcs):
+            if hasattr(npc, "_health"):
+                world.strike(room, npc, 100)
+                world.remove_npc(room, npc)
+
+
+def best_of(repeats: int, setup: Callable[[], None],
+            action: Callable[[], object]) -> float:
+    """
+    Times an action several times and keeps the best run.
+
+    Args:
+        repeats: How often to run the action.
+        setup: Untimed preparation before each run.
+        action: The timed callable.
+
+    Returns:
+        float: The fastest run in microseconds.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--battles", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(f"{'rooms':>8} {'rebuild us':>12} {'reset us':>10} "
+          f"{'full reset us':>14}")
+    worlds = [("default", build_default_world, build_default_world())]
+    for size in (int(size) for size in args.sizes.split(",")):
+        worlds.append((str(size), lambda size=size: build_ring_world(size),
+                       build_ring_world(size)))
+
+    for label, build, world in worlds:
+        def dirty(world: World = world) -> None:
+            play_battles(world, args.battles, rng)
+
+        rebuild = best_of(max(1, args.repeats // 2), lambda: None, build)
+        reset = best_of(args.repeats, dirty, world.reset)
+        full = best_of(args.repeats, dirty,
+                       lambda world=world: world.reset(everything=True))
+        print(f"{label:>8} {rebuild:>12,.0f} {reset:>10,.1f} {full:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compares NPC storage in a crowded room: plain list against NPCRoster.
+
+Each run fills one room with NPCs, then removes every enemy the way
+defeated enemies leave a room, and finally asks for the enemies still
+standing.
+
+Usage:
+    python -m benchmarks.roster_bench [--npcs N]
+"""
+import argparse
+import time
+from typing import List
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.npcs.roster import NPCRoster
+
+
+def crowd(size: int) -> List[NPC]:
+    """
+    Creates a crowd where every third NPC is an enemy.
+
+    Args:
+        size: The number of NPCs.
+
+    Returns:
+        List[NPC]: The NPCs.
+    """
+    return [
+        Enemy(description=f"Rival {i}", interact_message="Go")
+        if i % 3 == 0 else NPC(description=f"Fan {i}", interact_message="Hi")
+        for i in range(size)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--npcs", type=int, default=5000)
+    args = parser.parse_args()
+    npcs = crowd(args.npcs)
+    enemies = [npc for npc in npcs if isinstance(npc, Enemy)]
+
+    start = time.perf_counter()
+    as_list = list(npcs)
+    for enemy in enemies:
+        as_list.remove(enemy)
+    [npc for npc in as_list if isinstance(npc, Enemy)]
+    list_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    roster = NPCRoster(npcs)
+    for enemy in enemies:
+        roster.discard(enemy)
+    roster.of_type(Enemy)
+    roster_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.npcs} NPCs, {len(enemies)} enemies removed")
+    print(f"  list.remove:    {list_ms:>10,.1f} ms")
+    print(f"  NPCRoster:      {roster_ms:>10,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
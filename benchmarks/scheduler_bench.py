@@ -0,0 +1,55 @@
+"""Times the world scheduler with a large number of sleeping NPC actions.
+
+Every NPC acts once per period, so each tick only a small share of them
+is due. A scheduler that scans every NPC per tick pays for all of them;
+this one should pay only for the ones that act.
+
+Usage:
+    python -m benchmarks.scheduler_bench [--actions N] [--period N]
+"""
+import argparse
+import time
+from typing import Optional
+from rpg.scheduler import Action
+from rpg.world import World
+
+
+class Nod(Action):
+    """The cheapest possible action, so the scheduler itself is timed."""
+
+    def __call__(self, world: World) -> Optional[int]:
+        return self.every
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=1000000)
+    parser.add_argument("--period", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+    world = World({}, None)
+
+    start = time.perf_counter()
+    for i in range(args.actions):
+        world.scheduler.schedule(Nod(args.period), 1 + i % args.period)
+    schedule_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    fired = world.scheduler.advance(args.ticks)
+    elapsed = time.perf_counter() - start
+
+    empty = World({}, None)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        empty.scheduler.advance()
+    idle_us = (time.perf_counter() - start) / args.ticks * 1e6
+
+    print(f"{args.actions} actions, one run every {args.period} ticks")
+    print(f"  schedule all:          {schedule_ms:>10,.1f} ms")
+    print(f"  per tick:              {elapsed / args.ticks * 1e3:>10,.2f} ms")
+    print(f"  per action run:        {elapsed / fired * 1e6:>10,.2f} us")
+    print(f"  idle tick:             {idle_us:>10,.2f} us")
+
+
+if __name__ == "__main__":
+    main()
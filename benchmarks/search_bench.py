@@ -0,0 +1,100 @@
+"""Times text searches on a generated world against scanning every room.
+
+The world's search index is built once, then each query is timed through
+SearchIndex.query(), and once as a scan that reads every room, door and
+NPC as a player walking the world would. Updates are timed as NPCs moving
+or being defeated followed by a query, which brings the index up to date.
+
+Usage:
+    python -m benchmarks.search_bench [--rooms N] [--repeat N]
+"""
+import argparse
+import gc
+import random
+import time
+from typing import List
+from rpg.generator import generate_world
+from rpg.npcs.enemy import Enemy
+from rpg.search import words
+from rpg.world import World
+
+QUERIES = ("rival 4242", "medic", "door to room 12", "fan 99", "zebra")
+
+
+def scan(world: World, text: str, limit: int = 10) -> List[str]:
+    """
+    Finds matches by reading every room, door and NPC.
+
+    Args:
+        world: The world.
+        text: The query, with the last word as a prefix.
+        limit: The most matches to return.
+
+    Returns:
+        List[str]: The descriptions of the matches.
+    """
+    *whole, prefix = words(text)
+    found: List[str] = []
+    for room in world.rooms.values():
+        texts = ([room.description]
+                 + [door.description for door in room.doors]
+                 + [f"{npc.description} {npc.interact_message}"
+                    for npc in room.npcs])
+        for described in texts:
+            present = words(described)
+            if all(word in present for word in whole) and any(
+                    word.startswith(prefix) for word in present):
+                found.append(described)
+                if len(found) >= limit:
+                    return found
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    world = generate_world(args.rooms)
+
+    gc.disable()
+    start = time.perf_counter()
+    index = world.search
+    built = time.perf_counter() - start
+    gc.enable()
+    print(f"{len(index):,} entities in {args.rooms:,} rooms, indexed in "
+          f"{built:.2f} s")
+
+    for text in QUERIES:
+        # The first query also names the world's rooms, once per world.
+        index.query(text)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            matches = index.query(text)
+        indexed = (time.perf_counter() - start) / args.repeat
+        start = time.perf_counter()
+        scan(world, text)
+        scanned = time.perf_counter() - start
+        print(f"  {text!r:<20} {len(matches):>3} matches  "
+              f"index {indexed * 1e6:>8.1f} us  "
+              f"scan {scanned * 1e3:>9.1f} ms")
+
+    rng = random.Random(0)
+    rooms = list(world.rooms.values())
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        room = rng.choice(rooms)
+        while not room.npcs:
+            room = rng.choice(rooms)
+        npc = room.npcs[0]
+        if isinstance(npc, Enemy):
+            world.strike(room, npc, 100)
+        else:
+            world.move_npc(npc, room, rng.choice(rooms))
+        index.query(npc.description)
+    updated = (time.perf_counter() - start) / args.repeat
+    print(f"  move or defeat, then query:      {updated * 1e6:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measures cold-start time of the game against a regression budget.
+
+Two numbers are reported:
+
+* the wall time from launching ``python main.py`` until the first
+  "What do you want to do?" prompt is printed, and
+* the import time of every ``rpg`` module, taken from ``-X importtime``.
+
+Each measurement keeps the best of several runs. The script exits with
+status 1 when a measurement exceeds its budget.
+
+Usage:
+    python -m benchmarks.startup_bench [--runs N] [--prompt-budget-ms MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Tuple
+
+
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PROMPT: str = "What do you want to do?"
+
+# Budgets in milliseconds, generous enough for a loaded CI machine.
+PROMPT_BUDGET_MS: float = 1500.0
+IMPORT_BUDGET_MS: float = 600.0
+FORBIDDEN_MODULES: Tuple[str, ...] = ("unittest", "tests")
+
+
+def time_to_first_prompt() -> float:
+    """
+    Launches main.py and waits for the main menu.
+
+    Returns:
+        float: Milliseconds until the first prompt appeared.
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, "main.py")],
+            cwd=cwd, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        for line in process.stdout:
+            if FIRST_PROMPT in line:
+                elapsed = (time.perf_counter() - start) * 1000
+                break
+        else:
+            raise RuntimeError("main.py exited before showing its menu")
+        process.communicate("5\n")
+    return elapsed
+
+
+def import_times() -> Dict[str, Tuple[float, float]]:
+    """
+    Imports rpg.game in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Self and cumulative import time in
+        milliseconds, keyed by module name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import rpg.game"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    times: Dict[str, Tuple[float, float]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            own, cumulative = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue
+        times[fields[2].strip()] = (own / 1000, cumulative / 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prompt-budget-ms", type=float,
+                        default=PROMPT_BUDGET_MS)
+    parser.add_argument("--import-budget-ms", type=float,
+                        default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    prompt_ms = min(time_to_first_prompt() for _ in range(args.runs))
+    runs = [import_times() for _ in range(args.runs)]
+    best: Dict[str, Tuple[float, float]] = {
+        name: min(run[name] for run in runs if name in run)
+        for name in runs[0]
+    }
+
+    print(f"{'module':<24} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (own, cumulative) in best.items():
+        if name == "rpg" or name.startswith("rpg."):
+            print(f"{name:<24} {own:>9.2f} {cumulative:>14.2f}")
+    print(f"\nmain.py to first prompt: {prompt_ms:.1f} ms "
+          f"(budget {args.prompt_budget_ms:.0f} ms)")
+
+    failures = []
+    if prompt_ms > args.prompt_budget_ms:
+        failures.append("time to first prompt")
+    if best["rpg.game"][1] > args.import_budget_ms:
+        failures.append("rpg.game import time")
+    leaked = [name for name in best
+              if name.split(".")[0] in FORBIDDEN_MODULES]
+    if leaked:
+        failures.append(f"test modules on the import path: {leaked}")
+    if failures:
+        print("Over budget: " + ", ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compares the incremental state hash with hashing the saved JSON.
+
+For each world size it times hashing the world the first time, reading
+the maintained hash, a strike with the hash kept up to date, recomputing
+the hash from scratch, and the SHA-256 of the canonical save JSON that
+recordings use.
+
+Usage:
+    python -m benchmarks.statehash_bench [--sizes 100,10000,100000]
+"""
+import argparse
+import time
+from typing import Callable
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.npcs.enemy import Enemy
+from rpg.replay import state_hash
+from rpg.statehash import game_hash, recompute_game_hash
+from benchmarks.reset_bench import best_of
+
+
+def per_call(action: Callable[[], object], calls: int) -> float:
+    """
+    Times an action repeated many times.
+
+    Args:
+        action: What to time.
+        calls: How many times to call it per run.
+
+    Returns:
+        float: The best time of one call, in microseconds.
+    """
+    def run() -> None:
+        for _ in range(calls):
+            action()
+    return best_of(5, lambda: None, run) / calls
+
+
+def strikes(game: Game) -> Callable[[], None]:
+    """
+    Returns an action that hits an enemy and then heals it back.
+
+    Args:
+        game: The game whose world is struck.
+
+    Returns:
+        Callable[[], None]: Two strikes that leave the enemy unchanged.
+    """
+    world = game.world
+    room = next(room for room in world.rooms.values()
+                if room.npcs.of_type(Enemy))
+    enemy = room.npcs.of_type(Enemy)[0]
+
+    def action() -> None:
+        world.strike(room, enemy, 1)
+        world.strike(room, enemy, -1)
+    return action
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000,100000")
+    args = parser.parse_args()
+
+    # A world that is never hashed pays nothing for the state hash.
+    unhashed_us = per_call(strikes(Game()), 2000) / 2
+    print(f"strike, world not hashed: {unhashed_us:>10,.2f} us")
+
+    for size in [int(size) for size in args.sizes.split(",")]:
+        game = Game(world=generate_world(size))
+        start = time.perf_counter()
+        game.world.state_hash
+        first_ms = (time.perf_counter() - start) * 1e3
+
+        read_us = per_call(lambda: game_hash(game), 10000)
+        strike_us = per_call(strikes(game), 2000) / 2
+        full_ms = per_call(lambda: recompute_game_hash(game), 1) / 1e3
+        json_ms = per_call(lambda: state_hash(game), 1) / 1e3
+        assert game_hash(game) == recompute_game_hash(game)
+
+        print(f"{size} rooms")
+        print(f"  first hash:             {first_ms:>12,.2f} ms")
+        print(f"  read maintained hash:   {read_us:>12,.2f} us")
+        print(f"  strike, hash kept:      {strike_us:>12,.2f} us")
+        print(f"  full recompute:         {full_ms:>12,.2f} ms")
+        print(f"  sha256 of save JSON:    {json_ms:>12,.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
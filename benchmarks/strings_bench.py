@@ -0,0 +1,102 @@
+"""Measures what sharing texts saves on the saves of generated worlds.
+
+A generated world is saved as it was before texts were shared, with
+every text written where it is used, and through rpg.strings.pack(),
+which writes each text once. Both saves are then read back, and the
+memory held by their texts is compared: the plain save gives every use
+of a text its own string, unpack() gives every use the same one.
+
+Usage:
+    python -m benchmarks.strings_bench [--rooms N]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.strings import TEXT_KEYS, pack, unpack
+
+
+def text_bytes(value: Any, seen: Dict[int, str]) -> Tuple[int, int]:
+    """
+    Adds up the memory of the texts of a save.
+
+    Args:
+        value: The save, as read back.
+        seen: The distinct strings found so far, by id().
+
+    Returns:
+        Tuple[int, int]: The uses of texts and the bytes of all their
+        strings, counting every string once however often it is used.
+    """
+    uses = size = 0
+    items = (value.items() if isinstance(value, dict)
+             else enumerate(value) if isinstance(value, list) else ())
+    for key, item in items:
+        if key in TEXT_KEYS and isinstance(item, str):
+            uses += 1
+            if id(item) not in seen:
+                seen[id(item)] = item
+                size += sys.getsizeof(item)
+        else:
+            more, extra = text_bytes(item, seen)
+            uses += more
+            size += extra
+    return uses, size
+
+
+def load(text: str, read: Callable[[Any], Any]) -> Tuple[Any, float, int]:
+    """
+    Reads a save back, timing it and measuring its memory.
+
+    Args:
+        text: The save file's contents.
+        read: Turns the parsed JSON into the state Game.fromJSON() reads.
+
+    Returns:
+        Tuple[Any, float, int]: The state, the seconds and the peak bytes
+        allocated reading it.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = read(json.loads(text))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return data, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100000)
+    args = parser.parse_args()
+    state = Game(world=generate_world(args.rooms)).toJSON()
+
+    start = time.perf_counter()
+    plain = json.dumps(state, indent=4)
+    plain_time = time.perf_counter() - start
+    start = time.perf_counter()
+    packed = json.dumps(pack(state), indent=4)
+    packed_time = time.perf_counter() - start
+    print(f"{args.rooms:,} rooms")
+    print(f"  save, every use     {len(plain) / 1e6:>8.2f} MB  "
+          f"in {plain_time:.2f} s")
+    print(f"  save, each once     {len(packed) / 1e6:>8.2f} MB  "
+          f"in {packed_time:.2f} s  "
+          f"({1 - len(packed) / len(plain):.0%} smaller)")
+
+    rows = (("every use", plain, lambda data: data),
+            ("each once", packed, unpack))
+    for label, text, read in rows:
+        data, elapsed, peak = load(text, read)
+        uses, size = text_bytes(data, {})
+        print(f"  load, {label:<12}  {size / 1e6:>8.2f} MB of text for "
+              f"{uses:,} uses  peak {peak / 1e6:.1f} MB  "
+              f"in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
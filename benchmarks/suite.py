@@ -0,0 +1,286 @@
+"""Times the game's hot paths and compares them with stored baselines.
+
+Every case runs on generated worlds of each requested size and keeps the
+best of a few runs. Results are compared with benchmarks/baselines.json,
+and a case counts as a regression when it is slower than its baseline
+times the threshold. Baselines depend on the machine, so record them
+with --update on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite [--sizes 100,10000] [--cases save,battle]
+                               [--threshold 1.5] [--update]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from unittest import mock
+from benchmarks.reset_bench import best_of
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.io_utils import Saver
+from rpg.npcs.enemy import Enemy
+
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# A case prepares a game of a given size and returns the untimed setup
+# run before each repeat, the timed action and how many operations one
+# action performs.
+Prepared = Tuple[Callable[[], None], Callable[[], object], int]
+Case = Callable[[int], Prepared]
+
+
+class ScriptedScanner:
+    """Answers the game's prompts from a fixed list of choices."""
+
+    def __init__(self, choices: Iterable[int], default: int) -> None:
+        """
+        Initializes the script.
+
+        Args:
+            choices: The answers, in order.
+            default: The answer once the script has run out.
+        """
+        self.choices: List[int] = list(choices)
+        self.default: int = default
+        self.position: int = 0
+
+    def read_int(self, prompt: str = "") -> int:
+        """
+        Returns the next scripted answer.
+
+        Args:
+            prompt: Ignored, the script does not need to see it.
+
+        Returns:
+            int: The answer.
+        """
+        if self.position < len(self.choices):
+            self.position += 1
+            return self.choices[self.position - 1]
+        return self.default
+
+
+def nothing() -> None:
+    """Setup for cases that need none."""
+
+
+def new_game(size: int) -> Game:
+    """
+    Starts a game in a generated world.
+
+    Args:
+        size: The number of rooms.
+
+    Returns:
+        Game: The game, with its player in the start room.
+    """
+    return Game(world=generate_world(size, seed=size))
+
+
+def construct(size: int) -> Prepared:
+    """Generates a world and starts a game in it."""
+    return nothing, lambda: new_game(size), 1
+
+
+def to_json(size: int) -> Prepared:
+    """Serializes a whole game."""
+    game = new_game(size)
+    return nothing, game.toJSON, 1
+
+
+def from_json(size: int) -> Prepared:
+    """Rebuilds a whole game from its serialized form."""
+    data = new_game(size).toJSON()
+    return nothing, lambda: Game.fromJSON(data), 1
+
+
+def save(size: int) -> Prepared:
+    """Writes a quicksave to disk."""
+    game = new_game(size)
+    saver = Saver(tempfile.mkdtemp(prefix="rpg-bench-"))
+    return nothing, lambda: saver.quick_save(game), 1
+
+
+def load(size: int) -> Prepared:
+    """Reads a quicksave from disk."""
+    saver = Saver(tempfile.mkdtemp(prefix="rpg-bench-"))
+    saver.quick_save(new_game(size))
+    return nothing, saver.quick_load, 1
+
+
+def battle(size: int) -> Prepared:
+    """Fights one enemy until it is defeated."""
+    game = new_game(size)
+    player = game.player
+    scanner = ScriptedScanner([], default=2)
+    enemy = Enemy(description="Benchmark rival", interact_message="Go")
+
+    def setup() -> None:
+        random.seed(0)
+        game.enemies_defeated = 0
+        player._health = 10**6
+        enemy._health = 100
+        game.world.remove_npc(player._current_room, enemy)
+        game.world.add_npc(player._current_room, enemy)
+
+    return setup, lambda: enemy.interact(player, scanner, game), 1
+
+
+def current_room(size: int) -> Prepared:
+    """Looks up the player's current room."""
+    player = new_game(size).player
+    calls = 1000
+
+    def action() -> None:
+        for _ in range(calls):
+            player.get_current_room
+
+    return nothing, action, calls
+
+
+def session(size: int) -> Prepared:
+    """Plays a scripted session through the main menu."""
+    game = new_game(size)
+    game.saver = Saver(tempfile.mkdtemp(prefix="rpg-bench-"))
+    # Look around, take the first door, look again, travel to the nearest
+    # contestant, list the company, save, load and quit. The answers are
+    # typed in, since loading replaces the game's scanner.
+    script = ["0", "1", "0", "0", "6", "0", "2", "99", "3", "4", "5"]
+    state = dict(game.__dict__)
+
+    def setup() -> None:
+        # Undo the load of the previous run, which replaced the game.
+        game.__dict__.clear()
+        game.__dict__.update(state)
+        game.reset_game()
+
+    def action() -> None:
+        with mock.patch("builtins.input", side_effect=script):
+            try:
+                game.play()
+            except SystemExit:
+                pass
+
+    return setup, action, 1
+
+
+CASES: Dict[str, Case] = {
+    "construct": construct,
+    "to_json": to_json,
+    "from_json": from_json,
+    "save": save,
+    "load": load,
+    "battle": battle,
+    "current_room": current_room,
+    "session": session,
+}
+
+
+def run_case(case: Case, size: int, repeats: int) -> float:
+    """
+    Times one case at one world size, hiding the game's output.
+
+    Args:
+        case: The case to run.
+        size: The number of rooms.
+        repeats: How many runs to take the best of.
+
+    Returns:
+        float: Microseconds per operation of the fastest run.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup, action, operations = case(size)
+        return best_of(repeats, setup, action) / operations
+
+
+def read_baselines(path: str) -> Dict[str, float]:
+    """
+    Reads stored baselines.
+
+    Args:
+        path: The baseline file.
+
+    Returns:
+        Dict[str, float]: Microseconds keyed by "case@size", empty if the
+        file does not exist yet.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def compare(result: float, baseline: Optional[float],
+            threshold: float) -> str:
+    """
+    Judges a result against its baseline.
+
+    Args:
+        result: The measured time.
+        baseline: The stored time, or None if there is none.
+        threshold: The slowdown factor that counts as a regression.
+
+    Returns:
+        str: "new", "ok", "faster" or "SLOWER".
+    """
+    if baseline is None:
+        return "new"
+    if result > baseline * threshold:
+        return "SLOWER"
+    if result * threshold < baseline:
+        return "faster"
+    return "ok"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000")
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=1.5)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--update", action="store_true",
+                        help="store the results as the new baselines")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.cases.split(",")
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    baselines = read_baselines(args.baselines)
+    regressions = 0
+    print(f"{'case':<14}{'rooms':>8}{'us/op':>14}{'baseline':>14}"
+          f"{'ratio':>8}  status")
+    for name in names:
+        for size in sizes:
+            key = f"{name}@{size}"
+            result = run_case(CASES[name], size, args.repeats)
+            baseline = baselines.get(key)
+            status = compare(result, baseline, args.threshold)
+            regressions += status == "SLOWER"
+            ratio = f"{result / baseline:.2f}" if baseline else "-"
+            shown = f"{baseline:,.1f}" if baseline else "-"
+            print(f"{name:<14}{size:>8}{result:>14,.1f}{shown:>14}"
+                  f"{ratio:>8}  {status}")
+            if args.update:
+                baselines[key] = round(result, 3)
+
+    if args.update:
+        with open(args.baselines, "w") as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+        print(f"Baselines written to {args.baselines}.")
+    elif regressions:
+        print(f"{regressions} case(s) slower than the threshold allows.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from rpg.game import Game
+import atexit
+import os
 
 if __name__ == "__main__":
     print(
@@ -10,5 +11,72 @@ if __name__ == "__main__":
         "are spread around BTS's building. Explore the rooms, defeat your "
         "competition, and win. Good Luck!"
     )
+    # Imported after the greeting so it shows while pydantic loads.
+    from rpg.game import Game
+
+    report_path = os.environ.get("RPG_PROFILE")
+    if report_path:
+        # Opt-in profiling: latencies, cProfile and allocation sites are
+        # written to the given file when the game exits.
+        from rpg.instrumentation import instruments
+
+        instruments.enable(report_path, profile=True, memory=True)
+        atexit.register(instruments.disable)
+
+    metrics_port = os.environ.get("RPG_METRICS_PORT")
+    metrics_file = os.environ.get("RPG_METRICS_FILE")
+    if metrics_port or metrics_file:
+        from rpg.metrics import registry
+
+        if metrics_port:
+            registry.serve(int(metrics_port))
+        if metrics_file:
+            atexit.register(registry.dump, metrics_file)
+
+    event_directory = os.environ.get("RPG_EVENT_LOG")
+    if event_directory:
+        from rpg.events import start_battle_log, stop_battle_log
+
+        start_battle_log(event_directory)
+        atexit.register(stop_battle_log)
+
+    policy_path = os.environ.get("RPG_POLICIES")
+    if policy_path:
+        # Enemies reply with, and the player is coached by, the move
+        # policies learned by python -m rpg.training.
+        from rpg.training import install_policies
+
+        install_policies(policy_path)
+
     game = Game()
+
+    admin_port = os.environ.get("RPG_ADMIN_PORT")
+    if admin_port:
+        # Answers search queries over HTTP as JSON, for tools and admins.
+        from rpg.search import serve
+
+        serve(lambda: game.world, int(admin_port))
+
+    history_size = os.environ.get("RPG_HISTORY")
+    if history_size:
+        # Keeps the given number of past states in memory and adds a
+        # rewind command to the menu, for testers.
+        from rpg.history import History
+
+        game.history = History(game, int(history_size))
+
+    recording_path = os.environ.get("RPG_RECORD")
+    if recording_path:
+        # Records the seed and every number entered, so the session can
+        # be replayed and verified with python -m rpg.replay.
+        from rpg.replay import Recording
+
+        recording = Recording.start(game)
+
+        def save_recording() -> None:
+            recording.finish(game)
+            recording.save(recording_path)
+
+        atexit.register(save_recording)
+
     game.play()
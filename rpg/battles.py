@@ -0,0 +1,533 @@
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
+from rpg import events
+from rpg.events import battle_ids, emit_battle
+from rpg.metrics import BATTLES_LOST, BATTLES_STARTED, BATTLES_WON
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.moves import (BRACE_DIVISOR, CATALOG, EFFECTS, MoveSet,
+                            OpponentModel)
+from rpg.room.room import Room
+from rpg.world import World
+
+Player = TypeVar("Player")
+
+# How a battle ended: "won", "lost", or "taken" when another contestant
+# defeated the enemy first.
+Outcome = Tuple[int, str]
+
+DIZZY: int = EFFECTS.index("dizzy") + 1
+HYPED: int = EFFECTS.index("hyped") + 1
+
+
+class _Prepared:
+    """A move set unpacked into flat tuples for the battle loop."""
+
+    __slots__ = ("source", "size", "lows", "spans", "moves", "keep",
+                 "alias", "effects", "turns", "rows")
+
+    def __init__(self, moves: MoveSet) -> None:
+        """
+        Unpacks a move set.
+
+        Args:
+            moves: The move set.
+        """
+        self.source: MoveSet = moves
+        self.size: int = len(moves)
+        self.moves = moves.moves
+        # A span of 0 marks a move with weighted damage, rolled by the
+        # move itself.
+        self.lows: Tuple[int, ...] = tuple(move.low for move in moves.moves)
+        self.spans: Tuple[int, ...] = tuple(
+            move.high - move.low + 1 if move.uniform else 0
+            for move in moves.moves
+        )
+        self.keep: Tuple[float, ...] = moves._picker.keep
+        self.alias: Tuple[int, ...] = moves._picker.alias
+        # The status effect of each move, as 1 + its index in EFFECTS, or
+        # 0 for none.
+        self.effects: Tuple[int, ...] = tuple(
+            EFFECTS.index(move.effect) + 1 if move.effect else 0
+            for move in moves.moves
+        )
+        self.turns: Tuple[int, ...] = tuple(move.turns
+                                            for move in moves.moves)
+        # The same, one row per move, unpacked in a single step.
+        self.rows: Tuple[Tuple[int, int, int, int], ...] = tuple(
+            zip(self.lows, self.spans, self.effects, self.turns)
+        )
+
+
+# Unpacked move sets by the identity of the set, kept with the set so
+# the identity is never reused while cached.
+_PREPARED: Dict[int, Tuple[MoveSet, _Prepared]] = {}
+
+
+def _prepared(name: str) -> _Prepared:
+    """
+    Returns a catalog move set unpacked, unpacking each set only once.
+
+    Args:
+        name: The name of the set in the catalog.
+
+    Returns:
+        _Prepared: The unpacked set.
+    """
+    moves = CATALOG.get(name)
+    cached = _PREPARED.get(id(moves))
+    if cached is None:
+        cached = _PREPARED[id(moves)] = (moves, _Prepared(moves))
+    return cached[1]
+
+
+class BattleEngine:
+    """Resolves the turns of every active battle together, once per tick.
+
+    A server hosting many sessions registers each battle with start() and
+    each player's chosen move with choose(). step() then resolves every
+    battle with a move waiting in one pass: the player's damage, the
+    strikes on the enemies, the enemies' replies, the health updates and
+    who won or lost. Battles whose player has not chosen yet wait for a
+    later tick.
+
+    The battles are stored as parallel lists indexed by a handle rather
+    than as one object each, and the step walks them in a single loop
+    that draws its random numbers straight from the generator. Enemies
+    whose move set has a learned policy reply by it, and enemies whose
+    moves counter player moves keep an OpponentModel per battle, as in
+    Enemy.interact(). Strikes go through World.strike_many(), so rooms
+    are locked, marked and hashed as with World.strike().
+
+    Unlike Enemy.interact() the engine prints nothing and leaves the
+    consequences of a battle to its caller: a player who lost is left
+    with no health, and a win is not counted towards the game.
+    """
+
+    def __init__(self, world: World,
+                 rng: Optional[random.Random] = None) -> None:
+        """
+        Initializes an engine with no battles.
+
+        Args:
+            world: The world the battles take place in.
+            rng: The source of every roll, a fresh generator by default.
+        """
+        self.world: World = world
+        self.rng: random.Random = rng or random.Random()
+        self._players: List[Optional[Dict[str, Any]]] = []
+        self._enemies: List[Optional[Enemy]] = []
+        self._rooms: List[Optional[Room]] = []
+        self._sets: List[Optional[_Prepared]] = []
+        self._models: List[Optional[OpponentModel]] = []
+        self._ids: List[int] = []
+        self._pending: List[int] = []
+        self._ready: List[int] = []
+        self._free: List[int] = []
+        self._player_moves: _Prepared = _prepared("player")
+        self._active: int = 0
+
+    def __len__(self) -> int:
+        return self._active
+
+    def start(self, player: "Player", enemy: Enemy,
+              room: Optional[Room] = None) -> int:
+        """
+        Starts a battle between a player and an enemy.
+
+        Args:
+            player: The player.
+            enemy: The enemy, which replies with its own move set.
+            room: The enemy's room, the player's current room by default.
+                An enemy that moves away is struck in its new room.
+
+        Returns:
+            int: The handle of the battle, for choose(). Handles of
+            finished battles are reused.
+        """
+        moves = _prepared(enemy.moveset)
+        room = room if room is not None else player._current_room
+        battle = next(battle_ids)
+        private = player.__pydantic_private__
+        model = (OpponentModel(self._player_moves.size)
+                 if moves.source.adaptive else None)
+        values = (private, enemy, room, moves, model, battle, -1)
+        if self._free:
+            handle = self._free.pop()
+            for column, value in zip(self._columns(), values):
+                column[handle] = value
+        else:
+            handle = len(self._ids)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        self._active += 1
+        BATTLES_STARTED.inc()
+        emit_battle("battle_start", battle=battle, enemy=enemy.description,
+                    player_health=private["_health"],
+                    enemy_health=enemy._health)
+        return handle
+
+    def _columns(self) -> Tuple[list, ...]:
+        """Returns the parallel lists in the order start() fills them."""
+        return (self._players, self._enemies, self._rooms, self._sets,
+                self._models, self._ids, self._pending)
+
+    def choose(self, handle: int, move: int) -> None:
+        """
+        Sets the move a player performs in the next step.
+
+        Choosing again before the step replaces the earlier choice.
+
+        Args:
+            handle: The battle.
+            move: The index of the player's move in the catalog.
+
+        Raises:
+            ValueError: If the battle is over or the move does not exist.
+        """
+        if not 0 <= handle < len(self._ids) or self._enemies[handle] is None:
+            raise ValueError(f"No active battle with handle {handle}.")
+        if not 0 <= move < self._player_moves.size:
+            raise ValueError(f"No player move with index {move}.")
+        if self._pending[handle] < 0:
+            self._ready.append(handle)
+        self._pending[handle] = move
+
+    def _finish(self, handle: int) -> None:
+        """
+        Frees the slot of a finished battle.
+
+        Args:
+            handle: The battle.
+        """
+        self._players[handle] = None
+        self._enemies[handle] = None
+        self._rooms[handle] = None
+        self._sets[handle] = None
+        self._models[handle] = None
+        self._pending[handle] = -1
+        self._free.append(handle)
+        self._active -= 1
+
+    def step(self) -> List[Outcome]:
+        """
+        Resolves one exchange of every battle with a chosen move.
+
+        Returns:
+            List[Outcome]: The handle and outcome of each battle that
+            ended, in the order the moves were chosen.
+        """
+        ready, self._ready = self._ready, []
+        if not ready:
+            return []
+        draw = self.rng.random
+        pending = self._pending
+        player_moves = self._player_moves
+        lows, spans = player_moves.lows, player_moves.spans
+        logging = events.battle_log is not None
+
+        # The players' moves, all struck in one batch.
+        enemies = self._enemies
+        rooms = self._rooms
+        models = self._models
+        chosen: List[int] = []
+        damages: List[int] = []
+        for handle in ready:
+            move = pending[handle]
+            pending[handle] = -1
+            chosen.append(move)
+            span = spans[move]
+            damage = (lows[move] + int(draw() * span) if span
+                      else player_moves.moves[move].roll(self.rng))
+            model = models[handle]
+            if model is not None:
+                if model.braced == move:
+                    damage //= BRACE_DIVISOR
+                model.observe(move)
+            damages.append(damage)
+        struck = [enemies[handle] for handle in ready]
+        remaining = self.world.strike_many([rooms[h] for h in ready],
+                                           struck, damages)
+
+        # The replies of the enemies still standing.
+        finished: List[Outcome] = []
+        players = self._players
+        sets = self._sets
+        ids = self._ids
+        for handle, move, damage, left in zip(ready, chosen, damages,
+                                              remaining):
+            if logging:
+                emit_battle("move", battle=ids[handle], actor="player",
+                            move=player_moves.moves[move].name,
+                            damage=damage, enemy_health=left)
+            if left is None or left <= 0:
+                outcome = "taken" if left is None else "won"
+                if left is not None:
+                    BATTLES_WON.inc()
+                self._end(handle, outcome, finished, left or 0)
+                continue
+            moves = sets[handle]
+            private = players[handle]
+            policy = moves.source.policy
+            model = models[handle]
+            if model is not None:
+                column = moves.source.reply(private["_health"], left,
+                                            self.rng, model)
+            elif policy is None:
+                column = int(draw() * moves.size)
+                keep = moves.keep[column]
+                if keep < 1.0 and draw() >= keep:
+                    column = moves.alias[column]
+            else:
+                column = policy.choose(private["_health"], left)
+            span = moves.spans[column]
+            reply = (moves.lows[column] + int(draw() * span) if span
+                     else moves.moves[column].roll(self.rng))
+            health = private["_health"] - reply
+            private["_health"] = health
+            if logging:
+                emit_battle("move", battle=ids[handle], actor="enemy",
+                            move=moves.moves[column].name, damage=reply,
+                            player_health=health)
+            if health <= 0:
+                BATTLES_LOST.inc()
+                self._end(handle, "lost", finished, left)
+        return finished
+
+    def _end(self, handle: int, outcome: str, finished: List[Outcome],
+             enemy_health: int) -> None:
+        """
+        Records the end of a battle and frees its slot.
+
+        Args:
+            handle: The battle.
+            outcome: How it ended.
+            finished: The step's list of ended battles.
+            enemy_health: The enemy's health at the end.
+        """
+        emit_battle("battle_end", battle=self._ids[handle], outcome=outcome,
+                    player_health=self._players[handle]["_health"],
+                    enemy_health=enemy_health)
+        finished.append((handle, outcome))
+        self._finish(handle)
+
+
+class PartyBattle:
+    """A dance battle between a party of players and a crew of enemies.
+
+    Every combatant is an index into parallel lists: its side, its health,
+    its moves, its chosen move and target and its status effects. Players
+    come first, then enemies. A round is a pass over the party and then
+    one over the crew, in which every standing combatant that is not
+    dizzy dances once at a standing opponent. The damage and effects of a
+    pass land together once it is done, so the order of the combatants
+    within a side never matters.
+
+    Players dance the move set in choose() with the target given there,
+    or a random move at a random enemy if they did not choose. Enemies
+    pick from their own move sets by weight and aim at random players.
+    Players' health is written back after every round, and enemies are
+    struck through World.strike_many(), so the world stays up to date
+    and an enemy defeated elsewhere counts as defeated here as well.
+    """
+
+    def __init__(self, world: World, players: Sequence["Player"],
+                 enemies: Sequence[Enemy], room: Optional[Room] = None,
+                 rng: Optional[random.Random] = None) -> None:
+        """
+        Starts the battle.
+
+        Args:
+            world: The world the battle takes place in.
+            players: The party, at least one player.
+            enemies: The crew, at least one enemy.
+            room: The room of the enemies, the first player's current room
+                by default.
+            rng: The source of every roll, a fresh generator by default.
+
+        Raises:
+            ValueError: If a side is empty.
+        """
+        if not players or not enemies:
+            raise ValueError("A party battle needs players and enemies.")
+        self.world: World = world
+        if room is None:
+            room = players[0]._current_room
+        self.room: Room = room
+        self.rng: random.Random = rng or random.Random()
+        self.players: Tuple["Player", ...] = tuple(players)
+        self.enemies: Tuple[Enemy, ...] = tuple(enemies)
+        self._privates: List[Dict[str, Any]] = [
+            player.__pydantic_private__ for player in players
+        ]
+        count = len(players) + len(enemies)
+        self.first_enemy: int = len(players)
+        self.side: List[int] = [0] * len(players) + [1] * len(enemies)
+        self.health: List[int] = (
+            [private["_health"] for private in self._privates]
+            + [enemy._health for enemy in enemies]
+        )
+        self.moves: List[_Prepared] = (
+            [_prepared("player")] * len(players)
+            + [_prepared(enemy.moveset) for enemy in enemies]
+        )
+        self.chosen: List[int] = [-1] * count
+        self.targets: List[int] = [-1] * count
+        self.dizzy: List[int] = [0] * count
+        self.hyped: List[int] = [0] * count
+        self.rounds: int = 0
+        self.outcome: Optional[str] = None
+        self.battle: int = next(battle_ids)
+        BATTLES_STARTED.inc()
+        emit_battle("battle_start", battle=self.battle,
+                    enemy=", ".join(enemy.description for enemy in enemies),
+                    players=len(players), enemies=len(enemies))
+
+    def choose(self, player: int, move: int,
+               target: Optional[int] = None) -> None:
+        """
+        Sets what a player dances in the next round.
+
+        Args:
+            player: The player's index in the party.
+            move: The index of the move in the player's move set.
+            target: The enemy's index in the crew, or None for a random
+                one. A target that falls first is replaced by a random one.
+
+        Raises:
+            ValueError: If the player, move or target does not exist.
+        """
+        if not 0 <= player < self.first_enemy:
+            raise ValueError(f"No player with index {player}.")
+        if not 0 <= move < self.moves[player].size:
+            raise ValueError(f"No player move with index {move}.")
+        if target is not None and not 0 <= target < len(self.enemies):
+            raise ValueError(f"No enemy with index {target}.")
+        self.chosen[player] = move
+        self.targets[player] = (-1 if target is None
+                                else self.first_enemy + target)
+
+    def round(self) -> Optional[str]:
+        """
+        Plays one round of the battle: the party dances, then the enemies
+        still standing reply, as in a battle of one against one.
+
+        Returns:
+            Optional[str]: "won" if the crew is defeated, "lost" if the
+            whole party is, or None while the battle goes on.
+        """
+        if self.outcome is not None:
+            return self.outcome
+        self.rounds += 1
+        first = self.first_enemy
+        self._dance(0, first, first, len(self.health))
+        outcome = self._judge()
+        if outcome is None:
+            self._dance(first, len(self.health), 0, first)
+            outcome = self._judge()
+        return outcome
+
+    def _dance(self, start: int, stop: int, foes_start: int,
+               foes_stop: int) -> None:
+        """
+        Lets one side dance: every standing combatant that is not dizzy
+        picks a move and a target, then all damage and effects land.
+
+        Args:
+            start: The first combatant of the dancing side.
+            stop: One past its last combatant.
+            foes_start: The first combatant of the other side.
+            foes_stop: One past its last combatant.
+        """
+        draw = self.rng.random
+        health, moves_of = self.health, self.moves
+        chosen, targets = self.chosen, self.targets
+        dizzy, hyped = self.dizzy, self.hyped
+        foes = [index for index in range(foes_start, foes_stop)
+                if health[index] > 0]
+        incoming: Dict[int, int] = {}
+        stunned: List[Tuple[int, int]] = []
+
+        foe_count = len(foes)
+        for index in range(start, stop):
+            if health[index] <= 0:
+                continue
+            if dizzy[index]:
+                dizzy[index] -= 1
+                continue
+            moves = moves_of[index]
+            move = chosen[index]
+            if move < 0:
+                move = int(draw() * moves.size)
+                keep = moves.keep[move]
+                if keep < 1.0 and draw() >= keep:
+                    move = moves.alias[move]
+            else:
+                chosen[index] = -1
+            low, span, effect, turns = moves.rows[move]
+            damage = (low + int(draw() * span) if span
+                      else moves.moves[move].roll(self.rng))
+            if hyped[index]:
+                hyped[index] -= 1
+                damage += damage
+            target = targets[index]
+            if target < 0 or health[target] <= 0:
+                target = foes[int(draw() * foe_count)]
+            incoming[target] = incoming.get(target, 0) + damage
+            if effect:
+                if effect == DIZZY:
+                    stunned.append((target, turns))
+                elif turns > hyped[index]:
+                    hyped[index] = turns
+
+        for target, turns in stunned:
+            dizzy[target] = max(dizzy[target], turns)
+        first = self.first_enemy
+        if foes_start < first:
+            privates = self._privates
+            for index, damage in incoming.items():
+                privates[index]["_health"] -= damage
+                health[index] = privates[index]["_health"]
+        elif incoming:
+            hit = list(incoming)
+            remaining = self.world.strike_many(
+                [self.room] * len(hit),
+                [self.enemies[index - first] for index in hit],
+                list(incoming.values())
+            )
+            for index, left in zip(hit, remaining):
+                health[index] = 0 if left is None else left
+
+    def _judge(self) -> Optional[str]:
+        """
+        Decides whether the battle is over, recording how it ended.
+
+        Returns:
+            Optional[str]: The outcome, or None while the battle goes on.
+        """
+        health, first = self.health, self.first_enemy
+        players_stand = any(value > 0 for value in health[:first])
+        enemies_stand = any(value > 0 for value in health[first:])
+        if players_stand and enemies_stand:
+            return None
+        self.outcome = "won" if players_stand else "lost"
+        (BATTLES_WON if players_stand else BATTLES_LOST).inc()
+        emit_battle("battle_end", battle=self.battle, outcome=self.outcome,
+                    rounds=self.rounds)
+        return self.outcome
+
+    def fight(self, max_rounds: int = 1000) -> Optional[str]:
+        """
+        Plays rounds until the battle is over.
+
+        Args:
+            max_rounds: Give up after this many rounds.
+
+        Returns:
+            Optional[str]: The outcome, or None if the battle did not end
+            within max_rounds.
+        """
+        for _ in range(max_rounds):
+            outcome = self.round()
+            if outcome is not None:
+                return outcome
+        return None
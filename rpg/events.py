@@ -0,0 +1,243 @@
+import gzip
+import itertools
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+SEGMENT = re.compile(r"^battles-(\d{6})\.jsonl(\.gz)?$")
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class EventLog:
+    """Writes structured game events to rotating JSON Lines files.
+
+    Events are kept in memory and written in batches, so emitting one is
+    a list append. A segment file is closed once it reaches max_bytes,
+    and a background thread gzips it while the game moves on to the next
+    one. Segments are named battles-000001.jsonl, battles-000002.jsonl.gz
+    and so on, and a log opened on an existing directory continues the
+    numbering.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 8 * 2**20,
+                 batch: int = 4096, compress: bool = True) -> None:
+        """
+        Initializes the log and opens its first segment.
+
+        Args:
+            directory: Where the segments are written.
+            max_bytes: Size after which a segment is closed.
+            batch: How many events are buffered before a write.
+            compress: Whether closed segments are gzipped.
+        """
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.batch: int = batch
+        self.compress: bool = compress
+        os.makedirs(directory, exist_ok=True)
+        self._buffer: List[Tuple[str, float, Dict[str, Any]]] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._compressors: List[threading.Thread] = []
+        existing = [int(match.group(1)) for match in
+                    map(SEGMENT.match, os.listdir(directory)) if match]
+        self._index: int = max(existing, default=0)
+        self._file = None
+        self._size: int = 0
+        self._open_next()
+
+    @property
+    def path(self) -> str:
+        """The segment currently written to."""
+        return self._segment_path(self._index)
+
+    def _segment_path(self, index: int) -> str:
+        """Returns the uncompressed path of a segment by number."""
+        return os.path.join(self.directory, f"battles-{index:06d}.jsonl")
+
+    def _open_next(self) -> None:
+        """Starts a new segment."""
+        self._index += 1
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def emit(self, kind: str, **fields: Any) -> None:
+        """
+        Records one event.
+
+        Args:
+            kind: The event type, such as "battle_start".
+            **fields: The event's data; must be JSON serializable.
+        """
+        buffer = self._buffer
+        buffer.append((kind, time.time(), fields))
+        if len(buffer) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered events and rotates the segment if full."""
+        with self._lock:
+            # The buffer list is kept, and only what was copied is removed,
+            # so events appended meanwhile by other threads survive.
+            events = self._buffer[:]
+            del self._buffer[:len(events)]
+            if not events or self._file is None:
+                return
+            text = "".join(
+                _encode({"event": kind, "time": moment, **fields}) + "\n"
+                for kind, moment, fields in events
+            )
+            self._file.write(text)
+            self._size += len(text)
+            if self._size >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        """Closes the full segment, compresses it and opens the next."""
+        self._file.close()
+        if self.compress:
+            worker = threading.Thread(
+                target=compress_segment, args=(self.path,),
+                name="event-log-gzip", daemon=True
+            )
+            worker.start()
+            self._compressors = [thread for thread in self._compressors
+                                 if thread.is_alive()] + [worker]
+        self._open_next()
+
+    def close(self) -> None:
+        """Writes what is buffered and waits for pending compression."""
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        for thread in self._compressors:
+            thread.join()
+        self._compressors.clear()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def compress_segment(path: str) -> str:
+    """
+    Gzips a closed segment and removes the uncompressed file.
+
+    The compressed file is written under a temporary name first, so
+    readers never see a partial .gz segment.
+
+    Args:
+        path: The segment to compress.
+
+    Returns:
+        str: The path of the compressed segment.
+    """
+    target = path + ".gz"
+    partial = target + ".part"
+    with open(path, "rb") as source, gzip.open(partial, "wb") as sink:
+        shutil.copyfileobj(source, sink, 2**20)
+    os.replace(partial, target)
+    os.remove(path)
+    return target
+
+
+def segments(directory: str) -> List[str]:
+    """
+    Lists the segments of a log in the order they were written.
+
+    Args:
+        directory: The log directory.
+
+    Returns:
+        List[str]: The segment paths, oldest first.
+    """
+    found: Dict[int, str] = {}
+    for name in os.listdir(directory):
+        match = SEGMENT.match(name)
+        if match:
+            index = int(match.group(1))
+            # A segment caught between compressing and removal exists
+            # twice; the plain file is complete, so either will do.
+            found.setdefault(index, os.path.join(directory, name))
+    return [found[index] for index in sorted(found)]
+
+
+def read_events(directory: str,
+                kinds: Optional[Sequence[str]] = None
+                ) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the events of a log back, one segment at a time.
+
+    Args:
+        directory: The log directory.
+        kinds: Only yield events of these types, if given.
+
+    Yields:
+        Dict[str, Any]: Each event with its "event" type and "time".
+    """
+    wanted = set(kinds) if kinds is not None else None
+    for path in segments(directory):
+        if path.endswith(".gz"):
+            file = gzip.open(path, "rt", encoding="utf-8")
+        else:
+            file = open(path, "r", encoding="utf-8")
+        with file:
+            for line in file:
+                if not line.endswith("\n"):
+                    # The live segment may end in a half-written line.
+                    break
+                event = json.loads(line)
+                if wanted is None or event["event"] in wanted:
+                    yield event
+
+
+battle_ids: Iterator[int] = itertools.count(1)
+
+# The log battles are written to, or None while battles are not logged.
+battle_log: Optional[EventLog] = None
+
+
+def start_battle_log(directory: str, **options: Any) -> EventLog:
+    """
+    Starts logging battle events to a directory.
+
+    Args:
+        directory: Where the segments are written.
+        **options: Further arguments for EventLog.
+
+    Returns:
+        EventLog: The log, which the caller should close at exit.
+    """
+    global battle_log
+    battle_log = EventLog(directory, **options)
+    return battle_log
+
+
+def emit_battle(kind: str, **fields: Any) -> None:
+    """
+    Records a battle event if battles are being logged.
+
+    Args:
+        kind: The event type.
+        **fields: The event's data.
+    """
+    log = battle_log
+    if log is not None:
+        log.emit(kind, **fields)
+
+
+def stop_battle_log() -> None:
+    """Stops logging battle events and closes the log."""
+    global battle_log
+    log, battle_log = battle_log, None
+    if log is not None:
+        log.close()
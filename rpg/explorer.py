@@ -0,0 +1,469 @@
+import argparse
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+from rpg.game import ENEMIES_TO_WIN
+from rpg.navigation import WorldGraph
+from rpg.npcs.enemy import ENEMY_MOVES, PLAYER_MOVES, Enemy
+from rpg.npcs.healer import Healer
+from rpg.world import World, build_default_world
+
+MoveTable = Dict[str, Tuple[int, int]]
+
+# The health the player starts with and healers restore.
+MAX_HEALTH: int = 100
+
+# A state of the search: a place, the enemies defeated as a sorted tuple
+# of ((place, enemy health), count) pairs, and the player's health.
+State = Tuple[int, Tuple[Tuple[Tuple[int, int], int], ...], int]
+
+
+class BattleOdds:
+    """The exact outcome of every dance battle, by dynamic programming.
+
+    A battle is a series of exchanges: the player picks a move and deals
+    damage drawn uniformly from its range, and if the enemy still stands
+    it replies with a random move, also with uniform damage. The player
+    has no way out once the battle starts, so the odds depend only on the
+    two healths.
+
+    win[p][e] is the chance that a player with health p beats an enemy
+    with health e when always picking the move with the best odds.
+    best_left[p][e] is the most health the player can have left after
+    beating that enemy with some luck, or 0 if the player cannot win.
+
+    The tables are filled by increasing player health, since every reply
+    of the enemy costs at least its lowest damage. The chance after the
+    player's move is a sum over a range of enemy health, so each row keeps
+    prefix sums and every move is added up in constant time.
+    """
+
+    def __init__(self, max_player: int = MAX_HEALTH, max_enemy: int = 100,
+                 player_moves: Optional[MoveTable] = None,
+                 enemy_moves: Optional[MoveTable] = None) -> None:
+        """
+        Computes the odds of every pair of healths.
+
+        Args:
+            max_player: The highest player health to cover.
+            max_enemy: The highest enemy health to cover.
+            player_moves: The player's moves, the game's by default.
+            enemy_moves: The enemy's moves, the game's by default.
+        """
+        player_moves = player_moves or PLAYER_MOVES
+        enemy_moves = enemy_moves or ENEMY_MOVES
+        self.max_player: int = max_player
+        self.max_enemy: int = max_enemy
+        ranges: List[Tuple[int, int]] = list(player_moves.values())
+
+        # The enemy picks a move at random, then the damage at random.
+        reply: Dict[int, float] = {}
+        for low, high in enemy_moves.values():
+            share = 1 / len(enemy_moves) / (high - low + 1)
+            for damage in range(low, high + 1):
+                reply[damage] = reply.get(damage, 0.0) + share
+        replies = sorted(reply.items())
+        weakest = replies[0][0]
+        strongest = max(high for _, high in ranges)
+
+        width = max_enemy + 1
+        self.win: List[List[float]] = [[0.0] * width]
+        self.best_left: List[List[int]] = [[0] * width]
+        for health in range(1, max_player + 1):
+            # The chance of winning once the enemy is left with health e
+            # and replies, summed over enemy health 1 to e.
+            prefix = [0.0] * width
+            total = 0.0
+            for enemy in range(1, width):
+                chance = 0.0
+                for damage, share in replies:
+                    if damage >= health:
+                        break
+                    chance += share * self.win[health - damage][enemy]
+                total += chance
+                prefix[enemy] = total
+
+            row = [0.0] * width
+            left = [0] * width
+            for enemy in range(1, width):
+                best = 0.0
+                for low, high in ranges:
+                    finishing = high - max(low, enemy) + 1
+                    chance = float(max(0, finishing))
+                    top = min(high, enemy - 1)
+                    if top >= low:
+                        chance += (prefix[enemy - low]
+                                   - prefix[enemy - top - 1])
+                    chance /= high - low + 1
+                    if chance > best:
+                        best = chance
+                row[enemy] = best
+                if strongest >= enemy:
+                    left[enemy] = health
+                elif health > weakest:
+                    left[enemy] = self.best_left[health - weakest][
+                        enemy - strongest]
+            row[0] = 1.0
+            left[0] = health
+            self.win.append(row)
+            self.best_left.append(left)
+
+    def chance(self, player: int, enemy: int) -> float:
+        """
+        Returns the chance that the player wins a battle.
+
+        Args:
+            player: The player's health when the battle starts.
+            enemy: The enemy's health.
+
+        Returns:
+            float: The chance of winning with the best moves.
+
+        Raises:
+            ValueError: If the enemy has more health than the tables
+                cover.
+        """
+        if enemy > self.max_enemy:
+            raise ValueError(f"Odds only cover enemies with up to "
+                             f"{self.max_enemy} health.")
+        if player <= 0:
+            return 0.0
+        if enemy <= 0:
+            return 1.0
+        return self.win[min(player, self.max_player)][enemy]
+
+
+class EnemyReport:
+    """What the explorer found out about one enemy."""
+
+    def __init__(self, room: str, enemy: Enemy, reachable: bool,
+                 chance: float) -> None:
+        """
+        Initializes the report.
+
+        Args:
+            room: The name of the enemy's room.
+            enemy: The enemy.
+            reachable: Whether the player can walk to the enemy's room.
+            chance: The chance of beating the enemy at full health.
+        """
+        self.room: str = room
+        self.description: str = enemy.description
+        self.health: int = enemy._health
+        self.reachable: bool = reachable
+        self.chance: float = chance
+
+    @property
+    def beatable(self) -> bool:
+        """Whether the player can reach and beat the enemy."""
+        return self.reachable and self.chance > 0
+
+
+class Report:
+    """The result of exploring a world."""
+
+    def __init__(self) -> None:
+        """Initializes an empty report."""
+        self.rooms: int = 0
+        self.unreachable_rooms: List[str] = []
+        self.enemies: List[EnemyReport] = []
+        self.winnable: bool = False
+        self.complete: bool = True
+        self.winning_line: List[str] = []
+        self.states: int = 0
+        self.seconds: float = 0.0
+
+    @property
+    def unbeatable(self) -> List[EnemyReport]:
+        """The enemies that cannot be reached or cannot be beaten."""
+        return [enemy for enemy in self.enemies if not enemy.beatable]
+
+    def summary(self) -> str:
+        """
+        Describes the findings for a person.
+
+        Returns:
+            str: A few lines of text.
+        """
+        lines = [
+            f"{self.rooms} rooms, {len(self.unreachable_rooms)} "
+            f"unreachable; {len(self.enemies)} enemies, "
+            f"{len(self.unbeatable)} unbeatable; {self.states} states "
+            f"explored in {self.seconds:.2f} s."
+        ]
+        for name in self.unreachable_rooms[:20]:
+            lines.append(f"  unreachable room: {name}")
+        for enemy in self.unbeatable[:20]:
+            reason = ("out of reach" if not enemy.reachable
+                      else f"cannot be beaten with {enemy.health} health")
+            lines.append(f"  {enemy.description} in {enemy.room}: {reason}")
+        if not self.complete:
+            lines.append("The search hit its state limit: undecided.")
+        elif self.winnable:
+            lines.append("Winnable: " + ", then ".join(self.winning_line))
+        else:
+            lines.append("Not winnable: too few enemies can be beaten in "
+                         "one life.")
+        return "\n".join(lines)
+
+
+def components(graph: WorldGraph, start: int) -> Tuple[List[int], int]:
+    """
+    Splits the rooms reachable from start into strongly connected parts.
+
+    Within a part the player can walk from any room to any other, so the
+    explorer treats each part as a single place. This is Tarjan's
+    algorithm, written with an explicit stack for very large worlds.
+
+    Args:
+        graph: The door graph.
+        start: The index of the start room.
+
+    Returns:
+        Tuple[List[int], int]: The part of every room, -1 for rooms out of
+        reach, and the number of parts. Parts are numbered so that doors
+        only lead from a part to itself or to a part with a lower number.
+    """
+    size = len(graph)
+    targets, offsets = graph.targets, graph.offsets
+    order = [-1] * size
+    low = [0] * size
+    part = [-1] * size
+    on_stack = [False] * size
+    stack: List[int] = []
+    counter = 0
+    parts = 0
+    work: List[Tuple[int, int]] = [(start, offsets[start])]
+    order[start] = low[start] = counter
+    counter += 1
+    stack.append(start)
+    on_stack[start] = True
+    while work:
+        room, edge = work[-1]
+        if edge < offsets[room + 1]:
+            work[-1] = (room, edge + 1)
+            target = targets[edge]
+            if order[target] == -1:
+                order[target] = low[target] = counter
+                counter += 1
+                stack.append(target)
+                on_stack[target] = True
+                work.append((target, offsets[target]))
+            elif on_stack[target] and order[target] < low[room]:
+                low[room] = order[target]
+            continue
+        work.pop()
+        if work and low[room] < low[work[-1][0]]:
+            low[work[-1][0]] = low[room]
+        if low[room] == order[room]:
+            while True:
+                member = stack.pop()
+                on_stack[member] = False
+                part[member] = parts
+                if member == room:
+                    break
+            parts += 1
+    return part, parts
+
+
+def _bucket(health: int, size: int) -> int:
+    """
+    Rounds health down to the lowest value of its bucket.
+
+    Full health stays exact, and rounding down only ever makes the player
+    weaker, so a world found winnable with buckets is winnable.
+
+    Args:
+        health: The exact health.
+        size: The width of a bucket.
+
+    Returns:
+        int: The health the explorer continues with.
+    """
+    if health >= MAX_HEALTH or size <= 1:
+        return health
+    return (health - 1) // size * size + 1
+
+
+def explore(world: World, enemies_to_win: int = ENEMIES_TO_WIN,
+            bucket: int = 10, max_states: int = 1000000) -> Report:
+    """
+    Checks that a world can be won from its start room.
+
+    First every room reachable from the start is found, and every enemy
+    is given its exact odds at full health. Then a breadth-first search
+    runs over abstract states (place, enemies defeated, health bucket),
+    where a step walks through a door, visits a healer or wins a battle,
+    until enough enemies are defeated in one life.
+
+    The search stays small on large worlds thanks to three reductions,
+    all of which rely on defeats being monotone: a defeated enemy stays
+    defeated and never opens or closes a door. Rooms that can all reach
+    each other are one place. Enemies of equal health in the same place
+    are interchangeable, so the state counts them instead of naming them.
+    And the transposition table keeps, for each place and defeats, the
+    most health seen; a state with less health is dominated and dropped,
+    as is every state in a place with a healer but without full health.
+
+    Enemies are taken where they stand and with the health they have.
+    Battles are judged by possibility: a battle is won if there is any
+    chance of winning it, and the player goes on with the most health
+    that winning can leave.
+
+    Args:
+        world: The world to check.
+        enemies_to_win: Defeats needed to win the game.
+        bucket: Width of the health buckets.
+        max_states: Abandon the search after this many states.
+
+    Returns:
+        Report: What was found.
+    """
+    began = time.perf_counter()
+    report = Report()
+    graph = world.graph
+    report.rooms = len(graph)
+    if world.start_room is None or not len(graph):
+        report.seconds = time.perf_counter() - began
+        return report
+    start = graph.room_id(world.start_room)
+    part, parts = components(graph, start)
+    report.unreachable_rooms = [name for name, place in
+                                zip(graph.names, part) if place == -1]
+
+    # What each place holds: healers, and enemies grouped by health.
+    healing = [False] * parts
+    groups: Dict[Tuple[int, int], List[Tuple[str, Enemy]]] = {}
+    found: List[Tuple[str, Enemy, int]] = []
+    for index, room in enumerate(graph.rooms):
+        place = part[index]
+        for npc in room.npcs:
+            if isinstance(npc, Healer) and place != -1:
+                healing[place] = True
+            elif isinstance(npc, Enemy) and npc._health > 0:
+                found.append((graph.names[index], npc, place))
+                if place != -1:
+                    groups.setdefault((place, npc._health), []).append(
+                        (graph.names[index], npc)
+                    )
+
+    odds = BattleOdds(max_enemy=max([MAX_HEALTH] + [
+        npc._health for _, npc, _ in found
+    ]))
+    report.enemies = [
+        EnemyReport(name, npc, place != -1, odds.chance(MAX_HEALTH,
+                                                         npc._health))
+        for name, npc, place in found
+    ]
+
+    # The places reachable in one step from each place.
+    following: List[set] = [set() for _ in range(parts)]
+    targets, offsets = graph.targets, graph.offsets
+    for index, place in enumerate(part):
+        if place == -1:
+            continue
+        for edge in range(offsets[index], offsets[index + 1]):
+            other = part[targets[edge]]
+            if other != place:
+                following[place].add(other)
+    here: List[List[Tuple[int, int]]] = [[] for _ in range(parts)]
+    for key, members in groups.items():
+        here[key[0]].append((key[1], len(members)))
+
+    if enemies_to_win <= 0:
+        report.winnable = True
+        report.seconds = time.perf_counter() - began
+        return report
+
+    initial: State = (part[start], (), MAX_HEALTH)
+    best: Dict[Tuple[int, tuple], int] = {initial[:2]: MAX_HEALTH}
+    parent: Dict[State, Tuple[Optional[State], str]] = {initial: (None, "")}
+    queue = deque([initial])
+    goal: Optional[State] = None
+
+    def push(state: State, came_from: State, fight: str) -> None:
+        key = state[:2]
+        if best.get(key, 0) >= state[2]:
+            return
+        best[key] = state[2]
+        parent[state] = (came_from, fight)
+        queue.append(state)
+
+    while queue:
+        state = queue.popleft()
+        report.states += 1
+        if report.states > max_states:
+            report.complete = False
+            break
+        place, defeats, health = state
+        if best.get((place, defeats), 0) > health:
+            # A healthier visit to the same place and defeats came later.
+            continue
+        if healing[place] and health < MAX_HEALTH:
+            # Healing is free, and anything done with less health can be
+            # done as well after healing.
+            push((place, defeats, MAX_HEALTH), state, "")
+            continue
+        for other in following[place]:
+            push((other, defeats, health), state, "")
+        counts = dict(defeats)
+        for enemy_health, members in here[place]:
+            key = (place, enemy_health)
+            beaten = counts.get(key, 0)
+            if beaten == members:
+                continue
+            left = odds.best_left[min(health, odds.max_player)][enemy_health]
+            if left <= 0:
+                continue
+            counts[key] = beaten + 1
+            after = (place, tuple(sorted(counts.items())),
+                     _bucket(left, bucket))
+            counts[key] = beaten
+            name, npc = groups[key][beaten]
+            fight = f"{npc.description} in {name} at {health} health"
+            if sum(count for _, count in after[1]) >= enemies_to_win:
+                parent[after] = (state, fight)
+                goal = after
+                queue.clear()
+                break
+            push(after, state, fight)
+
+    if goal is not None:
+        report.winnable = True
+        line: List[str] = []
+        step: Optional[State] = goal
+        while step is not None:
+            step, fight = parent[step]
+            if fight:
+                line.append(fight)
+        report.winning_line = line[::-1]
+    report.seconds = time.perf_counter() - began
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Checks that every enemy of a world can be reached "
+                    "and beaten, and that the game can be won."
+    )
+    parser.add_argument("--generated", type=int, default=0, metavar="N",
+                        help="explore a generated world of N rooms "
+                             "instead of the default world")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--to-win", type=int, default=ENEMIES_TO_WIN)
+    args = parser.parse_args(argv)
+
+    if args.generated:
+        from rpg.generator import generate_world
+
+        world = generate_world(args.generated, args.seed)
+    else:
+        world = build_default_world()
+    report = explore(world, args.to_win)
+    print(report.summary())
+    return 0 if report.winnable and not report.unbeatable else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,181 +1,97 @@
 from rpg.room.room import Room
 from rpg.player import Player
-from rpg.room.door import Door
 from rpg.io_utils import Scanner, Saver
 from rpg.npcs.npc import NPC
-from rpg.npcs.enemy import Enemy
-from rpg.npcs.healer import Healer
-from tests.jsontest import JsonSerializable
+from rpg.npcs.registry import kind_of
+from rpg.world import (
+    World, build_default_world, schedule_default_routines
+)
+from rpg.navigation import has_undefeated_enemy, walk
+from rpg.history import History
+from rpg.json import JsonSerializable
+from rpg.metrics import ACTIVE_SESSIONS, COMMANDS, ENEMIES_DEFEATED
 import sys
+import weakref
 from typing import Dict, Optional
 
 
+COMMAND_NAMES: Dict[int, str] = {
+    0: "look_around", 1: "way_out", 2: "company", 3: "quick_save",
+    4: "quick_load", 5: "quit", 6: "travel", 7: "rewind", 8: "search",
+}
+
+# Defeating this many enemies wins the game.
+ENEMIES_TO_WIN: int = 3
+
+# The menu choice that goes back in time instead of letting time pass.
+REWIND: int = 7
+
+# Games whose main loop is running, so a loop restarted from inside a
+# battle is not counted as another session.
+_PLAYING: "weakref.WeakSet[Game]" = weakref.WeakSet()
+
+
 class Game(JsonSerializable):
     """Main class to manage game state and handle gameplay mechanics."""
 
-    def __init__(self) -> None:
+    def __init__(self, world: Optional[World] = None,
+                 player_name: str = "Jojo Siwa") -> None:
         """Initializes the Game class with
-        scanner, saver, and initial settings."""
+        scanner, saver, and initial settings.
+
+        Args:
+            world: A world shared with other players. When omitted, the
+                game builds and owns a private copy of the default world.
+            player_name: The name of this game's player.
+        """
         self.scanner: Scanner = Scanner()
         self.saver: Saver = Saver()
+        self.shared: bool = world is not None
+        self.player_name: str = player_name
+        self._default_world: Optional[World] = None
+        self.history: Optional[History] = None
+        if world is not None:
+            self.world: World = world
         self.reset_game()
         self.enemies_defeated: int = 0
 
     def reset_game(self) -> None:
         """Resets the game state by initializing
-        rooms, NPCs, and player settings."""
-        self.enemies_defeated = 0
-        self.rooms: Dict[str, Room] = {}
-        self.start_room: Room = Room(
-            description="Practice room of boy group BTS. "
-                        "The room is fully empty, "
-                        "but you see a lot of mirrors."
-        )
+        rooms, NPCs, and player settings.
 
-        self.rooms["Start Room"] = self.start_room
-        self.room_2: Room = Room(
-            description="Jungkook's vocal room. You see "
-                        "several musical instruments, "
-                        "a microphone, a camera, and a music sheet."
-        )
-        self.rooms["Room 2"] = self.room_2
-
-        self.room_3: Room = Room(
-            description="Jin's videogame room. The room is "
-                        "a complete mess, with "
-                        "clothes, food, and videogame cases "
-                        "spread everywhere."
-        )
-        self.rooms["Room 3"] = self.room_3
-
-        self.room_4: Room = Room(description="Taehyung's jazz room.")
-        self.rooms["Room 4"] = self.room_4
-
-        self.room_5: Room = Room(
-            description="Recording studio. This is where "
-                        "all the art is produced. "
-                        "You see all sorts of music equipment."
-        )
-        self.rooms["Room 5"] = self.room_5
-
-        self.room_6: Room = Room(
-            description="Jimin's dance studio. All his "
-                        "trophies and gold medals "
-                        "are on display."
-        )
-        self.rooms["Room 6"] = self.room_6
-
-        self.start_room.add_door(
-            Door(description="A black soundproof iron door",
-                 leads_to=self.room_2)
-        )
-        self.start_room.add_door(
-            Door(description="A door with childish paintings, with a small "
-                             "see-through gap. Has a 'DO NOT ENTER' sign",
-                 leads_to=self.room_3)
-        )
-        self.start_room.add_npc(
-            NPC(description="Bang PD",
-                interact_message="Hello there! You must "
-                                 "be here for the auditions. "
-                                 "All I can say is, good luck. "
-                                 "Feel free to explore the building.")
-        )
-
-        self.room_2.add_door(
-            Door(description="A black soundproof iron door",
-                 leads_to=self.start_room)
-        )
-        self.room_2.add_npc(
-            NPC(description="Jungkook",
-                interact_message="Hi! My name is Jungkook. "
-                                 "This is my personal practice "
-                                 "studio, but I'm letting the "
-                                 "contestants in to get some rest.")
-        )
-        self.room_2.add_npc(
-            Enemy(description="Vlad",
-                  interact_message="I will obliterate you!")
-        )
-
-        self.room_3.add_door(
-            Door(description="A door with childish paintings, with a small "
-                             "see-through gap. Has a 'DO NOT ENTER' sign",
-                 leads_to=self.start_room)
-        )
-        self.room_3.add_door(
-            Door(description="A beautiful velvet colored door",
-                 leads_to=self.room_4)
-        )
-        self.room_3.add_npc(
-            NPC(description="Jin",
-                interact_message="Oh, another one? Ugh. I guess "
-                                 "no one takes the 'DO NOT ENTER' "
-                                 "sign seriously. I'm busy with "
-                                 "Mario Kart, and I'm tired of "
-                                 "being interrupted.")
-        )
-
-        self.room_5.add_door(
-            Door(description="A purple door with handwritten signatures",
-                 leads_to=self.room_4)
-        )
-        self.room_5.add_door(
-            Door(description="A fully mirrored door", leads_to=self.room_6)
-        )
-        self.room_5.add_npc(
-            Healer(description="J-Hope",
-                   interact_message="I'm your hope, you're my hope, "
-                                    "I'm J-Hope! Let me help you "
-                                    "with your next dance battle.")
-        )
-        self.room_5.add_npc(
-            NPC(description="RM",
-                interact_message="Glad to have you here! I'm RM. "
-                                 "Wishing you good luck with the audition.")
-        )
-        self.room_5.add_npc(
-            NPC(description="SUGA",
-                interact_message="I'm working on this new song, "
-                                 "but I can't seem to get it right.")
-        )
-
-        self.room_4.add_door(
-            Door(description="A beautiful velvet colored door",
-                 leads_to=self.room_3)
-        )
-        self.room_4.add_door(
-            Door(description="A purple door with handwritten signatures",
-                 leads_to=self.room_5)
-        )
-        self.room_4.add_npc(
-            Healer(description="Taehyung",
-                   interact_message="I see Jin bullied another "
-                                    "kid in here. You look tired... "
-                                    "I can help with that!")
-        )
-        self.room_4.add_npc(
-            Enemy(description="Lisa", interact_message="Bring it on!")
-        )
-
-        self.room_6.add_door(
-            Door(description="A fully mirrored door", leads_to=self.room_5)
-        )
-        self.room_6.add_npc(
-            Enemy(description="Jimin",
-                  interact_message="Hi! My name is Jimin. Congrats on making "
-                  "it into the final stage! Wishing you good luck.")
-        )
-        self.room_6.add_npc(
-            Enemy(description="Momo", interact_message="You're cooked!")
-        )
+        A game playing in a shared world only resets its own player, since
+        the rooms belong to every player in that world. Otherwise the default
+        world is built once and later resets only undo what changed in it.
+        """
+        self.enemies_defeated = 0
+        if not self.shared:
+            if self._default_world is None:
+                self._default_world = build_default_world()
+            else:
+                self._default_world.reset()
+            self.world = self._default_world
+        self.rooms: Dict[str, Room] = self.world.rooms
+        self.start_room: Room = self.world.start_room
 
-        self.player: Player = Player(name="Jojo Siwa")
+        self.player: Player = Player(name=self.player_name)
         self.player.enter_room(self.start_room)
         self.player._health = 100
 
     def play(self) -> None:
         """Handles the main game loop where player choices are managed."""
+        outermost: bool = self not in _PLAYING
+        if outermost:
+            _PLAYING.add(self)
+            ACTIVE_SESSIONS.inc()
+        try:
+            self._loop()
+        finally:
+            if outermost:
+                _PLAYING.discard(self)
+                ACTIVE_SESSIONS.dec()
+
+    def _loop(self) -> None:
+        """Shows the main menu and carries out choices until the game ends."""
         while True:
             print("\nWhat do you want to do?")
             print("  (0) Look around")
@@ -184,30 +100,61 @@ class Game(JsonSerializable):
             print("  (3) QuickSave")
             print("  (4) QuickLoad")
             print("  (5) Quit game")
+            print("  (6) Travel to a room")
+            if self.history is not None:
+                print("  (7) Rewind")
+            print("  (8) Search for something")
 
             choice: int = self.scanner.read_int("> ")
-
-            if choice == 0:
-                self.player.inspect_room()
-            elif choice == 1:
-                self.player.look_for_way_out(self.scanner)
-            elif choice == 2:
-                self.player.look_for_company()
-                current_room = self.player._current_room
-                if current_room.npcs:
-                    self.npc_option()
-            elif choice == 3:
-                self.saver.quick_save(self)
-            elif choice == 4:
-                loaded_game: Optional[Game] = self.saver.quick_load()
-                if loaded_game:
-                    self.__dict__.update(loaded_game.__dict__)
-            elif choice == 5:
-                sys.exit()
-            elif choice == -1:
-                print("Invalid input. Please enter a positive integer.")
-            else:
-                print("Invalid option. Try again.")
+            self.dispatch(choice)
+            if choice == REWIND and self.history is not None:
+                continue
+            self.world.scheduler.advance()
+            if self.history is not None:
+                self.history.record(
+                    self, COMMAND_NAMES.get(choice, "invalid")
+                )
+
+    def dispatch(self, choice: int) -> None:
+        """
+        Carries out one choice of the main menu.
+
+        Args:
+            choice: The number the player picked.
+        """
+        COMMANDS.labels(COMMAND_NAMES.get(choice, "invalid")).inc()
+        if choice == 0:
+            self.player.inspect_room()
+        elif choice == 1:
+            self.player.look_for_way_out(self.scanner)
+        elif choice == 2:
+            self.player.look_for_company()
+            current_room = self.player._current_room
+            if current_room.npcs:
+                self.npc_option()
+        elif choice == 3:
+            self.saver.quick_save(self)
+        elif choice == 4:
+            loaded_game: Optional[Game] = self.saver.quick_load()
+            if loaded_game:
+                # The save replaces the game's state, not how it talks to
+                # the player or where it saves.
+                loaded_game.scanner = self.scanner
+                loaded_game.saver = self.saver
+                loaded_game.history = self.history
+                self.__dict__.update(loaded_game.__dict__)
+        elif choice == 5:
+            sys.exit()
+        elif choice == 6:
+            self.travel()
+        elif choice == REWIND and self.history is not None:
+            self.rewind()
+        elif choice == 8:
+            self.search()
+        elif choice == -1:
+            print("Invalid input. Please enter a positive integer.")
+        else:
+            print("Invalid option. Try again.")
 
     def npc_option(self) -> None:
         """Handles interactions with NPCs based on player choices."""
@@ -224,61 +171,75 @@ class Game(JsonSerializable):
         if npc_choice == -1:
             return
 
-        if 0 <= npc_choice < len(current_room.npcs):
-            selected_npc: NPC = current_room.npcs[npc_choice]
-
-            if isinstance(selected_npc, Enemy):
-
-                if selected_npc._health <= 0:
-                    current_room.npcs.remove(selected_npc)
-                    print(f" You have already defeated "
-                          f"{selected_npc.description}.")
-                    return
-
-                else:
-                    print(f"You encountered an enemy: "
-                          f"{selected_npc.description}!")
-                    print(f"{selected_npc.description} says: "
-                          f"{selected_npc.interact_message}")
-                    print("Do you want to:")
-                    print("  (0) Fight")
-                    print("  (1) Go back")
-
-                    action_choice: int = self.scanner.read_int("> ")
-
-                    if action_choice == 0:
-                        selected_npc.interact(self.player, self.scanner, self)
-                    elif action_choice == 1:
-                        print("You chose to go back.")
-                    else:
-                        print("Invalid choice.")
-
-            elif isinstance(selected_npc, Healer):
-                print(f"You encountered a healer: {selected_npc.description}!")
-                print(f"{selected_npc.description} says: "
-                      f"{selected_npc.interact_message}")
-                print("Do you want to:")
-                print("  (0) Restore full health")
-                print("  (1) Go back")
-
-                action_choice: int = self.scanner.read_int("> ")
-
-                if action_choice == 0:
-                    selected_npc.interact(self.player)
-                elif action_choice == 1:
-                    print("You chose to go back.")
-                else:
-                    print("Invalid choice.")
-            else:
-                print(f'"{selected_npc.description}" says: '
-                      f'"{selected_npc.interact_message}."')
+        selected_npc: Optional[NPC] = current_room.npcs.get(npc_choice)
+
+        if selected_npc is not None:
+            kind_of(selected_npc).encounter(selected_npc, self)
         else:
             print("Invalid NPC selection.")
 
+    def travel(self) -> None:
+        """Walks the player along the shortest route to a chosen room."""
+        graph = self.world.graph
+        here: int = graph.room_id(self.player._current_room)
+
+        print("Where do you want to go?")
+        print("  (0) The nearest contestant")
+        for index, name in enumerate(graph.names, start=1):
+            print(f"  ({index}) {name}")
+
+        choice: int = self.scanner.read_int("> ")
+
+        if choice == 0:
+            goal: Optional[int] = graph.nearest(here, has_undefeated_enemy)
+            if goal is None:
+                print("There are no contestants left to find.")
+                return
+        elif 1 <= choice <= len(graph):
+            goal = choice - 1
+        else:
+            print("Invalid destination.")
+            return
+
+        doors = graph.route(here, goal)
+        if doors is None:
+            print("You can't find a way there.")
+        elif not doors:
+            print("You are already there.")
+        else:
+            walk(self.player, doors)
+
+    def search(self) -> None:
+        """Finds rooms, doors and people by the words describing them."""
+        text: str = self.scanner.read_line("Search for: ")
+        matches = self.world.search.query(text)
+        if not matches:
+            print("Nothing you know of matches that.")
+            return
+        for match in matches:
+            if match.kind == "room":
+                print(f"  Room: {match.entity.description} "
+                      f"({match.room_name})")
+            else:
+                label = "Door" if match.kind == "door" else "Someone"
+                print(f"  {label}: {match.entity.description} "
+                      f"(in {match.room_name})")
+
+    def rewind(self) -> None:
+        """Takes the game back a chosen number of commands."""
+        print(f"You can go back up to {self.history.position} commands.")
+        steps: int = self.scanner.read_int("How many? ")
+        if steps <= 0:
+            print("Time goes on as before.")
+            return
+        moved: int = self.history.undo(self, steps)
+        print(f"Time flows backwards... {moved} commands are undone.")
+
     def enemy_defeated(self) -> None:
         """Increments the counter when an enemy is defeated."""
+        ENEMIES_DEFEATED.inc()
         self.enemies_defeated += 1
-        if self.enemies_defeated >= 3:
+        if self.enemies_defeated >= ENEMIES_TO_WIN:
             self.win()
 
     def win(self) -> None:
@@ -296,18 +257,38 @@ class Game(JsonSerializable):
             "rooms": {name: room.toJSON() for name, room in
                       self.rooms.items()},
             "current_room": (self.player._current_room.description
-                             if self.player._current_room else None)
+                             if self.player._current_room else None),
+            "enemies_defeated": self.enemies_defeated
         }
 
     @classmethod
     def fromJSON(cls, data: dict) -> "Game":
         """Creates a Game instance from a JSON-compatible dictionary."""
         game: Game = cls()
+        default_layout: Dict[str, str] = {
+            name: room.description for name, room in game.rooms.items()
+        }
         game.rooms = {
             name: Room.fromJSON(room_data) for name, room_data in
             data.get("rooms", {}).items()
         }
+        by_description: Dict[str, Room] = {
+            room.description: room for room in game.rooms.values()
+        }
+        for room in game.rooms.values():
+            for door in room.doors:
+                if isinstance(door.leads_to, str):
+                    door.leads_to = by_description.get(door.leads_to)
+        game.start_room = game.rooms.get("Start Room")
+        game.world = World(game.rooms, game.start_room)
+        # Only saves of the default world get its routines back; other
+        # worlds, such as generated ones, load without any.
+        if len(game.rooms) == len(default_layout) and all(
+                default_layout.get(name) == room.description
+                for name, room in game.rooms.items()):
+            schedule_default_routines(game.world)
         game.player = Player.fromJSON(data.get("player"))
+        game.enemies_defeated = data.get("enemies_defeated", 0)
 
         current_room_desc: Optional[str] = data.get("current_room")
         for room in game.rooms.values():
@@ -0,0 +1,172 @@
+import gc
+import random
+from typing import Any, Dict, Iterator, List, Tuple, Type
+from pydantic import TypeAdapter
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+from rpg.npcs.npc import NPC
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.world import World
+
+
+# Validators for whole lists of each kind of generated object.
+_ROOMS: TypeAdapter[List[Room]] = TypeAdapter(List[Room])
+_DOORS: TypeAdapter[List[Door]] = TypeAdapter(List[Door])
+_NPCS: Dict[Type[NPC], TypeAdapter] = {
+    kind: TypeAdapter(List[kind]) for kind in (Enemy, Healer, NPC)
+}
+
+
+def room_name(index: int) -> str:
+    """
+    Names a generated room the way the default world names its rooms.
+
+    Args:
+        index: The position of the room, starting at 0.
+
+    Returns:
+        str: "Start Room" for the first room, "Room <index + 1>" otherwise.
+    """
+    return "Start Room" if index == 0 else f"Room {index + 1}"
+
+
+def generate_rooms(n_rooms: int, seed: int = 0, shortcuts: float = 0.1,
+                   npcs_per_room: float = 1.0, enemy_share: float = 0.3,
+                   healer_share: float = 0.1, adaptive_share: float = 0.2,
+                   batch: int = 4096) -> Iterator[Tuple[str, Room]]:
+    """
+    Generates the rooms of a connected world, a batch at a time.
+
+    Every room after the first gets a door to and from a random earlier
+    room, which makes the world a tree with short paths, and sometimes a
+    second pair of doors that closes a loop. Doors into a room that was
+    already yielded are added to it in place, so consuming the rooms
+    into a dictionary builds the world without any intermediate copy.
+    The same arguments always give the same world, whatever the batch.
+
+    Each batch is drawn first and then built with one call to pydantic's
+    validators per kind of object, which validates every room, door and
+    NPC for a fraction of the cost of constructing them one by one.
+
+    Args:
+        n_rooms: The number of rooms.
+        seed: Seed of the layout and the population.
+        shortcuts: Chance that a room gets an extra pair of doors.
+        npcs_per_room: Average number of NPCs per room.
+        enemy_share: Share of the NPCs that are enemies.
+        healer_share: Share of the NPCs that are healers.
+        adaptive_share: Share of the enemies that learn the player's
+            habits, with the "adaptive" move set.
+        batch: The number of rooms built at once.
+
+    Yields:
+        Tuple[str, Room]: Each room's name and the room.
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+    randrange = rng.randrange
+    rooms: List[Room] = []
+    # The way into each room, one door shared by every room leading there,
+    # since those doors would all be the same.
+    entrances: List[Door] = []
+    npc_chance = npcs_per_room / (1 + npcs_per_room)
+    healer_limit = enemy_share + healer_share
+    adaptive_limit = enemy_share * adaptive_share
+    npc_count = 0
+
+    for first in range(0, n_rooms, batch):
+        stop = min(n_rooms, first + batch)
+        people: Dict[Type[NPC], List[Dict[str, str]]] = {
+            kind: [] for kind in _NPCS
+        }
+        kinds: List[List[Type[NPC]]] = []
+        links: List[Tuple[int, int]] = []
+        for index in range(first, stop):
+            arrivals: List[Type[NPC]] = []
+            # Geometric counts give the requested average with no upper
+            # bound.
+            while rand() < npc_chance:
+                npc_count += 1
+                kind = rand()
+                if kind < enemy_share:
+                    arrivals.append(Enemy)
+                    people[Enemy].append({
+                        "description": f"Rival {npc_count}",
+                        "interact_message": "Dance with me!",
+                        "moveset": ("adaptive" if kind < adaptive_limit
+                                    else "default"),
+                    })
+                elif kind < healer_limit:
+                    arrivals.append(Healer)
+                    people[Healer].append({
+                        "description": f"Medic {npc_count}",
+                        "interact_message": "Let me help you.",
+                    })
+                else:
+                    arrivals.append(NPC)
+                    people[NPC].append({
+                        "description": f"Fan {npc_count}",
+                        "interact_message": "Good luck out there!",
+                    })
+            kinds.append(arrivals)
+            if index:
+                parent = randrange(index)
+                links.append((index, parent))
+                if rand() < shortcuts:
+                    other = randrange(index)
+                    if other != parent:
+                        links.append((index, other))
+
+        made = {kind: iter(adapter.validate_python(people[kind]))
+                for kind, adapter in _NPCS.items()}
+        built = _ROOMS.validate_python([
+            {"description": f"Generated room {index + 1}",
+             "npcs": [next(made[kind]) for kind in arrivals]}
+            for index, arrivals in zip(range(first, stop), kinds)
+        ])
+        rooms.extend(built)
+        entrances.extend(_DOORS.validate_python([
+            {"description": f"A door to room {index + 1}", "leads_to": room}
+            for index, room in zip(range(first, stop), built)
+        ]))
+        for a, b in links:
+            rooms[a].doors.append(entrances[b])
+            rooms[b].doors.append(entrances[a])
+        for index, room in zip(range(first, stop), built):
+            yield room_name(index), room
+
+
+def generate_world(n_rooms: int, seed: int = 0,
+                   **options: Any) -> World:
+    """
+    Generates a connected world for stress tests and benchmarks.
+
+    The cyclic garbage collector is paused while the rooms are built:
+    every new object would otherwise trigger collections that rescan the
+    whole growing world, which makes large worlds several times slower
+    to build.
+
+    Args:
+        n_rooms: The number of rooms, at least 1.
+        seed: Seed of the layout and the population.
+        **options: Further arguments for generate_rooms().
+
+    Returns:
+        World: The world, starting in its first room.
+
+    Raises:
+        ValueError: If n_rooms is less than 1.
+    """
+    if n_rooms < 1:
+        raise ValueError("A world needs at least one room.")
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        rooms: Dict[str, Room] = dict(
+            generate_rooms(n_rooms, seed, **options)
+        )
+        return World(rooms, rooms["Start Room"])
+    finally:
+        if collecting:
+            gc.enable()
@@ -0,0 +1,244 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, TypeVar
+from rpg.persistent import PersistentVector
+from rpg.room.room import Room
+from rpg.scheduler import SchedulerState
+from rpg.world import World
+
+Game = TypeVar("Game")
+
+
+class Snapshot:
+    """The state of a game after one command."""
+
+    __slots__ = ("label", "rooms", "player_room", "player_health",
+                 "enemies_defeated", "scheduler")
+
+    def __init__(self, label: str, rooms: PersistentVector,
+                 player_room: Optional[Room], player_health: int,
+                 enemies_defeated: int, scheduler: SchedulerState) -> None:
+        """
+        Initializes a snapshot.
+
+        Args:
+            label: What led to this state, such as the command's name.
+            rooms: The NPCs of every room, shared with other snapshots.
+            player_room: The room the player was in.
+            player_health: The player's health.
+            enemies_defeated: The enemies the player had defeated.
+            scheduler: The state of the world's scheduler.
+        """
+        self.label: str = label
+        self.rooms: PersistentVector = rooms
+        self.player_room: Optional[Room] = player_room
+        self.player_health: int = player_health
+        self.enemies_defeated: int = enemies_defeated
+        self.scheduler: SchedulerState = scheduler
+
+
+class History:
+    """Remembers a game's states so it can travel back and forth in time.
+
+    A snapshot is taken after every command and the newest capacity
+    snapshots are kept, the oldest dropping out as in a ring buffer. Each
+    snapshot stores the rooms in a PersistentVector and replaces only the
+    rooms the world reports as changed, so ten thousand snapshots of a
+    large world cost memory for the changes, not for ten thousand copies.
+    The scheduler keeps its actions the same way, so only the actions that
+    ran between two commands are stored again.
+
+    Moving to another snapshot restores only the rooms that differ from
+    the current one. Recording after going back discards the snapshots
+    ahead, like an editor's undo. A history follows one world; when a
+    quickload gives the game a new world, the history starts over.
+    Rewinding a shared world rewinds it for every player in it.
+    """
+
+    def __init__(self, game: "Game", capacity: int = 10000) -> None:
+        """
+        Starts the history with a snapshot of the game as it is.
+
+        Args:
+            game: The game to follow.
+            capacity: The number of snapshots to keep.
+        """
+        if capacity < 1:
+            raise ValueError("A history needs room for one snapshot.")
+        self.capacity: int = capacity
+        self._snapshots: Deque[Snapshot] = deque(maxlen=capacity)
+        self._position: int = -1
+        self.world: Optional[World] = None
+        self._follow(game)
+
+    def _follow(self, game: "Game") -> None:
+        """
+        Forgets every snapshot and starts following the game's world.
+
+        Args:
+            game: The game to follow.
+        """
+        if self.world is not None:
+            self.world.unwatch(self._changes)
+        world: World = game.world
+        self.world = world
+        self._rooms: List[Room] = list(world.rooms.values())
+        self._index: Dict[int, int] = {
+            id(room): index for index, room in enumerate(self._rooms)
+        }
+        self._changes: Dict[int, Room] = world.watch()
+        rooms = PersistentVector([world.room_state(room)
+                                  for room in self._rooms])
+        self._snapshots.clear()
+        self._position = -1
+        self._append(self._snapshot(game, "start", rooms))
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def position(self) -> int:
+        """The index of the snapshot the game is at, oldest first."""
+        return self._position
+
+    @property
+    def labels(self) -> List[str]:
+        """The label of every snapshot, oldest first."""
+        return [snapshot.label for snapshot in self._snapshots]
+
+    def _snapshot(self, game: "Game", label: str,
+                  rooms: PersistentVector) -> Snapshot:
+        """
+        Captures everything but the rooms of a game.
+
+        Args:
+            game: The game.
+            label: The snapshot's label.
+            rooms: The already captured rooms.
+
+        Returns:
+            Snapshot: The snapshot.
+        """
+        player = game.player
+        return Snapshot(label, rooms, player._current_room, player._health,
+                        game.enemies_defeated, self.world.scheduler.capture())
+
+    def _append(self, snapshot: Snapshot) -> None:
+        """
+        Adds a snapshot after the current one, dropping those ahead of it.
+
+        Args:
+            snapshot: The new snapshot.
+        """
+        while len(self._snapshots) - 1 > self._position:
+            self._snapshots.pop()
+        self._snapshots.append(snapshot)
+        self._position = len(self._snapshots) - 1
+
+    def _sync(self, game: "Game") -> bool:
+        """
+        Starts over if a quickload gave the game another world, since the
+        snapshots of the old world do not apply to it.
+
+        Args:
+            game: The followed game.
+
+        Returns:
+            bool: True if the history started over.
+        """
+        if game.world is self.world:
+            return False
+        self._follow(game)
+        return True
+
+    def _taken_changes(self) -> List[Room]:
+        """Empties the watched changes, returning the changed rooms."""
+        changes = self._changes
+        rooms = []
+        while changes:
+            rooms.append(changes.popitem()[1])
+        return rooms
+
+    def record(self, game: "Game", label: str = "") -> None:
+        """
+        Takes a snapshot of the game as it is now.
+
+        Args:
+            game: The followed game.
+            label: What led to this state, such as the command's name.
+        """
+        if self._sync(game):
+            return
+        rooms = self._snapshots[self._position].rooms
+        for room in self._taken_changes():
+            index = self._index.get(id(room))
+            if index is not None:
+                rooms = rooms.set(index, self.world.room_state(room))
+        self._append(self._snapshot(game, label, rooms))
+
+    def goto(self, game: "Game", position: int) -> None:
+        """
+        Puts the game into the state of a snapshot.
+
+        Args:
+            game: The followed game.
+            position: The snapshot's index, oldest first.
+
+        Raises:
+            IndexError: If there is no such snapshot.
+        """
+        self._sync(game)
+        if not 0 <= position < len(self._snapshots):
+            raise IndexError("no snapshot at that position")
+        target = self._snapshots[position]
+        current = self._snapshots[self._position]
+        stale = set(current.rooms.differences(target.rooms))
+        for room in self._taken_changes():
+            index = self._index.get(id(room))
+            if index is not None:
+                stale.add(index)
+        world = self.world
+        for index in stale:
+            world.restore_room(self._rooms[index], target.rooms.get(index))
+        self._changes.clear()
+        world.scheduler.restore(target.scheduler)
+
+        player = game.player
+        player.enter_room(target.player_room)
+        player._health = target.player_health
+        game.enemies_defeated = target.enemies_defeated
+        self._position = position
+
+    def undo(self, game: "Game", steps: int = 1) -> int:
+        """
+        Goes back a number of commands.
+
+        Args:
+            game: The followed game.
+            steps: How many snapshots to go back.
+
+        Returns:
+            int: How many snapshots the game actually went back, fewer
+            than asked at the start of the history.
+        """
+        self._sync(game)
+        target = max(0, self._position - steps)
+        moved = self._position - target
+        self.goto(game, target)
+        return moved
+
+    def redo(self, game: "Game", steps: int = 1) -> int:
+        """
+        Goes forward again after undo().
+
+        Args:
+            game: The followed game.
+            steps: How many snapshots to go forward.
+
+        Returns:
+            int: How many snapshots the game actually went forward.
+        """
+        self._sync(game)
+        target = min(len(self._snapshots) - 1, self._position + steps)
+        moved = target - self._position
+        self.goto(game, target)
+        return moved
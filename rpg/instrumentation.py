@@ -0,0 +1,262 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from rpg.game import COMMAND_NAMES, Game
+from rpg.io_utils import Saver, Scanner
+from rpg.npcs.enemy import Enemy
+
+
+class Histogram:
+    """Counts latencies in power-of-two buckets of microseconds.
+
+    Bucket k holds the samples from 2**(k - 1) up to 2**k microseconds,
+    so recording is a bit_length() and an increment, and the histogram
+    never grows past a few dozen buckets.
+    """
+
+    __slots__ = ("count", "total", "largest", "buckets")
+
+    def __init__(self) -> None:
+        """Initializes an empty histogram."""
+        self.count: int = 0
+        self.total: float = 0.0
+        self.largest: float = 0.0
+        self.buckets: List[int] = []
+
+    def add(self, seconds: float) -> None:
+        """
+        Records one sample.
+
+        Args:
+            seconds: The measured latency.
+        """
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.largest:
+            self.largest = seconds
+
+    def percentile(self, share: float) -> float:
+        """
+        Estimates a percentile from the buckets.
+
+        Args:
+            share: The percentile as a fraction, such as 0.95.
+
+        Returns:
+            float: The upper bound of the bucket holding the percentile, in
+            seconds, or 0 if nothing was recorded.
+        """
+        wanted = share * self.count
+        seen = 0
+        for bucket, samples in enumerate(self.buckets):
+            seen += samples
+            if samples and seen >= wanted:
+                return min((1 << bucket) / 1e6, self.largest)
+        return 0.0
+
+
+class Instrumentation:
+    """Measures how long the game's commands, battles and saves take.
+
+    While disabled, nothing of this class sits in the game's code paths.
+    enable() swaps the watched methods for timing wrappers and disable()
+    puts the originals back, so the instrumentation can ship in every
+    build at no cost until it is switched on.
+
+    Time spent waiting in Scanner.read_int for the player to type is
+    subtracted from every span, so the latencies show the game's own work.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the instrumentation, disabled and empty."""
+        self.histograms: Dict[str, Histogram] = {}
+        self.enabled: bool = False
+        self._originals: List[Tuple[type, str, Callable]] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._local: threading.local = threading.local()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._report_path: Optional[str] = None
+
+    def _waited(self) -> float:
+        """Returns the input wait of the current thread so far."""
+        return getattr(self._local, "waited", 0.0)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds a latency sample to a named histogram.
+
+        Args:
+            name: What was measured.
+            seconds: How long it took.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+
+    def _span(self, method: Callable,
+              namer: Callable[..., str]) -> Callable:
+        """
+        Wraps a method so each call is recorded under a name.
+
+        Args:
+            method: The original method.
+            namer: Builds the span name from the call's arguments.
+
+        Returns:
+            Callable: The timing wrapper.
+        """
+        @functools.wraps(method)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            waited = self._waited()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.record(namer(*args, **kwargs),
+                            elapsed - (self._waited() - waited))
+        return timed
+
+    def _wait(self, method: Callable) -> Callable:
+        """
+        Wraps Scanner.read_int to account for time spent on input.
+
+        Args:
+            method: The original read_int.
+
+        Returns:
+            Callable: The wrapper.
+        """
+        local = self._local
+
+        @functools.wraps(method)
+        def waiting(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                local.waited = (getattr(local, "waited", 0.0)
+                                + time.perf_counter() - start)
+        return waiting
+
+    def _patch(self, owner: type, name: str, wrapper: Callable) -> None:
+        """
+        Replaces a method, remembering the original.
+
+        Args:
+            owner: The class that owns the method.
+            name: The method's name.
+            wrapper: The replacement.
+        """
+        self._originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, wrapper)
+
+    def enable(self, report_path: Optional[str] = None,
+               profile: bool = False, memory: bool = False) -> None:
+        """
+        Starts measuring.
+
+        Args:
+            report_path: File the report is written to on disable(), if
+                any.
+            profile: Also run cProfile and add its statistics to the
+                report.
+            memory: Also trace allocations with tracemalloc and add the
+                largest allocation sites to the report.
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self._report_path = report_path
+
+        def command(game: Game, choice: int) -> str:
+            return "command." + COMMAND_NAMES.get(choice, "invalid")
+
+        self._patch(Game, "dispatch", self._span(Game.dispatch, command))
+        self._patch(Game, "npc_option",
+                    self._span(Game.npc_option, lambda *_: "npc_option"))
+        self._patch(Enemy, "play_turn",
+                    self._span(Enemy.play_turn, lambda *_: "battle.turn"))
+        self._patch(Saver, "quick_save",
+                    self._span(Saver.quick_save, lambda *_: "save"))
+        self._patch(Saver, "quick_load",
+                    self._span(Saver.quick_load, lambda *_: "load"))
+        self._patch(Scanner, "read_int", self._wait(Scanner.read_int))
+
+        if memory:
+            tracemalloc.start()
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def disable(self) -> None:
+        """Stops measuring, restores the methods and writes the report."""
+        if not self.enabled:
+            return
+        profile_text = ""
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out) \
+                .sort_stats("cumulative").print_stats(30)
+            profile_text = out.getvalue()
+            self._profiler = None
+        memory_text = ""
+        if tracemalloc.is_tracing():
+            top = tracemalloc.take_snapshot().statistics("lineno")[:20]
+            memory_text = "\n".join(str(stat) for stat in top)
+            tracemalloc.stop()
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+        self.enabled = False
+
+        if self._report_path:
+            with open(self._report_path, "w") as file:
+                file.write(self.report())
+                if profile_text:
+                    file.write("\n\nProfile (cumulative time)\n")
+                    file.write(profile_text)
+                if memory_text:
+                    file.write("\n\nLargest allocation sites\n")
+                    file.write(memory_text + "\n")
+
+    def reset(self) -> None:
+        """Forgets every recorded sample."""
+        with self._lock:
+            self.histograms.clear()
+
+    def report(self) -> str:
+        """
+        Summarizes the recorded latencies as a table.
+
+        Returns:
+            str: One line per span with count, mean, p50, p95, p99 and
+            maximum, in milliseconds.
+        """
+        lines = [f"{'span':<24}{'count':>8}{'mean':>10}{'p50':>10}"
+                 f"{'p95':>10}{'p99':>10}{'max':>10}"]
+        with self._lock:
+            for name in sorted(self.histograms):
+                hist = self.histograms[name]
+                values = [hist.total / hist.count, hist.percentile(0.5),
+                          hist.percentile(0.95), hist.percentile(0.99),
+                          hist.largest]
+                lines.append(f"{name:<24}{hist.count:>8}" + "".join(
+                    f"{value * 1e3:>10.3f}" for value in values
+                ))
+        return "\n".join(lines) + "\n"
+
+
+instruments: Instrumentation = Instrumentation()
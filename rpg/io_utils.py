@@ -1,9 +1,13 @@
 import os
 import json
+import time
 from abc import abstractmethod
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from abc import ABC
 from typing import Optional, TypeVar
+from rpg.metrics import (
+    LOAD_BYTES, LOAD_SECONDS, LOADS, SAVE_BYTES, SAVE_SECONDS, SAVES
+)
 
 
 PlayerType = TypeVar("Player")
@@ -13,6 +17,8 @@ GameType = TypeVar("Game")
 class Inspectable(ABC, BaseModel):
     """Abstract base class to define inspectable game elements."""
 
+    model_config = ConfigDict(defer_build=True)
+
     @abstractmethod
     def inspect(self) -> None:
         """Displays the description of the inspectable element."""
@@ -22,6 +28,8 @@ class Inspectable(ABC, BaseModel):
 class Interactable(ABC, BaseModel):
     """Abstract base class to define interactable game elements."""
 
+    model_config = ConfigDict(defer_build=True)
+
     @abstractmethod
     def interact(self, player: "PlayerType") -> None:
         """Handles interaction with the player."""
@@ -31,6 +39,8 @@ class Interactable(ABC, BaseModel):
 class Scanner(BaseModel):
     """Utility class to handle integer input from the player."""
 
+    model_config = ConfigDict(defer_build=True)
+
     value: int = Field(0, description="Positive integer input.", ge=-1)
 
     def read_int(self, prompt: str = "") -> int:
@@ -53,6 +63,18 @@ class Scanner(BaseModel):
             except (ValueError, ValidationError):
                 print("Invalid input. Please enter a positive integer.")
 
+    def read_line(self, prompt: str = "") -> str:
+        """
+        Reads a line of text from the user.
+
+        Args:
+            prompt: A string to display as the input prompt.
+
+        Returns:
+            str: The text, without surrounding whitespace.
+        """
+        return input(prompt).strip()
+
 
 class Saver:
     """Handles saving and loading of the game state."""
@@ -77,44 +99,75 @@ class Saver:
             except OSError as e:
                 print(f"Error creating directory {self.save_directory}: {e}")
 
+    def _save_size(self) -> int:
+        """
+        Returns the size of the save file for the metrics.
+
+        Returns:
+            int: The size in bytes, or 0 if the file cannot be read.
+        """
+        try:
+            return os.path.getsize(self.save_file)
+        except OSError:
+            return 0
+
     def quick_save(self, game: "GameType") -> None:
         """
         Saves the current game state to a JSON file.
 
+        Each distinct description and line of dialogue is written once, and
+        everything that says it refers to it by ID.
+
         Args:
             game: The game object to be saved.
         """
+        from rpg.strings import pack
+
         if not hasattr(game, "toJSON"):
             print("Provided object does not implement toJSON method.")
             return
 
+        start: float = time.perf_counter()
         try:
             with open(self.save_file, "w") as file:
-                json.dump(game.toJSON(), file, indent=4)
+                json.dump(pack(game.toJSON()), file, indent=4)
+            SAVE_SECONDS.observe(time.perf_counter() - start)
+            SAVE_BYTES.observe(self._save_size())
+            SAVES.labels("ok").inc()
             print(f"Game successfully saved to {self.save_file}.")
         except Exception as e:
+            SAVES.labels("error").inc()
             print(f"An error occurred while saving the game: {e}")
 
     def quick_load(self) -> Optional["GameType"]:
         """
         Loads the game state from the save file, if it exists.
 
+        Rooms, doors and NPCs with the same text share one string.
+
         Returns:
             Game: The loaded game object, or None if loading fails.
         """
         from rpg.game import Game
+        from rpg.strings import unpack
 
         if not os.path.isfile(self.save_file):
+            LOADS.labels("missing").inc()
             print(f"No save file found at {self.save_file}. "
                   f"Unable to load the game.")
             return None
 
+        start: float = time.perf_counter()
         try:
             with open(self.save_file, "r") as file:
                 data: dict = json.load(file)
-            game: Game = Game.fromJSON(data)
+            game: Game = Game.fromJSON(unpack(data))
+            LOAD_SECONDS.observe(time.perf_counter() - start)
+            LOAD_BYTES.observe(self._save_size())
+            LOADS.labels("ok").inc()
             print(f"Game successfully loaded from {self.save_file}.")
             return game
         except Exception as e:
+            LOADS.labels("error").inc()
             print(f"An error occurred while loading the game: {e}")
             return None
@@ -0,0 +1,318 @@
+import os
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+
+class Counter:
+    """A number that only goes up, such as battles started.
+
+    Every thread adds to its own cell, so an update is a dictionary lookup
+    and an integer addition with no lock to take, and threads never write
+    to the same cell. Reading the value sums the cells of all threads.
+    """
+
+    kind: str = "counter"
+
+    __slots__ = ("name", "help", "labelnames", "_cells", "_children")
+
+    def __init__(self, name: str, help: str,
+                 labelnames: Sequence[str] = ()) -> None:
+        """
+        Initializes the metric at zero.
+
+        Args:
+            name: The metric name, such as "rpg_battles_started_total".
+            help: One line describing the metric.
+            labelnames: The names of the labels children are split by.
+        """
+        self.name: str = name
+        self.help: str = help
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._cells: Dict[int, List[float]] = {}
+        self._children: Dict[Tuple[str, ...], "Counter"] = {}
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Adds to the value.
+
+        Args:
+            amount: How much to add.
+        """
+        cell = self._cells.get(threading.get_ident())
+        if cell is None:
+            cell = self._cells.setdefault(threading.get_ident(), [0])
+        cell[0] += amount
+
+    @property
+    def value(self) -> float:
+        """The sum over all threads."""
+        return sum(cell[0] for cell in list(self._cells.values()))
+
+    def labels(self, *values: str) -> "Counter":
+        """
+        Returns the child metric for one combination of label values.
+
+        Args:
+            *values: One value per label name.
+
+        Returns:
+            Counter: The child, created on first use.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}."
+                )
+            child = self._children.setdefault(
+                values, type(self)(self.name, self.help)
+            )
+        return child
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """
+        Lists the values to expose.
+
+        Returns:
+            List[Tuple[str, str, float]]: Sample name, label text and
+            value for the metric or each of its children.
+        """
+        if not self.labelnames:
+            return [(self.name, "", self.value)]
+        return [
+            (self.name, _label_text(self.labelnames, values), child.value)
+            for values, child in sorted(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    """A number that goes up and down, such as the active sessions."""
+
+    kind: str = "gauge"
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        """
+        Subtracts from the value.
+
+        Args:
+            amount: How much to subtract.
+        """
+        self.inc(-amount)
+
+
+class Summary:
+    """The count and total of observed values, such as save sizes."""
+
+    kind: str = "summary"
+
+    __slots__ = ("name", "help", "_count", "_sum")
+
+    def __init__(self, name: str, help: str) -> None:
+        """
+        Initializes the metric with nothing observed.
+
+        Args:
+            name: The metric name, such as "rpg_save_bytes".
+            help: One line describing the metric.
+        """
+        self.name: str = name
+        self.help: str = help
+        self._count: Counter = Counter(name + "_count", help)
+        self._sum: Counter = Counter(name + "_sum", help)
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value: The observed value.
+        """
+        self._count.inc()
+        self._sum.inc(value)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """
+        Lists the values to expose.
+
+        Returns:
+            List[Tuple[str, str, float]]: The _count and _sum samples.
+        """
+        return [(self._count.name, "", self._count.value),
+                (self._sum.name, "", self._sum.value)]
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Formats label pairs the way the Prometheus text format expects.
+
+    Args:
+        names: The label names.
+        values: The label values.
+
+    Returns:
+        str: Text such as '{command="travel"}'.
+    """
+    pairs = ",".join(
+        f'{name}="' + value.replace("\\", "\\\\").replace('"', '\\"')
+        .replace("\n", "\\n") + '"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    """Formats a sample value, dropping the fraction of whole numbers."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """The metrics of one process and their Prometheus text exposition."""
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self._metrics: Dict[str, object] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _add(self, metric):
+        """
+        Registers a metric, returning the existing one of the same name.
+
+        Args:
+            metric: The new metric.
+
+        Returns:
+            The registered metric.
+
+        Raises:
+            ValueError: If another kind of metric already has that name.
+        """
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"{metric.name} is already a {existing.kind}.")
+        return existing
+
+    def counter(self, name: str, help: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        """Registers a counter. See Counter for the arguments."""
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        """Registers a gauge. See Counter for the arguments."""
+        return self._add(Gauge(name, help, labelnames))
+
+    def summary(self, name: str, help: str) -> Summary:
+        """Registers a summary. See Summary for the arguments."""
+        return self._add(Summary(name, help))
+
+    def exposition(self) -> str:
+        """
+        Renders every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition, version 0.0.4 of the format.
+        """
+        lines: List[str] = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the exposition to a file, replacing it in one step so a
+        collector reading the file never sees half of it.
+
+        Args:
+            path: The file to write, for example one read by the node
+                exporter's textfile collector.
+        """
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w") as file:
+            file.write(self.exposition())
+        os.replace(partial, path)
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1"):
+        """
+        Serves the exposition over HTTP from a background thread.
+
+        Args:
+            port: The port to listen on, 0 for any free port.
+            host: The address to listen on, local only by default.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call shutdown() on
+            it to stop serving.
+        """
+        # Imported here so games that never export metrics skip it.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever,
+                                  name="metrics", daemon=True)
+        thread.start()
+        return server
+
+
+registry: MetricsRegistry = MetricsRegistry()
+
+ACTIVE_SESSIONS: Gauge = registry.gauge(
+    "rpg_active_sessions", "Games currently running their main loop."
+)
+COMMANDS: Counter = registry.counter(
+    "rpg_commands_total", "Main menu commands carried out.", ("command",)
+)
+BATTLES_STARTED: Counter = registry.counter(
+    "rpg_battles_started_total", "Dance battles started."
+)
+BATTLES_WON: Counter = registry.counter(
+    "rpg_battles_won_total", "Dance battles the player won."
+)
+BATTLES_LOST: Counter = registry.counter(
+    "rpg_battles_lost_total", "Dance battles the player lost."
+)
+ENEMIES_DEFEATED: Counter = registry.counter(
+    "rpg_enemies_defeated_total", "Enemies defeated by any player."
+)
+SAVES: Counter = registry.counter(
+    "rpg_saves_total", "Quick saves by outcome.", ("outcome",)
+)
+LOADS: Counter = registry.counter(
+    "rpg_loads_total", "Quick loads by outcome.", ("outcome",)
+)
+SAVE_BYTES: Summary = registry.summary(
+    "rpg_save_bytes", "Size of the written save files."
+)
+SAVE_SECONDS: Summary = registry.summary(
+    "rpg_save_seconds", "Time spent writing save files."
+)
+LOAD_BYTES: Summary = registry.summary(
+    "rpg_load_bytes", "Size of the loaded save files."
+)
+LOAD_SECONDS: Summary = registry.summary(
+    "rpg_load_seconds", "Time spent loading save files."
+)
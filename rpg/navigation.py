@@ -0,0 +1,320 @@
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.npcs.enemy import Enemy
+
+
+PlayerType = TypeVar("Player")
+
+UNREACHABLE: int = -1
+# Worlds up to this size cache a BFS tree per source room, which turns
+# every later query from that room into a table lookup.
+ALL_PAIRS_LIMIT: int = 2048
+
+
+class WorldGraph:
+    """Index of the doors between rooms, for fast route finding.
+
+    Rooms are numbered in the order of the world's room dictionary and the
+    doors are stored as compressed adjacency arrays: the doors leaving room
+    ``i`` lead to ``targets[offsets[i]:offsets[i + 1]]``. Small worlds cache
+    one BFS tree per source room, so repeated queries are lookups. Larger
+    worlds answer each query with a bidirectional BFS.
+    """
+
+    def __init__(self, rooms: Dict[str, Room]) -> None:
+        """
+        Builds the adjacency arrays of a world.
+
+        Args:
+            rooms: The rooms of the world, keyed by name.
+        """
+        self.names: List[str] = list(rooms)
+        self.rooms: List[Room] = list(rooms.values())
+        self._ids: Dict[int, int] = {
+            id(room): index for index, room in enumerate(self.rooms)
+        }
+        self.offsets: array = array("i", [0])
+        self.sources: array = array("i")
+        self.targets: array = array("i")
+        self.doors: List[Door] = []
+        for index, room in enumerate(self.rooms):
+            for door in room.doors:
+                target = self._ids.get(id(door.leads_to))
+                if target is not None:
+                    self.sources.append(index)
+                    self.targets.append(target)
+                    self.doors.append(door)
+            self.offsets.append(len(self.targets))
+        self._trees: Dict[int, Tuple[array, array]] = {}
+        self._incoming: Optional[Tuple[array, array]] = None
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def room_id(self, room: Room) -> int:
+        """
+        Returns the index of a room in the graph.
+
+        Args:
+            room: A room of the indexed world.
+
+        Returns:
+            int: The room's index.
+
+        Raises:
+            KeyError: If the room is not part of the indexed world.
+        """
+        return self._ids[id(room)]
+
+    def neighbours(self, room_id: int) -> array:
+        """
+        Returns the rooms that the doors of a room lead to.
+
+        Args:
+            room_id: The index of the room.
+
+        Returns:
+            array: The indexes of the neighbouring rooms.
+        """
+        return self.targets[self.offsets[room_id]:self.offsets[room_id + 1]]
+
+    def _bfs(self, source: int,
+             targets: Optional[array] = None,
+             offsets: Optional[array] = None) -> Tuple[array, array]:
+        """
+        Runs a breadth-first search over every room reachable from source.
+
+        Args:
+            source: The index of the starting room.
+            targets: Adjacency targets to walk, defaulting to the doors.
+            offsets: Adjacency offsets matching targets.
+
+        Returns:
+            Tuple[array, array]: The distance to each room and the edge used
+            to reach it, both UNREACHABLE for rooms out of reach.
+        """
+        targets = self.targets if targets is None else targets
+        offsets = self.offsets if offsets is None else offsets
+        distance = array("i", [UNREACHABLE]) * len(self.rooms)
+        via = array("i", [UNREACHABLE]) * len(self.rooms)
+        distance[source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            step = distance[current] + 1
+            for edge in range(offsets[current], offsets[current + 1]):
+                target = targets[edge]
+                if distance[target] == UNREACHABLE:
+                    distance[target] = step
+                    via[target] = edge
+                    queue.append(target)
+        return distance, via
+
+    def _tree(self, source: int) -> Tuple[array, array]:
+        """
+        Returns the cached BFS tree rooted at source.
+
+        Args:
+            source: The index of the root room.
+
+        Returns:
+            Tuple[array, array]: The distances and incoming edges.
+        """
+        tree = self._trees.get(source)
+        if tree is None:
+            tree = self._trees[source] = self._bfs(source)
+        return tree
+
+    def _reverse(self) -> Tuple[array, array]:
+        """
+        Builds adjacency arrays listing the doors that lead into each room.
+
+        Returns:
+            Tuple[array, array]: The incoming edges, grouped by the room
+            they lead to, and the offsets of each group.
+        """
+        if self._incoming is None:
+            counts = [0] * (len(self.rooms) + 1)
+            for target in self.targets:
+                counts[target + 1] += 1
+            for index in range(len(self.rooms)):
+                counts[index + 1] += counts[index]
+            fill = counts[:-1]
+            edges = array("i", [0]) * len(self.targets)
+            for edge, target in enumerate(self.targets):
+                edges[fill[target]] = edge
+                fill[target] += 1
+            self._incoming = (edges, array("i", counts))
+        return self._incoming
+
+    def _bidirectional(self, source: int, goal: int) -> Optional[List[int]]:
+        """
+        Finds a shortest route by searching from both ends at once.
+
+        Each round grows whichever frontier is smaller by one level, and
+        the search ends as soon as the two meet. On large worlds this
+        visits a small neighbourhood of both rooms instead of the world.
+
+        Args:
+            source: The index of the starting room.
+            goal: The index of the goal room.
+
+        Returns:
+            Optional[List[int]]: The edges to follow, or None if the goal
+            cannot be reached.
+        """
+        if source == goal:
+            return []
+        incoming, incoming_offsets = self._reverse()
+        offsets, sources, targets = self.offsets, self.sources, self.targets
+        reached_by: Dict[int, int] = {source: UNREACHABLE}
+        leaves_by: Dict[int, int] = {goal: UNREACHABLE}
+        forward, backward = [source], [goal]
+        meeting: Optional[int] = None
+
+        while forward and backward and meeting is None:
+            frontier: List[int] = []
+            if len(forward) <= len(backward):
+                for current in forward:
+                    for edge in range(offsets[current], offsets[current + 1]):
+                        target = targets[edge]
+                        if target not in reached_by:
+                            reached_by[target] = edge
+                            if target in leaves_by:
+                                meeting = target
+                                break
+                            frontier.append(target)
+                    if meeting is not None:
+                        break
+                forward = frontier
+            else:
+                for current in backward:
+                    for slot in range(incoming_offsets[current],
+                                      incoming_offsets[current + 1]):
+                        edge = incoming[slot]
+                        origin = sources[edge]
+                        if origin not in leaves_by:
+                            leaves_by[origin] = edge
+                            if origin in reached_by:
+                                meeting = origin
+                                break
+                            frontier.append(origin)
+                    if meeting is not None:
+                        break
+                backward = frontier
+
+        if meeting is None:
+            return None
+        edges: List[int] = []
+        current = meeting
+        while current != source:
+            edge = reached_by[current]
+            edges.append(edge)
+            current = sources[edge]
+        edges.reverse()
+        current = meeting
+        while current != goal:
+            edge = leaves_by[current]
+            edges.append(edge)
+            current = targets[edge]
+        return edges
+
+    def distance(self, source: int, goal: int) -> int:
+        """
+        Counts the doors on a shortest route between two rooms.
+
+        Args:
+            source: The index of the starting room.
+            goal: The index of the goal room.
+
+        Returns:
+            int: The number of doors, or UNREACHABLE.
+        """
+        if len(self.rooms) <= ALL_PAIRS_LIMIT:
+            return self._tree(source)[0][goal]
+        edges = self._bidirectional(source, goal)
+        return UNREACHABLE if edges is None else len(edges)
+
+    def route(self, source: int, goal: int) -> Optional[List[Door]]:
+        """
+        Finds the doors to walk through to get from one room to another.
+
+        Args:
+            source: The index of the starting room.
+            goal: The index of the goal room.
+
+        Returns:
+            Optional[List[Door]]: The doors in walking order, or None if
+            the goal cannot be reached.
+        """
+        if len(self.rooms) > ALL_PAIRS_LIMIT:
+            edges = self._bidirectional(source, goal)
+            return None if edges is None else [self.doors[e] for e in edges]
+        distance, via = self._tree(source)
+        if distance[goal] == UNREACHABLE:
+            return None
+        doors: List[Door] = []
+        current = goal
+        while current != source:
+            edge = via[current]
+            doors.append(self.doors[edge])
+            current = self.sources[edge]
+        doors.reverse()
+        return doors
+
+    def nearest(self, source: int,
+                wanted: Callable[[Room], bool]) -> Optional[int]:
+        """
+        Finds the closest room that satisfies a condition.
+
+        The search stops at the first matching room, so its cost depends on
+        how far away that room is, not on the size of the world.
+
+        Args:
+            source: The index of the starting room.
+            wanted: Predicate telling whether a room is a goal.
+
+        Returns:
+            Optional[int]: The index of the nearest matching room, or None.
+        """
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if wanted(self.rooms[current]):
+                return current
+            for edge in range(self.offsets[current],
+                              self.offsets[current + 1]):
+                target = self.targets[edge]
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return None
+
+
+def has_undefeated_enemy(room: Room) -> bool:
+    """
+    Tells whether a room holds an enemy that can still be fought.
+
+    Args:
+        room: The room to check.
+
+    Returns:
+        bool: True if an enemy in the room has health left.
+    """
+    return any(enemy._health > 0 for enemy in room.npcs.of_type(Enemy))
+
+
+def walk(player: "PlayerType", doors: List[Door]) -> None:
+    """
+    Moves the player through a list of doors, one after the other.
+
+    Args:
+        player: The player to move.
+        doors: The doors to go through, in order.
+    """
+    for door in doors:
+        door.interact(player)
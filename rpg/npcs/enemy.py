@@ -1,18 +1,28 @@
 from pydantic import Field, PrivateAttr
+from rpg.events import battle_ids, emit_battle
+from rpg.metrics import BATTLES_LOST, BATTLES_STARTED, BATTLES_WON
+from rpg.npcs.moves import (BRACE_DIVISOR, CATALOG, Move, MoveSet,
+                            OpponentModel)
 from rpg.npcs.npc import NPC
-import random
-from typing import Dict, Tuple, TypeVar
+from typing import Dict, Optional, Tuple, TypeVar
 
 Player = TypeVar("Player")
 Game = TypeVar("Game")
 Scanner = TypeVar("Scanner")
 
+# The damage ranges of the player's moves and of the default enemy
+# replies, for tools that reason about battles.
+PLAYER_MOVES: Dict[str, Tuple[int, int]] = CATALOG.player.table()
+ENEMY_MOVES: Dict[str, Tuple[int, int]] = CATALOG.get("default").table()
+
 
 class Enemy(NPC):
     """Represents an enemy NPC that
     the player can encounter in the game."""
 
     description: str = Field(..., description="Enemy description")
+    moveset: str = Field("default",
+                         description="Catalog move set the enemy uses.")
     _health: int = PrivateAttr(default=100)
 
     def inspect(self) -> None:
@@ -26,24 +36,27 @@ class Enemy(NPC):
         Handles the interaction between the player and the enemy.
 
         Initiates a dance battle with the player
-        and manages the battle sequence.
+        and manages the battle sequence. Enemies whose moves counter
+        player moves learn the player's habits as the battle goes on.
 
         Args:
             player: The player object.
             scanner: The input scanner for reading player choices.
             game: The main game object to manage the game state.
         """
+        BATTLES_STARTED.inc()
+        battle: int = next(battle_ids)
+        emit_battle("battle_start", battle=battle, enemy=self.description,
+                    player_health=player._health, enemy_health=self._health)
         print(f"You engage in a dance battle with {self.description}!")
         print(f"Your current health: {player._health}")
 
-        player_moves: Dict[str, Tuple[int, int]] = {
-            "Spin": (5, 15), "Flip": (10, 20),
-            "Body roll": (15, 25)
-        }
-        enemy_moves: Dict[str, Tuple[int, int]] = {
-            "Spin": (10, 20), "Flip": (15, 25),
-            "Body roll": (15, 20)
-        }
+        player_moves: MoveSet = CATALOG.player
+        enemy_moves: MoveSet = CATALOG.get(self.moveset)
+        model: Optional[OpponentModel] = (
+            OpponentModel(len(player_moves)) if enemy_moves.adaptive
+            else None
+        )
 
         while self._health > 0 and player._health > 0:
             print("\n--- Battle Status ---")
@@ -51,42 +64,100 @@ class Enemy(NPC):
                   f"{self.description}'s health: {self._health}")
 
             print("\nChoose your dance move:")
-            for index, move in enumerate(player_moves.keys()):
+            for index, move in enumerate(player_moves.names):
                 print(f"  ({index}) {move}")
+            if player_moves.policy is not None:
+                advice = player_moves.policy.choose(player._health,
+                                                    self._health)
+                print(f"Coach suggests: {player_moves.names[advice]}")
 
             action_choice: int = scanner.read_int("> ")
 
             if 0 <= action_choice < len(player_moves):
-                move_name: str = list(player_moves.keys())[action_choice]
-                move_damage: int = random.randint(*player_moves[move_name])
-                print(
-                    f"You perform a {move_name}! "
-                    f"It deals {move_damage} damage."
-                )
-                self._health -= move_damage
-
-                if self._health <= 0:
-                    print(
-                        f"You have won the dance "
-                        f"battle against {self.description}!"
-                    )
-                    game.enemy_defeated()
+                if self.play_turn(player, game,
+                                  player_moves.moves[action_choice],
+                                  enemy_moves, battle, model):
                     return
-
-                enemy_move: str = random.choice(list(enemy_moves.keys()))
-                enemy_damage: int = random.randint(*enemy_moves[enemy_move])
-                print(f"{self.description} performs a {enemy_move}! "
-                      f"It deals {enemy_damage} damage.")
-                player._health -= enemy_damage
-
-                if player._health <= 0:
-                    print(
-                        f"You have lost the dance "
-                        f"battle against {self.description}."
-                    )
-                    if player.player_death() == "DEAD":
-                        game.reset_game()
-                        game.play()
-                    break
             else:
                 print("Invalid dance move choice. Please choose again.")
+
+    def play_turn(self, player: "Player", game: "Game", move: Move,
+                  enemy_moves: MoveSet, battle: int = 0,
+                  model: Optional[OpponentModel] = None) -> bool:
+        """
+        Plays one exchange of a battle: the player's move, then the reply.
+
+        Args:
+            player: The player object.
+            game: The main game object to manage the game state.
+            move: The dance move the player performs.
+            enemy_moves: The moves the enemy replies with.
+            battle: The number of the battle in the event log.
+            model: The enemy's model of the player, if it adapts.
+
+        Returns:
+            bool: True if the battle is over.
+        """
+        move_damage: int = move.roll()
+        played: int = -1
+        if model is not None:
+            played = CATALOG.player.moves.index(move)
+            if played == model.braced:
+                move_damage //= BRACE_DIVISOR
+                print(f"{self.description} saw your {move.name} coming!")
+        print(
+            f"You perform a {move.name}! "
+            f"It deals {move_damage} damage."
+        )
+        remaining: Optional[int] = game.world.strike(
+            player._current_room, self, move_damage
+        )
+
+        emit_battle("move", battle=battle, actor="player", move=move.name,
+                    damage=move_damage, enemy_health=remaining)
+
+        if remaining is None:
+            emit_battle("battle_end", battle=battle, outcome="taken",
+                        player_health=player._health, enemy_health=0)
+            print(f"{self.description} has already been "
+                  f"defeated by another contestant.")
+            return True
+
+        if remaining <= 0:
+            BATTLES_WON.inc()
+            emit_battle("battle_end", battle=battle, outcome="won",
+                        player_health=player._health,
+                        enemy_health=remaining)
+            print(
+                f"You have won the dance "
+                f"battle against {self.description}!"
+            )
+            game.enemy_defeated()
+            return True
+
+        if model is not None:
+            model.observe(played)
+        enemy_move: Move = enemy_moves.respond(player._health, remaining,
+                                               model=model)
+        enemy_damage: int = enemy_move.roll()
+        print(f"{self.description} performs a {enemy_move.name}! "
+              f"It deals {enemy_damage} damage.")
+        player._health -= enemy_damage
+        emit_battle("move", battle=battle, actor="enemy",
+                    move=enemy_move.name, damage=enemy_damage,
+                    player_health=player._health)
+
+        if player._health <= 0:
+            BATTLES_LOST.inc()
+            emit_battle("battle_end", battle=battle, outcome="lost",
+                        player_health=player._health,
+                        enemy_health=remaining)
+            print(
+                f"You have lost the dance "
+                f"battle against {self.description}."
+            )
+            if player.player_death() == "DEAD":
+                game.reset_game()
+                game.play()
+            return True
+        return False
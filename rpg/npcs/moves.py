@@ -0,0 +1,576 @@
+import base64
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# The move sets of the game. "player" holds the moves the player picks
+# from; every other entry is a set an enemy can reply with, chosen by the
+# enemy's moveset. A move deals damage drawn uniformly from "damage", a
+# [lowest, highest] pair, or from "damage_weights", a mapping from damage
+# to its relative weight. "weight" makes an enemy pick a move more often.
+# In party battles a move can also have an "effect" lasting "turns"
+# turns: "dizzy" makes its target skip turns, "hyped" doubles the damage
+# of the dancer's next moves. An enemy move can also name the player move
+# it "counters": after it, that player move deals only half its damage,
+# and enemies with such moves pick them by what the player tends to do.
+MOVE_DATA: Dict[str, Any] = {
+    "player": [
+        {"name": "Spin", "damage": [5, 15]},
+        {"name": "Flip", "damage": [10, 20]},
+        {"name": "Body roll", "damage": [15, 25]},
+    ],
+    "default": [
+        {"name": "Spin", "damage": [10, 20]},
+        {"name": "Flip", "damage": [15, 25]},
+        {"name": "Body roll", "damage": [15, 20]},
+    ],
+    "adaptive": [
+        {"name": "Mirror", "damage": [10, 20], "counters": "Spin"},
+        {"name": "Moonwalk", "damage": [15, 25], "counters": "Flip"},
+        {"name": "Freeze", "damage": [15, 20], "counters": "Body roll"},
+    ],
+}
+
+
+# The status effects a move can cause.
+EFFECTS: Tuple[str, ...] = ("dizzy", "hyped")
+
+# A player move an enemy braced for deals its damage divided by this.
+BRACE_DIVISOR: int = 2
+
+
+class AliasTable:
+    """Picks an index with given weights in constant time.
+
+    This is Vose's alias method. Each of the n columns holds the chance of
+    keeping its own index and an alias to answer otherwise, so a pick is
+    one uniform column and at most one coin flip, however many weights
+    there are. With equal weights every column keeps its index and a pick
+    consumes the random stream exactly like random.choice().
+    """
+
+    __slots__ = ("size", "keep", "alias")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        """
+        Builds the table.
+
+        Args:
+            weights: Non-negative weights, at least one of them positive.
+
+        Raises:
+            ValueError: If no weight is positive or one is negative.
+        """
+        size = len(weights)
+        total = float(sum(weights))
+        if not size or total <= 0 or min(weights) < 0:
+            raise ValueError("An alias table needs non-negative weights "
+                             "with a positive sum.")
+        scaled = [weight * size / total for weight in weights]
+        keep = [1.0] * size
+        alias = list(range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            keep[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is 1 up to rounding, so it keeps its index.
+        self.size: int = size
+        self.keep: Tuple[float, ...] = tuple(keep)
+        self.alias: Tuple[int, ...] = tuple(alias)
+
+    def sample(self, rng: Any = random) -> int:
+        """
+        Picks an index.
+
+        Args:
+            rng: The random module or a random.Random instance.
+
+        Returns:
+            int: An index, each with the chance of its weight.
+        """
+        column = rng.randrange(self.size)
+        if self.keep[column] < 1.0 and rng.random() >= self.keep[column]:
+            return self.alias[column]
+        return column
+
+
+class Move:
+    """A dance move and the damage it deals."""
+
+    __slots__ = ("name", "low", "high", "weight", "effect", "turns",
+                 "counters", "distribution", "_values", "_table")
+
+    def __init__(self, name: str, damage: Optional[Sequence[int]] = None,
+                 damage_weights: Optional[Dict[int, float]] = None,
+                 weight: float = 1.0, effect: Optional[str] = None,
+                 turns: int = 1, counters: Optional[str] = None) -> None:
+        """
+        Initializes the move. Exactly one of damage and damage_weights is
+        given.
+
+        Args:
+            name: The name shown in battle.
+            damage: The lowest and highest damage, drawn uniformly.
+            damage_weights: Each possible damage and its relative weight.
+            weight: How often an enemy picks the move, relative to the
+                other moves of its set.
+            effect: The status effect the move causes in party battles,
+                one of EFFECTS, or None.
+            turns: How many turns the effect lasts.
+            counters: The name of the player move an enemy braces for
+                with this move, or None.
+
+        Raises:
+            ValueError: If the damage is not described exactly once, or
+                the effect is unknown.
+        """
+        if (damage is None) == (damage_weights is None):
+            raise ValueError(f"Move {name!r} needs either a damage range "
+                             f"or damage weights.")
+        if effect is not None and effect not in EFFECTS:
+            raise ValueError(f"Move {name!r} has an unknown effect "
+                             f"{effect!r}.")
+        self.name: str = name
+        self.weight: float = weight
+        self.effect: Optional[str] = effect
+        self.turns: int = turns
+        self.counters: Optional[str] = counters
+        self._values: Tuple[int, ...] = ()
+        self._table: Optional[AliasTable] = None
+        if damage is not None:
+            self.low, self.high = int(damage[0]), int(damage[1])
+            if self.low > self.high:
+                raise ValueError(f"Move {name!r} has an empty damage range.")
+            share = 1 / (self.high - self.low + 1)
+            chances = [(value, share)
+                       for value in range(self.low, self.high + 1)]
+        else:
+            pairs = sorted((int(value), float(weight))
+                           for value, weight in damage_weights.items())
+            self._values = tuple(value for value, _ in pairs)
+            self._table = AliasTable([weight for _, weight in pairs])
+            self.low, self.high = self._values[0], self._values[-1]
+            total = sum(weight for _, weight in pairs)
+            chances = [(value, weight / total) for value, weight in pairs]
+        # The chance of every damage, for tools that compute odds.
+        self.distribution: Tuple[Tuple[int, float], ...] = tuple(chances)
+
+    @property
+    def uniform(self) -> bool:
+        """Whether every damage in the range is equally likely."""
+        return self._table is None
+
+    def roll(self, rng: Any = random) -> int:
+        """
+        Draws the damage of one use of the move.
+
+        Args:
+            rng: The random module or a random.Random instance.
+
+        Returns:
+            int: The damage.
+        """
+        if self._table is None:
+            return rng.randint(self.low, self.high)
+        return self._values[self._table.sample(rng)]
+
+    @classmethod
+    def fromJSON(cls, data: Dict[str, Any]) -> "Move":
+        """
+        Creates a move from an entry of the move data.
+
+        Args:
+            data: A dictionary with "name" and "damage" or
+                "damage_weights", and optionally "weight", "effect",
+                "turns" and "counters".
+
+        Returns:
+            Move: The move.
+        """
+        return cls(data["name"], data.get("damage"),
+                   data.get("damage_weights"), data.get("weight", 1.0),
+                   data.get("effect"), data.get("turns", 1),
+                   data.get("counters"))
+
+
+class MovePolicy:
+    """The best move for every pair of healths, worked out ahead of time.
+
+    Healths are grouped into buckets, and the table holds one move index
+    per (player bucket, enemy bucket) cell, one byte each, so looking up
+    a move is a little arithmetic and one index.
+    """
+
+    __slots__ = ("table", "bucket", "limit", "width")
+
+    def __init__(self, table: bytes, bucket: int = 5,
+                 limit: int = 100) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            table: The move index of every cell, player buckets major.
+            bucket: The health covered by each bucket.
+            limit: The highest health told apart; more counts as limit.
+
+        Raises:
+            ValueError: If the table does not have one byte per cell.
+        """
+        self.bucket: int = bucket
+        self.limit: int = limit
+        self.width: int = (limit + bucket - 1) // bucket
+        if len(table) != self.width * self.width:
+            raise ValueError(f"A policy for {self.width} buckets needs "
+                             f"{self.width ** 2} entries, not {len(table)}.")
+        self.table: bytes = bytes(table)
+
+    def cell(self, player_health: int, enemy_health: int) -> int:
+        """
+        Returns the table cell of a pair of healths.
+
+        Args:
+            player_health: The player's health, at least 1.
+            enemy_health: The enemy's health, at least 1.
+
+        Returns:
+            int: The index into the table.
+        """
+        limit, bucket = self.limit, self.bucket
+        player = (min(player_health, limit) - 1) // bucket
+        enemy = (min(enemy_health, limit) - 1) // bucket
+        return player * self.width + enemy
+
+    def choose(self, player_health: int, enemy_health: int) -> int:
+        """
+        Looks up the move to make.
+
+        Args:
+            player_health: The player's health, at least 1.
+            enemy_health: The enemy's health, at least 1.
+
+        Returns:
+            int: The index of the move in its move set.
+        """
+        return self.table[self.cell(player_health, enemy_health)]
+
+    def toJSON(self) -> Dict[str, Any]:
+        """
+        Converts the policy to a JSON-compatible dictionary.
+
+        Returns:
+            Dict[str, Any]: The buckets and the table, base64 encoded.
+        """
+        return {"bucket": self.bucket, "limit": self.limit,
+                "table": base64.b64encode(self.table).decode("ascii")}
+
+    @classmethod
+    def fromJSON(cls, data: Dict[str, Any]) -> "MovePolicy":
+        """
+        Creates a policy from a dictionary made by toJSON().
+
+        Args:
+            data: The saved policy.
+
+        Returns:
+            MovePolicy: The policy.
+        """
+        return cls(base64.b64decode(data["table"]), data["bucket"],
+                   data["limit"])
+
+
+class OpponentModel:
+    """What an enemy has learned about the moves of the player it battles.
+
+    It counts the player's moves with exponential decay, so recent moves
+    count most. Rather than shrinking every count at each move, each new
+    move counts 1 / decay times as much as the one before, and the counts
+    are scaled back down once in a long while, so recording a move takes
+    constant time. The counts, their total and the move the enemy braced
+    for are all it keeps, whatever the length of the battle.
+    """
+
+    __slots__ = ("decay", "counts", "total", "weight", "braced")
+
+    # Past this, the counts are scaled back down to keep them finite.
+    RESCALE: float = 1e100
+
+    def __init__(self, moves: int, decay: float = 0.8) -> None:
+        """
+        Initializes a model that has seen nothing.
+
+        Args:
+            moves: The number of moves the player can make.
+            decay: How much a move counts at each later move.
+        """
+        self.decay: float = decay
+        self.counts: List[float] = [0.0] * moves
+        self.total: float = 0.0
+        self.weight: float = 1.0
+        # The player move the enemy's last reply counters, or -1.
+        self.braced: int = -1
+
+    def observe(self, move: int) -> None:
+        """
+        Records a move of the player.
+
+        Args:
+            move: The index of the move in the player's set.
+        """
+        weight = self.weight
+        self.counts[move] += weight
+        self.total += weight
+        weight /= self.decay
+        if weight > self.RESCALE:
+            self.counts = [count / weight for count in self.counts]
+            self.total /= weight
+            weight = 1.0
+        self.weight = weight
+
+    def frequencies(self) -> List[float]:
+        """
+        Returns the decayed share of each move of the player.
+
+        Returns:
+            List[float]: The shares, all 0 before the first move.
+        """
+        total = self.total
+        return [count / total if total else 0.0 for count in self.counts]
+
+    def predict(self, rng: Any = random) -> int:
+        """
+        Guesses the player's next move, each by its decayed share.
+
+        Args:
+            rng: The random module or a random.Random instance.
+
+        Returns:
+            int: The index of the move, or -1 before the first move.
+        """
+        if not self.total:
+            return -1
+        point = rng.random() * self.total
+        for move, count in enumerate(self.counts):
+            point -= count
+            if point < 0:
+                return move
+        return len(self.counts) - 1
+
+
+class MoveSet:
+    """The moves a contestant can pick from, ready for battle.
+
+    Everything a battle turn needs is computed when the set is built: the
+    names for the menu and the alias table of the moves' weights. So a
+    turn only draws random numbers and builds nothing.
+    """
+
+    __slots__ = ("name", "moves", "names", "policy", "counters", "braces",
+                 "_picker")
+
+    def __init__(self, name: str, moves: Sequence[Move]) -> None:
+        """
+        Initializes the move set.
+
+        Args:
+            name: The name of the set in the catalog.
+            moves: The moves, in menu order.
+        """
+        self.name: str = name
+        self.moves: Tuple[Move, ...] = tuple(moves)
+        self.names: Tuple[str, ...] = tuple(move.name for move in moves)
+        # A learned policy, used by enemies in place of random picks and
+        # offered to the player as advice.
+        self.policy: Optional[MovePolicy] = None
+        # Set by link(): the move that counters each player move or -1,
+        # and the player move each move counters or -1.
+        self.counters: Tuple[int, ...] = ()
+        self.braces: Tuple[int, ...] = (-1,) * len(self.moves)
+        self._picker: AliasTable = AliasTable([move.weight
+                                               for move in moves])
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether the set has moves that counter player moves."""
+        return any(column >= 0 for column in self.counters)
+
+    def link(self, player: "MoveSet") -> None:
+        """
+        Resolves the player moves that the set's moves counter.
+
+        Args:
+            player: The player's move set.
+
+        Raises:
+            ValueError: If a move counters a move the player does not have.
+        """
+        positions = {name: index for index, name in enumerate(player.names)}
+        braces = []
+        for move in self.moves:
+            if move.counters is not None and move.counters not in positions:
+                raise ValueError(f"Move {move.name!r} counters an unknown "
+                                 f"player move {move.counters!r}.")
+            braces.append(positions.get(move.counters, -1))
+        counters = [-1] * len(player)
+        for column, braced in reversed(list(enumerate(braces))):
+            if braced >= 0:
+                counters[braced] = column
+        self.braces = tuple(braces)
+        self.counters = tuple(counters)
+
+    def pick(self, rng: Any = random) -> Move:
+        """
+        Picks a move by weight, the way an enemy does.
+
+        Args:
+            rng: The random module or a random.Random instance.
+
+        Returns:
+            Move: The picked move.
+        """
+        return self.moves[self._picker.sample(rng)]
+
+    def reply(self, player_health: int, enemy_health: int,
+              rng: Any = random, model: Optional[OpponentModel] = None
+              ) -> int:
+        """
+        Picks the index of an enemy's reply.
+
+        With a model, the enemy guesses the player's next move from it and
+        replies with the counter of that move if the set has one. Other
+        replies come from the set's policy if it has one, or by weight.
+
+        Args:
+            player_health: The player's health.
+            enemy_health: The enemy's health.
+            rng: The random module or a random.Random instance.
+            model: The enemy's model of the player, which is told the
+                move the reply braces for.
+
+        Returns:
+            int: The index of the reply in the set.
+        """
+        column = -1
+        if model is not None and self.counters:
+            guess = model.predict(rng)
+            if guess >= 0:
+                column = self.counters[guess]
+        if column < 0:
+            policy = self.policy
+            column = (self._picker.sample(rng) if policy is None
+                      else policy.choose(player_health, enemy_health))
+        if model is not None:
+            model.braced = self.braces[column]
+        return column
+
+    def respond(self, player_health: int, enemy_health: int,
+                rng: Any = random, model: Optional[OpponentModel] = None
+                ) -> Move:
+        """
+        Picks an enemy's reply, as reply() does.
+
+        Args:
+            player_health: The player's health.
+            enemy_health: The enemy's health.
+            rng: The random module or a random.Random instance.
+            model: The enemy's model of the player.
+
+        Returns:
+            Move: The reply.
+        """
+        return self.moves[self.reply(player_health, enemy_health, rng,
+                                     model)]
+
+    def table(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the lowest and highest damage of each move.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: The damage range of each move.
+        """
+        return {move.name: (move.low, move.high) for move in self.moves}
+
+
+class MoveCatalog:
+    """Every move set of the game, by name."""
+
+    def __init__(self, sets: Optional[Dict[str, MoveSet]] = None) -> None:
+        """
+        Initializes the catalog.
+
+        Args:
+            sets: The move sets by name.
+        """
+        self._sets: Dict[str, MoveSet] = dict(sets or {})
+        if "player" in self._sets:
+            for move_set in self._sets.values():
+                move_set.link(self._sets["player"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sets
+
+    def get(self, name: str) -> MoveSet:
+        """
+        Looks up a move set.
+
+        Args:
+            name: The name of the set.
+
+        Returns:
+            MoveSet: The set.
+
+        Raises:
+            KeyError: If the catalog has no set of that name.
+        """
+        try:
+            return self._sets[name]
+        except KeyError:
+            raise KeyError(f"No move set named {name!r}.") from None
+
+    def add(self, move_set: MoveSet) -> None:
+        """
+        Adds a move set, replacing any set with the same name.
+
+        Args:
+            move_set: The set to add.
+
+        Raises:
+            ValueError: If a move counters a move the player does not have.
+        """
+        if move_set.name == "player":
+            for other in self._sets.values():
+                other.link(move_set)
+            move_set.link(move_set)
+        elif "player" in self._sets:
+            move_set.link(self._sets["player"])
+        self._sets[move_set.name] = move_set
+
+    @property
+    def player(self) -> MoveSet:
+        """The moves the player picks from."""
+        return self._sets["player"]
+
+    @classmethod
+    def fromJSON(cls, data: Dict[str, List[Dict[str, Any]]]
+                 ) -> "MoveCatalog":
+        """
+        Builds a catalog from move data such as MOVE_DATA.
+
+        Args:
+            data: Lists of moves by set name.
+
+        Returns:
+            MoveCatalog: The catalog.
+        """
+        return cls({name: MoveSet(name, [Move.fromJSON(move)
+                                         for move in moves])
+                    for name, moves in data.items()})
+
+
+# Built once, when the game starts.
+CATALOG: MoveCatalog = MoveCatalog.fromJSON(MOVE_DATA)
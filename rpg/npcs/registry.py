@@ -0,0 +1,245 @@
+from typing import Any, Callable, Dict, Optional, TypeVar
+from rpg.npcs.npc import NPC
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+
+
+Game = TypeVar("Game")
+
+Dumper = Callable[[NPC], Dict[str, Any]]
+Loader = Callable[[Dict[str, Any]], NPC]
+Encounter = Callable[[NPC, "Game"], None]
+
+
+class NPCKind:
+    """Everything the game needs to know about one type of NPC.
+
+    A kind pairs an NPC class with the tag written into saves, the
+    functions that save and load its state and the handler that runs when
+    the player walks up to it.
+    """
+
+    def __init__(self, tag: str, cls: type, dump: Dumper, load: Loader,
+                 encounter: Encounter) -> None:
+        """
+        Initializes an NPC kind.
+
+        Args:
+            tag: The name stored under "type" in saved NPCs.
+            cls: The NPC class this kind describes.
+            dump: Converts an NPC of this kind to a JSON-compatible dict.
+            load: Rebuilds an NPC of this kind from such a dict.
+            encounter: Runs the interaction menu for an NPC of this kind.
+        """
+        self.tag: str = tag
+        self.cls: type = cls
+        self.dump: Dumper = dump
+        self.load: Loader = load
+        self.encounter: Encounter = encounter
+
+
+_KINDS_BY_TAG: Dict[str, NPCKind] = {}
+_KINDS_BY_CLASS: Dict[type, NPCKind] = {}
+
+
+def register_npc_kind(tag: str, cls: type,
+                      dump: Optional[Dumper] = None,
+                      load: Optional[Loader] = None,
+                      encounter: Optional[Encounter] = None) -> NPCKind:
+    """
+    Registers a type of NPC for saving, loading and interaction.
+
+    Args:
+        tag: The name stored under "type" in saved NPCs.
+        cls: The NPC class being registered.
+        dump: Custom serializer, defaulting to the NPC's toJSON.
+        load: Custom deserializer, defaulting to the class's fromJSON.
+        encounter: Interaction handler, defaulting to a plain conversation.
+
+    Returns:
+        NPCKind: The registered kind.
+    """
+    kind = NPCKind(
+        tag, cls,
+        dump or (lambda npc: npc.toJSON()),
+        load or cls.fromJSON,
+        encounter or talk
+    )
+    _KINDS_BY_TAG[tag] = kind
+    # Subclasses cached under a base kind may now belong to the new one.
+    for registered in list(_KINDS_BY_CLASS):
+        if _KINDS_BY_CLASS[registered].cls is not registered:
+            del _KINDS_BY_CLASS[registered]
+    _KINDS_BY_CLASS[cls] = kind
+    return kind
+
+
+def kind_of(npc: NPC) -> NPCKind:
+    """
+    Looks up the kind of an NPC.
+
+    Subclasses that were never registered use the kind of their closest
+    registered base class, and the answer is cached for the next lookup.
+
+    Args:
+        npc: The NPC to classify.
+
+    Returns:
+        NPCKind: The kind of the NPC.
+    """
+    kind = _KINDS_BY_CLASS.get(type(npc))
+    if kind is None:
+        for base in type(npc).__mro__:
+            if base in _KINDS_BY_CLASS:
+                kind = _KINDS_BY_CLASS[type(npc)] = _KINDS_BY_CLASS[base]
+                break
+        else:
+            raise TypeError(f"No NPC kind registered for {type(npc)}")
+    return kind
+
+
+def dump_npc(npc: NPC) -> Dict[str, Any]:
+    """
+    Converts an NPC to a JSON-compatible dictionary tagged with its kind.
+
+    Args:
+        npc: The NPC to save.
+
+    Returns:
+        Dict[str, Any]: The NPC's state with a "type" entry.
+    """
+    kind = kind_of(npc)
+    data = kind.dump(npc)
+    data["type"] = kind.tag
+    return data
+
+
+def load_npc(data: Dict[str, Any]) -> NPC:
+    """
+    Rebuilds an NPC of the right class from a saved dictionary.
+
+    Saves made before NPCs were tagged load as plain NPCs.
+
+    Args:
+        data: A dictionary produced by dump_npc.
+
+    Returns:
+        NPC: The rebuilt NPC.
+
+    Raises:
+        ValueError: If the dictionary names an unknown kind.
+    """
+    tag = data.get("type", "npc")
+    kind = _KINDS_BY_TAG.get(tag)
+    if kind is None:
+        raise ValueError(f"Unknown NPC type: {tag}")
+    return kind.load(data)
+
+
+def talk(npc: NPC, game: "Game") -> None:
+    """
+    Lets a non-hostile NPC say its message.
+
+    Args:
+        npc: The NPC being talked to.
+        game: The game the player is in.
+    """
+    print(f'"{npc.description}" says: "{npc.interact_message}."')
+
+
+def dump_enemy(enemy: Enemy) -> Dict[str, Any]:
+    """
+    Saves an enemy together with its remaining health, and its move set
+    unless it is the default one, so saves of ordinary enemies stay as
+    they were.
+
+    Args:
+        enemy: The enemy to save.
+
+    Returns:
+        Dict[str, Any]: The enemy's state.
+    """
+    data = enemy.toJSON()
+    data["health"] = enemy._health
+    if enemy.moveset != "default":
+        data["moveset"] = enemy.moveset
+    return data
+
+
+def load_enemy(data: Dict[str, Any]) -> Enemy:
+    """
+    Rebuilds an enemy, restoring its remaining health and move set.
+
+    Args:
+        data: A dictionary produced by dump_enemy.
+
+    Returns:
+        Enemy: The rebuilt enemy.
+    """
+    enemy = Enemy.fromJSON(data)
+    if "health" in data:
+        enemy._health = data["health"]
+    if "moveset" in data:
+        enemy.moveset = data["moveset"]
+    return enemy
+
+
+def challenge(enemy: Enemy, game: "Game") -> None:
+    """
+    Offers the player a dance battle against an enemy.
+
+    Enemies that were already defeated are cleared out of the room.
+
+    Args:
+        enemy: The enemy the player walked up to.
+        game: The game the player is in.
+    """
+    if enemy._health <= 0:
+        game.world.remove_npc(game.player._current_room, enemy)
+        print(f" You have already defeated {enemy.description}.")
+        return
+
+    print(f"You encountered an enemy: {enemy.description}!")
+    print(f"{enemy.description} says: {enemy.interact_message}")
+    print("Do you want to:")
+    print("  (0) Fight")
+    print("  (1) Go back")
+
+    action_choice: int = game.scanner.read_int("> ")
+
+    if action_choice == 0:
+        enemy.interact(game.player, game.scanner, game)
+    elif action_choice == 1:
+        print("You chose to go back.")
+    else:
+        print("Invalid choice.")
+
+
+def offer_healing(healer: Healer, game: "Game") -> None:
+    """
+    Offers the player to have their health restored.
+
+    Args:
+        healer: The healer the player walked up to.
+        game: The game the player is in.
+    """
+    print(f"You encountered a healer: {healer.description}!")
+    print(f"{healer.description} says: {healer.interact_message}")
+    print("Do you want to:")
+    print("  (0) Restore full health")
+    print("  (1) Go back")
+
+    action_choice: int = game.scanner.read_int("> ")
+
+    if action_choice == 0:
+        healer.interact(game.player)
+    elif action_choice == 1:
+        print("You chose to go back.")
+    else:
+        print("Invalid choice.")
+
+
+register_npc_kind("npc", NPC)
+register_npc_kind("enemy", Enemy, dump=dump_enemy, load=load_enemy,
+                  encounter=challenge)
+register_npc_kind("healer", Healer, encounter=offer_healing)
@@ -0,0 +1,241 @@
+from itertools import islice
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+)
+from rpg.npcs.npc import NPC
+
+
+NPCType = TypeVar("NPCType", bound=NPC)
+
+
+class NPCRoster:
+    """The NPCs present in a room, addressed by stable handles.
+
+    Every NPC added gets a handle that stays valid until that NPC leaves,
+    no matter who else comes or goes, and handles are never reused.
+    Adding, finding and removing an NPC are dictionary operations, and NPCs
+    are matched by identity, never by comparing their fields. A second
+    index groups the NPCs by class, so asking for the enemies of a crowded
+    room only touches the enemies.
+
+    Iteration yields the NPCs in the order they arrived, and len(), ``in``
+    and positional indexing behave like the list this replaces.
+    """
+
+    __slots__ = ("_npcs", "_handles", "_by_type", "_next_handle")
+
+    def __init__(self, npcs: Iterable[NPC] = ()) -> None:
+        """
+        Initializes the roster, handing out handles in order.
+
+        Args:
+            npcs: The NPCs initially present.
+        """
+        self._npcs: Dict[int, NPC] = {}
+        self._handles: Dict[int, int] = {}
+        self._by_type: Dict[type, Dict[int, NPC]] = {}
+        self._next_handle: int = 0
+        for npc in npcs:
+            self.add(npc)
+
+    def add(self, npc: NPC) -> int:
+        """
+        Adds an NPC to the roster.
+
+        Args:
+            npc: The NPC to add.
+
+        Returns:
+            int: The NPC's handle.
+
+        Raises:
+            ValueError: If the NPC is already in the roster.
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        self._insert(handle, npc)
+        return handle
+
+    def _insert(self, handle: int, npc: NPC) -> None:
+        """
+        Stores an NPC under a given handle.
+
+        Args:
+            handle: The handle to use.
+            npc: The NPC to store.
+
+        Raises:
+            ValueError: If the NPC is already in the roster.
+        """
+        if id(npc) in self._handles:
+            raise ValueError(f"{npc.description} is already here.")
+        self._npcs[handle] = npc
+        self._handles[id(npc)] = handle
+        self._by_type.setdefault(type(npc), {})[handle] = npc
+
+    def remove(self, handle: int) -> NPC:
+        """
+        Removes the NPC with the given handle.
+
+        Args:
+            handle: The handle of the NPC.
+
+        Returns:
+            NPC: The removed NPC.
+
+        Raises:
+            KeyError: If no NPC has that handle.
+        """
+        npc = self._npcs.pop(handle)
+        del self._handles[id(npc)]
+        same_type = self._by_type[type(npc)]
+        del same_type[handle]
+        if not same_type:
+            del self._by_type[type(npc)]
+        return npc
+
+    def discard(self, npc: NPC) -> Optional[int]:
+        """
+        Removes an NPC if it is present.
+
+        Args:
+            npc: The NPC to remove.
+
+        Returns:
+            Optional[int]: The handle the NPC had, or None if it was not
+            in the roster.
+        """
+        handle = self._handles.get(id(npc))
+        if handle is not None:
+            self.remove(handle)
+        return handle
+
+    def get(self, handle: int) -> Optional[NPC]:
+        """
+        Finds the NPC with the given handle.
+
+        Args:
+            handle: The handle to look up.
+
+        Returns:
+            Optional[NPC]: The NPC, or None if no NPC has that handle.
+        """
+        return self._npcs.get(handle)
+
+    def handle_of(self, npc: NPC) -> Optional[int]:
+        """
+        Finds the handle of an NPC.
+
+        Args:
+            npc: The NPC to look up.
+
+        Returns:
+            Optional[int]: The NPC's handle, or None if it is not here.
+        """
+        return self._handles.get(id(npc))
+
+    def items(self) -> Iterator[Tuple[int, NPC]]:
+        """
+        Iterates over the handles and NPCs in arrival order.
+
+        Returns:
+            Iterator[Tuple[int, NPC]]: Pairs of handle and NPC.
+        """
+        return iter(list(self._npcs.items()))
+
+    def of_type(self, cls: Type[NPCType]) -> List[NPCType]:
+        """
+        Lists the NPCs that are instances of a class.
+
+        Only the per-class groups are scanned, not the whole roster.
+
+        Args:
+            cls: The class to filter by, subclasses included.
+
+        Returns:
+            List[NPCType]: The matching NPCs.
+        """
+        found: List[NPCType] = []
+        for npc_type, group in self._by_type.items():
+            if issubclass(npc_type, cls):
+                found.extend(group.values())
+        return found
+
+    def restore(self, entries: Iterable[Tuple[int, NPC]]) -> None:
+        """
+        Replaces the contents with NPCs under previously issued handles.
+
+        Handles already handed out are never given to new NPCs again.
+
+        Args:
+            entries: Pairs of handle and NPC, in arrival order.
+        """
+        self._npcs.clear()
+        self._handles.clear()
+        self._by_type.clear()
+        for handle, npc in entries:
+            self._insert(handle, npc)
+            self._next_handle = max(self._next_handle, handle + 1)
+
+    def copy(self, copy_npc: Optional[Callable[[NPC], NPC]] = None
+             ) -> "NPCRoster":
+        """
+        Copies the roster, keeping every handle.
+
+        Args:
+            copy_npc: Optional function applied to each NPC, for example
+                to copy the NPCs as well.
+
+        Returns:
+            NPCRoster: The new roster.
+        """
+        roster = NPCRoster()
+        roster.restore(
+            (handle, copy_npc(npc) if copy_npc else npc)
+            for handle, npc in self._npcs.items()
+        )
+        roster._next_handle = self._next_handle
+        return roster
+
+    def append(self, npc: NPC) -> None:
+        """
+        Adds an NPC, like list.append.
+
+        Args:
+            npc: The NPC to add.
+        """
+        self.add(npc)
+
+    def __len__(self) -> int:
+        return len(self._npcs)
+
+    def __bool__(self) -> bool:
+        return bool(self._npcs)
+
+    def __iter__(self) -> Iterator[NPC]:
+        return iter(list(self._npcs.values()))
+
+    def __contains__(self, npc: object) -> bool:
+        return id(npc) in self._handles
+
+    def __getitem__(self, index: int) -> NPC:
+        """
+        Returns the NPC at a position in arrival order.
+
+        This walks the roster, so prefer handles in hot paths.
+        """
+        if index < 0:
+            index += len(self._npcs)
+        if not 0 <= index < len(self._npcs):
+            raise IndexError("NPC index out of range")
+        return next(islice(self._npcs.values(), index, None))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NPCRoster):
+            return list(self._npcs.items()) == list(other._npcs.items())
+        if isinstance(other, (list, tuple)):
+            return list(self._npcs.values()) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"NPCRoster({dict(self._npcs)!r})"
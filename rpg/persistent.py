@@ -0,0 +1,145 @@
+from typing import Any, Iterator, List, Sequence, Tuple
+
+BITS: int = 5
+WIDTH: int = 1 << BITS
+MASK: int = WIDTH - 1
+
+
+class PersistentVector:
+    """An immutable array whose versions share everything they can.
+
+    The items sit in the leaves of a tree of tuples with 32 children per
+    node. set() copies only the nodes on the path to the changed item and
+    returns a new vector, so a version that differs from another in k
+    items costs about k tree paths of memory, and differences() finds
+    those items by skipping every subtree the two versions share.
+    """
+
+    __slots__ = ("size", "shift", "root")
+
+    def __init__(self, items: Sequence[Any] = ()) -> None:
+        """
+        Builds a vector holding the given items.
+
+        Args:
+            items: The items, in index order.
+        """
+        self.size: int = len(items)
+        level: List[Any] = [tuple(items[start:start + WIDTH])
+                            for start in range(0, len(items), WIDTH)]
+        shift = 0
+        while len(level) > 1:
+            level = [tuple(level[start:start + WIDTH])
+                     for start in range(0, len(level), WIDTH)]
+            shift += BITS
+        self.shift: int = shift
+        self.root: tuple = level[0] if level else ()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, index: int) -> Any:
+        """
+        Returns the item at an index.
+
+        Args:
+            index: The position, from 0 to len() - 1.
+
+        Returns:
+            Any: The item.
+        """
+        node = self.root
+        for shift in range(self.shift, 0, -BITS):
+            node = node[(index >> shift) & MASK]
+        return node[index & MASK]
+
+    def set(self, index: int, value: Any) -> "PersistentVector":
+        """
+        Returns a copy of the vector with one item replaced.
+
+        Args:
+            index: The position, from 0 to len() - 1.
+            value: The new item.
+
+        Returns:
+            PersistentVector: The new version; this one is unchanged.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError("vector index out of range")
+
+        def replace(node: tuple, shift: int) -> tuple:
+            slot = (index >> shift) & MASK
+            child = value if shift == 0 else replace(node[slot],
+                                                     shift - BITS)
+            return node[:slot] + (child,) + node[slot + 1:]
+
+        vector = PersistentVector.__new__(PersistentVector)
+        vector.size = self.size
+        vector.shift = self.shift
+        vector.root = replace(self.root, self.shift)
+        return vector
+
+    def append(self, value: Any) -> "PersistentVector":
+        """
+        Returns a copy of the vector with one more item at the end.
+
+        Args:
+            value: The new last item.
+
+        Returns:
+            PersistentVector: The new version; this one is unchanged.
+        """
+        index = self.size
+
+        def branch(shift: int) -> tuple:
+            return (value,) if shift == 0 else (branch(shift - BITS),)
+
+        def push(node: tuple, shift: int) -> tuple:
+            slot = (index >> shift) & MASK
+            if shift == 0:
+                return node + (value,)
+            if slot < len(node):
+                return (node[:slot] + (push(node[slot], shift - BITS),)
+                        + node[slot + 1:])
+            return node + (branch(shift - BITS),)
+
+        vector = PersistentVector.__new__(PersistentVector)
+        vector.size = index + 1
+        if index == 1 << (self.shift + BITS):
+            # The tree is full, so it grows a level.
+            vector.shift = self.shift + BITS
+            vector.root = (self.root, branch(self.shift))
+        else:
+            vector.shift = self.shift
+            vector.root = push(self.root, self.shift)
+        return vector
+
+    def differences(self, other: "PersistentVector") -> Iterator[int]:
+        """
+        Finds the indexes whose items differ from another version.
+
+        Items are compared by identity, and subtrees the two versions
+        share are skipped whole.
+
+        Args:
+            other: A vector of the same length, usually an earlier or later
+                version of this one.
+
+        Yields:
+            int: Each index holding a different item.
+        """
+        stack: List[Tuple[tuple, tuple, int, int]] = [
+            (self.root, other.root, self.shift, 0)
+        ]
+        while stack:
+            mine, theirs, shift, base = stack.pop()
+            if mine is theirs:
+                continue
+            for slot, (a, b) in enumerate(zip(mine, theirs)):
+                if a is b:
+                    continue
+                index = base + (slot << shift)
+                if shift == 0:
+                    yield index
+                else:
+                    stack.append((a, b, shift - BITS, index))
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, PrivateAttr
-from copy import deepcopy
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from rpg.room.room import Room
+from rpg.room.view import RoomView
 from typing import Dict, Any, Optional
 from rpg.io_utils import Scanner
 
@@ -8,6 +8,8 @@ from rpg.io_utils import Scanner
 class Player(BaseModel):
     """Represents the player character and manages player interactions."""
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(..., description="Player username.")
     _current_room: Optional[Room] = PrivateAttr(default_factory=str)
     _health: int = PrivateAttr(default=100)
@@ -73,14 +75,32 @@ class Player(BaseModel):
         return "DEAD"
 
     @property
-    def get_current_room(self) -> Room:
+    def get_current_room(self) -> Optional[RoomView]:
+        """
+        Retrieves a read-only view of the player's current room.
+
+        The view shares structure with the live room, so it is cheap no
+        matter how many rooms the doors connect to.
+
+        Returns:
+            Optional[RoomView]: A view of the player's current location, or
+            None if the player is not in any room.
+        """
+        if not self._current_room:
+            return None
+        return RoomView(self._current_room)
+
+    def clone_current_room(self) -> Optional[Room]:
         """
-        Retrieves the player's current room.
+        Copies the player's current room for callers that need to change it.
 
         Returns:
-            Room: The Room object representing the player's current location.
+            Optional[Room]: An isolated copy made with Room.clone(), or None
+            if the player is not in any room.
         """
-        return deepcopy(self._current_room)
+        if not self._current_room:
+            return None
+        return self._current_room.clone()
 
     def toJSON(self) -> Dict[str, Any]:
         """
@@ -91,6 +111,7 @@ class Player(BaseModel):
         """
         return {
             "name": self.name,
+            "health": self._health,
             "current_room": (
                 self._current_room.toJSON()
                 if self._current_room
@@ -110,6 +131,7 @@ class Player(BaseModel):
             Player: A Player object initialized from the provided data.
         """
         player = cls(name=data['name'])
+        player._health = data.get("health", 100)
         if data.get("current_room"):
             player.enter_room(Room.fromJSON(data["current_room"]))
         return player
@@ -0,0 +1,377 @@
+import argparse
+import builtins
+import contextlib
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+)
+from pydantic import PrivateAttr
+from rpg.game import Game
+from rpg.history import History
+from rpg.io_utils import Saver, Scanner
+from rpg.json import JsonSerializable
+
+
+HASH_NAME = "sha256-json"
+
+# What the player entered at one prompt: a number, or a search text.
+Input = Union[int, str]
+
+
+def state_hash(game: Game) -> str:
+    """
+    Hashes everything a save file would hold about a game.
+
+    Args:
+        game: The game to hash.
+
+    Returns:
+        str: The hex digest of the game's canonical JSON.
+    """
+    text = json.dumps(game.toJSON(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ReplayFinished(Exception):
+    """Raised when a replayed session asks for more input than recorded."""
+
+
+class RecordingScanner(Scanner):
+    """A scanner that remembers everything the player entered."""
+
+    _inputs: List[Input] = PrivateAttr(default_factory=list)
+
+    def read_int(self, prompt: str = "") -> int:
+        """
+        Reads a number from the player and records it.
+
+        Args:
+            prompt: A string to display as the input prompt.
+
+        Returns:
+            int: A valid positive integer input.
+        """
+        value = super().read_int(prompt)
+        self._inputs.append(value)
+        return value
+
+    def read_line(self, prompt: str = "") -> str:
+        """
+        Reads a line of text from the player and records it.
+
+        Args:
+            prompt: A string to display as the input prompt.
+
+        Returns:
+            str: The text, without surrounding whitespace.
+        """
+        text = super().read_line(prompt)
+        self._inputs.append(text)
+        return text
+
+
+class ReplayScanner:
+    """Answers the game's prompts with the inputs of a recording.
+
+    A plain class rather than a Scanner, since replays read thousands of
+    inputs and pydantic's private attributes are slow to update.
+    """
+
+    __slots__ = ("inputs", "position")
+
+    def __init__(self, inputs: Sequence[Input]) -> None:
+        """
+        Initializes the scanner at the first recorded input.
+
+        Args:
+            inputs: The recorded inputs, in order.
+        """
+        self.inputs: Sequence[Input] = inputs
+        self.position: int = 0
+
+    def read_int(self, prompt: str = "") -> int:
+        """
+        Returns the next recorded number.
+
+        Args:
+            prompt: Ignored.
+
+        Returns:
+            int: The number the player entered at this point.
+
+        Raises:
+            ReplayFinished: If the recording has no more input.
+        """
+        position = self.position
+        if position >= len(self.inputs):
+            raise ReplayFinished()
+        self.position = position + 1
+        return self.inputs[position]
+
+    def read_line(self, prompt: str = "") -> str:
+        """
+        Returns the next recorded text.
+
+        Args:
+            prompt: Ignored.
+
+        Returns:
+            str: The text the player entered at this point.
+
+        Raises:
+            ReplayFinished: If the recording has no more input.
+        """
+        return str(self.read_int(prompt))
+
+
+class Recording(JsonSerializable):
+    """The seed and inputs of one session, enough to play it again.
+
+    Everything random in a session comes from the seeded random module or
+    from NPC routines with fixed seeds, and everything the player decides
+    passes through Scanner.read_int or Scanner.read_line, so the seed and
+    the inputs read determine the whole session. The only other inputs
+    are the quicksave a session may load, so the save present when
+    recording starts is kept in the recording too, and whether the session
+    could rewind, which changes what the menu accepts.
+    """
+
+    def __init__(self, seed: int, inputs: Optional[List[Input]] = None,
+                 final_hash: Optional[str] = None,
+                 player_name: str = "Jojo Siwa",
+                 initial_save: Optional[Dict[str, Any]] = None,
+                 history: Optional[int] = None) -> None:
+        """
+        Initializes a recording.
+
+        Args:
+            seed: The seed of the random module for the session.
+            inputs: The numbers and texts the player entered.
+            final_hash: The state hash when the session ended.
+            player_name: The name the player played under.
+            initial_save: The quicksave that existed when the session
+                started, if any.
+            history: The capacity of the session's history, or None if
+                the session had no rewind.
+        """
+        self.seed: int = seed
+        self.inputs: List[Input] = inputs if inputs is not None else []
+        self.final_hash: Optional[str] = final_hash
+        self.player_name: str = player_name
+        self.initial_save: Optional[Dict[str, Any]] = initial_save
+        self.history: Optional[int] = history
+
+    @classmethod
+    def start(cls, game: Game, seed: Optional[int] = None) -> "Recording":
+        """
+        Starts recording a game that has not been played yet.
+
+        Seeds the random module and gives the game a recording scanner.
+
+        Args:
+            game: The game to record, with its history if it has one.
+            seed: The seed to use, random if omitted.
+
+        Returns:
+            Recording: The recording, filled in as the game is played.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        recording = cls(seed, player_name=game.player_name)
+        if game.history is not None:
+            recording.history = game.history.capacity
+        if os.path.isfile(game.saver.save_file):
+            try:
+                with open(game.saver.save_file, "r") as file:
+                    recording.initial_save = json.load(file)
+            except (OSError, ValueError):
+                # An unreadable save cannot be loaded in the session either.
+                pass
+        random.seed(seed)
+        scanner = RecordingScanner()
+        scanner._inputs = recording.inputs
+        game.scanner = scanner
+        return recording
+
+    def finish(self, game: Game) -> None:
+        """
+        Stores the state hash of the game as it ends.
+
+        Args:
+            game: The recorded game.
+        """
+        self.final_hash = state_hash(game)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the recording to a file.
+
+        Args:
+            path: The file to write.
+        """
+        with open(path, "w") as file:
+            json.dump(self.toJSON(), file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        """
+        Reads a recording from a file.
+
+        Args:
+            path: The file to read.
+
+        Returns:
+            Recording: The recording.
+        """
+        with open(path, "r") as file:
+            return cls.fromJSON(json.load(file))
+
+    def toJSON(self) -> Dict[str, Any]:
+        """Converts the recording to a JSON-compatible dictionary."""
+        return {
+            "seed": self.seed,
+            "player_name": self.player_name,
+            "inputs": self.inputs,
+            "hash": HASH_NAME,
+            "final_hash": self.final_hash,
+            "initial_save": self.initial_save,
+            "history": self.history,
+        }
+
+    @classmethod
+    def fromJSON(cls, data: Dict[str, Any]) -> "Recording":
+        """Creates a Recording from a JSON-compatible dictionary."""
+        if data.get("hash", HASH_NAME) != HASH_NAME:
+            raise ValueError(f"Unknown state hash {data['hash']}.")
+        return cls(
+            seed=data["seed"],
+            inputs=list(data.get("inputs", [])),
+            final_hash=data.get("final_hash"),
+            player_name=data.get("player_name", "Jojo Siwa"),
+            initial_save=data.get("initial_save"),
+            history=data.get("history"),
+        )
+
+
+@contextlib.contextmanager
+def _silenced() -> Iterator[None]:
+    """Turns print into a no-op, which is much cheaper than redirecting."""
+    original = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        yield
+    finally:
+        builtins.print = original
+
+
+def replay(recording: Recording) -> Game:
+    """
+    Plays a recording again without output, as fast as possible.
+
+    Saves go to a temporary directory, never to the player's saves,
+    which starts out holding the recording's initial save.
+
+    Args:
+        recording: The session to replay.
+
+    Returns:
+        Game: The game in the state the session ended in.
+    """
+    with tempfile.TemporaryDirectory() as directory, _silenced():
+        game = Game(player_name=recording.player_name)
+        game.saver = Saver(directory)
+        if recording.history is not None:
+            game.history = History(game, recording.history)
+        if recording.initial_save is not None:
+            with open(game.saver.save_file, "w") as file:
+                json.dump(recording.initial_save, file)
+        game.scanner = ReplayScanner(recording.inputs)
+        random.seed(recording.seed)
+        try:
+            game.play()
+        except (ReplayFinished, SystemExit):
+            pass
+    return game
+
+
+def verify(recording: Recording) -> Tuple[bool, str]:
+    """
+    Replays a recording and compares the final state with the recorded.
+
+    Args:
+        recording: The recording to check.
+
+    Returns:
+        Tuple[bool, str]: Whether the states match, and the hash the
+        replay ended with.
+    """
+    found = state_hash(replay(recording))
+    return found == recording.final_hash, found
+
+
+def verify_file(path: str) -> Tuple[str, bool, str]:
+    """
+    Verifies the recording stored in a file.
+
+    Args:
+        path: The recording file.
+
+    Returns:
+        Tuple[str, bool, str]: The path, whether it replayed to the same
+        state, and a short explanation.
+    """
+    try:
+        ok, found = verify(Recording.load(path))
+    except Exception as e:
+        return path, False, f"{type(e).__name__}: {e}"
+    return path, ok, "same state" if ok else f"ended in state {found}"
+
+
+def verify_files(paths: Sequence[str],
+                 workers: Optional[int] = None) -> List[Tuple[str, bool, str]]:
+    """
+    Verifies many recordings in parallel processes.
+
+    Args:
+        paths: The recording files.
+        workers: The number of processes, one per CPU by default. With 1,
+            everything runs in this process.
+
+    Returns:
+        List[Tuple[str, bool, str]]: The result of verify_file() for each
+        path, in the order given.
+    """
+    if workers == 1 or len(paths) < 2:
+        return [verify_file(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify_file, paths, chunksize=chunk))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verifies that recorded sessions replay to the same "
+                    "final state."
+    )
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    results = verify_files(args.recordings, args.workers)
+    failures = [result for result in results if not result[1]]
+    for path, _, detail in failures:
+        print(f"{path}: {detail}")
+    print(f"{len(results) - len(failures)} of {len(results)} recordings "
+          f"replayed to the recorded state.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
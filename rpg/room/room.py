@@ -1,8 +1,10 @@
-from pydantic import Field
+from pydantic import ConfigDict, Field, field_validator
 from rpg.io_utils import Inspectable
 from rpg.room.door import Door
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from rpg.npcs.npc import NPC
+from rpg.npcs.registry import dump_npc, load_npc
+from rpg.npcs.roster import NPCRoster
 from rpg.json import JsonSerializable
 
 
@@ -13,10 +15,28 @@ class Room(Inspectable, JsonSerializable):
     doors: List[Door] = Field(
         default_factory=list, description="List of doors in the room."
     )
-    npcs: List[NPC] = Field(
-        default_factory=list, description="List of NPCs present in the room."
+    npcs: NPCRoster = Field(
+        default_factory=NPCRoster, description="NPCs present in the room."
     )
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @field_validator("npcs", mode="before")
+    @classmethod
+    def _as_roster(cls, npcs: Iterable[NPC]) -> NPCRoster:
+        """
+        Accepts any iterable of NPCs, such as a list, for the roster.
+
+        Args:
+            npcs: The NPCs given to the constructor.
+
+        Returns:
+            NPCRoster: A roster holding those NPCs.
+        """
+        if isinstance(npcs, NPCRoster):
+            return npcs
+        return NPCRoster(npcs)
+
     def inspect(self) -> None:
         """
         Displays the room's description and the number of doors.
@@ -52,8 +72,8 @@ class Room(Inspectable, JsonSerializable):
             print("There is no one else here.")
         else:
             print("You look if there’s someone here. You see:")
-            for index, npc in enumerate(self.npcs):
-                print(f"  ({index}) {npc.description}")
+            for handle, npc in self.npcs.items():
+                print(f"  ({handle}) {npc.description}")
 
     def add_door(self, door: Door) -> None:
         """
@@ -64,14 +84,33 @@ class Room(Inspectable, JsonSerializable):
         """
         self.doors.append(door)
 
-    def add_npc(self, npc: NPC) -> None:
+    def add_npc(self, npc: NPC) -> int:
         """
         Adds a new NPC to the room.
 
         Args:
-            npc: The NPC object to be added to the room's NPC list.
+            npc: The NPC object to be added to the room's roster.
+
+        Returns:
+            int: The handle the NPC is listed under.
+        """
+        return self.npcs.add(npc)
+
+    def clone(self) -> "Room":
+        """
+        Creates a copy of the room that can be changed freely.
+
+        The copy gets its own doors and NPCs, but its doors still lead to
+        the live neighbouring rooms, so cloning stops one hop away instead
+        of copying every room reachable through the doors.
+
+        Returns:
+            Room: The isolated copy.
         """
-        self.npcs.append(npc)
+        return self.model_copy(update={
+            "doors": [door.model_copy() for door in self.doors],
+            "npcs": self.npcs.copy(lambda npc: npc.model_copy())
+        })
 
     def toJSON(self) -> Dict[str, Any]:
         """
@@ -83,7 +122,7 @@ class Room(Inspectable, JsonSerializable):
         return {
             "description": self.description,
             "doors": [door.toJSON() for door in self.doors],
-            "npcs": [npc.toJSON() for npc in self.npcs]
+            "npcs": [dump_npc(npc) for npc in self.npcs]
         }
 
     @classmethod
@@ -100,6 +139,6 @@ class Room(Inspectable, JsonSerializable):
         room = cls(description=data['description'])
         room.doors = [Door.fromJSON(door_data)
                       for door_data in data.get("doors", [])]
-        room.npcs = [NPC.fromJSON(npc_data)
-                     for npc_data in data.get("npcs", [])]
+        room.npcs = NPCRoster(load_npc(npc_data)
+                              for npc_data in data.get("npcs", []))
         return room
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Tuple, TypeVar
+from rpg.room.door import Door
+from rpg.npcs.npc import NPC
+
+
+RoomType = TypeVar("Room")
+
+
+class RoomView:
+    """A read-only window onto a live room.
+
+    The view shares the room's doors and NPCs instead of copying them, so
+    building one costs the same on a six-room world as on a huge one. It
+    refuses attribute assignment and hands out its doors and NPCs as
+    tuples, so callers cannot rearrange the room through it. The doors and
+    NPCs themselves are the live objects; use Room.clone() for a copy that
+    is safe to change.
+    """
+
+    __slots__ = ("_room",)
+
+    def __init__(self, room: "RoomType") -> None:
+        """
+        Wraps a room in a view.
+
+        Args:
+            room: The live room to expose.
+        """
+        object.__setattr__(self, "_room", room)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"RoomView is read-only; cannot set {name!r}.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"RoomView is read-only; cannot delete {name!r}.")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RoomView):
+            return self._room is other._room
+        return self._room is other
+
+    def __hash__(self) -> int:
+        return id(self._room)
+
+    def __repr__(self) -> str:
+        return f"RoomView({self._room.description!r})"
+
+    @property
+    def description(self) -> str:
+        """The room's description."""
+        return self._room.description
+
+    @property
+    def doors(self) -> Tuple[Door, ...]:
+        """The room's doors, in listing order."""
+        return tuple(self._room.doors)
+
+    @property
+    def npcs(self) -> Tuple[NPC, ...]:
+        """The NPCs currently in the room, in listing order."""
+        return tuple(self._room.npcs)
+
+    def inspect(self) -> None:
+        """Displays the room's description and the number of doors."""
+        self._room.inspect()
+
+    def list_doors(self) -> None:
+        """Lists all the doors in the room with their descriptions."""
+        self._room.list_doors()
+
+    def list_npcs(self) -> None:
+        """Lists all NPCs present in the room."""
+        self._room.list_npcs()
+
+    def clone(self) -> "RoomType":
+        """
+        Returns an isolated copy of the viewed room.
+
+        Returns:
+            Room: A copy made with Room.clone().
+        """
+        return self._room.clone()
+
+    def toJSON(self) -> Dict[str, Any]:
+        """
+        Converts the viewed room to a JSON-compatible dictionary.
+
+        Returns:
+            Dict[str, Any]: A dictionary representing the room's state.
+        """
+        return self._room.toJSON()
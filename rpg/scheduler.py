@@ -0,0 +1,427 @@
+import heapq
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.persistent import PersistentVector
+from rpg.room.room import Room
+
+
+World = TypeVar("World")
+
+# The clock, the next sequence number, and for every action the (due,
+# sequence) it is queued at, or None, with its state. The actions sit in
+# a PersistentVector, so snapshots share the entries of actions that did
+# not run between them.
+SchedulerState = Tuple[int, int, PersistentVector]
+
+
+class Action(ABC):
+    """Something an NPC does on a schedule.
+
+    Calling an action performs it once and returns the number of ticks
+    until it should run again, or None to stop. reset() puts the action
+    back in the state it was scheduled in, for when the world is reset,
+    and capture() and restore() save and bring back any other state, for
+    rewinding the world to an earlier tick.
+    """
+
+    def __init__(self, every: int) -> None:
+        """
+        Initializes the action.
+
+        Args:
+            every: Ticks between two runs of the action.
+        """
+        self.every: int = every
+
+    @abstractmethod
+    def __call__(self, world: "World") -> Optional[int]:
+        """
+        Performs the action once.
+
+        Args:
+            world: The world the action changes.
+
+        Returns:
+            Optional[int]: The ticks until the action runs again, or None
+            to stop running it.
+        """
+        pass
+
+    def reset(self) -> None:
+        """Forgets whatever the action did since it was scheduled."""
+
+    def capture(self) -> Any:
+        """
+        Returns the action's changing state, for restore().
+
+        Returns:
+            Any: An immutable value, None for actions without state.
+        """
+        return None
+
+    def restore(self, state: Any) -> None:
+        """
+        Brings back a state returned by capture().
+
+        Args:
+            state: The captured state.
+        """
+
+
+class Patrol(Action):
+    """Walks an NPC back and forth along a fixed list of rooms."""
+
+    def __init__(self, npc: NPC, route: List[Room], every: int) -> None:
+        """
+        Initializes the patrol. The NPC must start in the first room.
+
+        Args:
+            npc: The NPC on patrol.
+            route: The rooms to visit, walked forward then back.
+            every: Ticks spent in each room.
+        """
+        super().__init__(every)
+        self.npc: NPC = npc
+        self.route: List[Room] = route
+        self.reset()
+
+    def reset(self) -> None:
+        """Puts the NPC's patrol back at the first room."""
+        self.position: int = 0
+        self.step: int = 1
+
+    def capture(self) -> Tuple[int, int]:
+        """Returns where on the route the NPC is and which way it goes."""
+        return self.position, self.step
+
+    def restore(self, state: Tuple[int, int]) -> None:
+        """Puts the patrol back where capture() found it."""
+        self.position, self.step = state
+
+    def __call__(self, world: "World") -> Optional[int]:
+        if len(self.route) < 2:
+            return None
+        if not 0 <= self.position + self.step < len(self.route):
+            self.step = -self.step
+        here = self.route[self.position]
+        there = self.route[self.position + self.step]
+        if world.move_npc(self.npc, here, there):
+            self.position += self.step
+        elif self.npc not in here.npcs:
+            # The NPC was removed from the world, so its patrol ends.
+            return None
+        return self.every
+
+
+class Roam(Action):
+    """Moves an NPC through a random door of its room."""
+
+    def __init__(self, npc: NPC, room: Room, every: int,
+                 seed: int = 0) -> None:
+        """
+        Initializes the roaming. The NPC must start in the given room.
+
+        Args:
+            npc: The roaming NPC.
+            room: The room the NPC starts in.
+            every: Ticks between two moves.
+            seed: Seed of the door choices, so runs can be replayed.
+        """
+        super().__init__(every)
+        self.npc: NPC = npc
+        self.start_room: Room = room
+        self.seed: int = seed
+        self.reset()
+
+    def reset(self) -> None:
+        """Sends the NPC's roaming back to where it started."""
+        self.room: Room = self.start_room
+        self.rng: random.Random = random.Random(self.seed)
+        self._captured: Optional[Tuple[Room, tuple]] = None
+
+    def capture(self) -> Tuple[Room, tuple]:
+        """
+        Returns the NPC's room and the state of its door choices.
+
+        The generator's state is large, so it is copied once per move and
+        shared by every capture until the next one.
+        """
+        if self._captured is None:
+            self._captured = (self.room, self.rng.getstate())
+        return self._captured
+
+    def restore(self, state: Tuple[Room, tuple]) -> None:
+        """Puts the roaming back where capture() found it."""
+        self.room = state[0]
+        self.rng.setstate(state[1])
+        self._captured = state
+
+    def __call__(self, world: "World") -> Optional[int]:
+        self._captured = None
+        if self.npc not in self.room.npcs:
+            return None
+        doors = [door for door in self.room.doors
+                 if isinstance(door.leads_to, Room)]
+        if doors:
+            target = self.rng.choice(doors).leads_to
+            if world.move_npc(self.npc, self.room, target):
+                self.room = target
+        return self.every
+
+
+class HealUp(Action):
+    """Restores some health to a wounded enemy that is still standing.
+
+    The healing follows the enemy from room to room, and stops once the
+    enemy is back to full health, defeated or gone from the world.
+    """
+
+    def __init__(self, enemy: Enemy, room: Room, amount: int, every: int,
+                 max_health: int = 100) -> None:
+        """
+        Initializes the healing.
+
+        Args:
+            enemy: The enemy that recovers.
+            room: The room the enemy is in.
+            amount: Health restored per run.
+            every: Ticks between two runs.
+            max_health: Health the enemy never heals beyond.
+        """
+        super().__init__(every)
+        self.enemy: Enemy = enemy
+        self.room: Room = room
+        self.amount: int = amount
+        self.max_health: int = max_health
+
+    def __call__(self, world: "World") -> Optional[int]:
+        room = world.room_of(self.enemy, self.room)
+        if room is None or self.enemy._health <= 0:
+            return None
+        self.room = room
+        world.heal(room, self.enemy, self.amount, self.max_health)
+        if self.enemy._health >= self.max_health:
+            return None
+        return self.every
+
+
+class WorldScheduler:
+    """Runs NPC actions as simulated time advances.
+
+    Pending actions wait in a heap ordered by the tick they are due, so
+    advancing time only touches the actions that are due. A world with a
+    million scheduled NPCs pays per tick for the few that act, not for
+    the ones that sleep. Players sharing a world all advance the same
+    clock, so advancing is serialized.
+
+    Actions given to schedule() are part of the schedule reset() returns
+    to. Actions given to wake() run only until they stop, for things that
+    happen in response to the game, such as a wounded enemy recovering.
+
+    Each action keeps a slot in a PersistentVector of queue entries and
+    states, which capture() and restore() update one changed slot at a
+    time, so the history can snapshot the scheduler after every command.
+    """
+
+    def __init__(self, world: "World") -> None:
+        """
+        Initializes an empty scheduler at tick 0.
+
+        Args:
+            world: The world the actions change.
+        """
+        self.world: "World" = world
+        self.now: int = 0
+        # Holds (due, sequence, slot). An entry whose slot is no longer
+        # pending at that due tick and sequence is stale, left behind by
+        # restore(), and is skipped when it comes up.
+        self._queue: List[Tuple[int, int, int]] = []
+        self._scheduled: List[Tuple[int, Action]] = []
+        self._sequence: int = 0
+        # Every action ever queued, at a slot it keeps, and its slot by id().
+        self._actions: List[Action] = []
+        self._slots: Dict[int, int] = {}
+        # The (due, sequence) of every queued action, by slot.
+        self._pending: Dict[int, Tuple[int, int]] = {}
+        # The entries of the last capture, and the slots changed since.
+        self._entries: PersistentVector = PersistentVector()
+        self._changed: Set[int] = set()
+        # Reentrant, so running actions can wake others.
+        self._lock: threading.RLock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _slot(self, action: Action) -> int:
+        """
+        Returns an action's slot, giving it one on its first use.
+
+        Args:
+            action: The action.
+
+        Returns:
+            int: The slot of the action.
+        """
+        slot = self._slots.get(id(action))
+        if slot is None:
+            slot = self._slots[id(action)] = len(self._actions)
+            self._actions.append(action)
+        return slot
+
+    def _push(self, due: int, slot: int) -> None:
+        """
+        Queues an action, keeping equal due ticks in scheduling order.
+
+        Args:
+            due: The tick the action runs at.
+            slot: The slot of the action to queue.
+        """
+        heapq.heappush(self._queue, (due, self._sequence, slot))
+        self._pending[slot] = (due, self._sequence)
+        self._changed.add(slot)
+        self._sequence += 1
+
+    def schedule(self, action: Action, delay: Optional[int] = None) -> None:
+        """
+        Schedules an action to run after a delay, then as it requests.
+
+        Args:
+            action: The action to run.
+            delay: Ticks until the first run, defaulting to action.every.
+        """
+        delay = action.every if delay is None else delay
+        with self._lock:
+            self._scheduled.append((delay, action))
+            self._push(self.now + delay, self._slot(action))
+
+    def wake(self, action: Action, delay: Optional[int] = None) -> bool:
+        """
+        Queues an action to run until it stops, unless it is queued.
+
+        Woken actions are not part of the schedule reset() returns to.
+
+        Args:
+            action: The action to run.
+            delay: Ticks until the first run, defaulting to action.every.
+
+        Returns:
+            bool: True if the action was queued, False if it already was.
+        """
+        with self._lock:
+            slot = self._slot(action)
+            if slot in self._pending:
+                return False
+            delay = action.every if delay is None else delay
+            self._push(self.now + delay, slot)
+            return True
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Moves time forward and runs every action that falls due.
+
+        Args:
+            ticks: How many ticks to advance.
+
+        Returns:
+            int: The number of actions that ran.
+        """
+        with self._lock:
+            target = self.now + ticks
+            queue = self._queue
+            pending = self._pending
+            fired = 0
+            while queue and queue[0][0] <= target:
+                due, sequence, slot = heapq.heappop(queue)
+                if pending.get(slot) != (due, sequence):
+                    continue
+                del pending[slot]
+                self._changed.add(slot)
+                self.now = due
+                fired += 1
+                again = self._actions[slot](self.world)
+                if again is not None:
+                    self._push(due + max(1, again), slot)
+            self.now = target
+            return fired
+
+    def reset(self) -> None:
+        """
+        Rewinds to tick 0 with every scheduled action as it was scheduled,
+        dropping the woken ones.
+        """
+        with self._lock:
+            self.now = 0
+            self._queue = []
+            self._pending = {}
+            self._sequence = 0
+            self._changed.update(range(len(self._actions)))
+            for delay, action in self._scheduled:
+                action.reset()
+                self._push(delay, self._slot(action))
+
+    def capture(self) -> SchedulerState:
+        """
+        Records the clock, the queue and the state of every action.
+
+        Only the entries of the actions that ran or were queued since the
+        last capture are replaced, so a capture costs time and memory for
+        those actions alone, and captures between two runs share all of
+        it but the clock.
+
+        Returns:
+            SchedulerState: A value to pass to restore().
+        """
+        with self._lock:
+            entries = self._entries
+            actions = self._actions
+            for slot in self._changed:
+                while len(entries) <= slot:
+                    entries = entries.append(None)
+                entries = entries.set(slot, (self._pending.get(slot),
+                                             actions[slot].capture()))
+            self._changed.clear()
+            self._entries = entries
+            return self.now, self._sequence, entries
+
+    def restore(self, state: SchedulerState) -> None:
+        """
+        Rewinds or fast-forwards to a state returned by capture().
+
+        Only the actions whose entries differ from the current ones are
+        touched. Actions first queued after the state was captured are
+        left out of the queue.
+
+        Args:
+            state: The captured scheduler.
+        """
+        with self._lock:
+            now, sequence, entries = state
+            current = self.capture()[2]
+            while len(entries) < len(current):
+                entries = entries.append(None)
+            while len(current) < len(entries):
+                current = current.append(None)
+            pending = self._pending
+            for slot in entries.differences(current):
+                entry = entries.get(slot)
+                timing = None
+                if entry is not None:
+                    timing, action_state = entry
+                    self._actions[slot].restore(action_state)
+                if timing is None:
+                    pending.pop(slot, None)
+                else:
+                    pending[slot] = timing
+                    heapq.heappush(self._queue, timing + (slot,))
+            self.now = now
+            self._sequence = sequence
+            self._entries = entries
+            if len(self._queue) > 2 * len(pending) + 64:
+                # Too many stale entries, so the heap is built afresh.
+                self._queue = [timing + (slot,)
+                               for slot, timing in pending.items()]
+                heapq.heapify(self._queue)
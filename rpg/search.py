@@ -0,0 +1,375 @@
+import json
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+    Tuple, TypeVar
+)
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.room.room import Room
+
+World = TypeVar("World")
+
+# What a search can find.
+KINDS: Tuple[str, ...] = ("room", "door", "npc")
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> Tuple[str, ...]:
+    """
+    Splits a text into the words the index knows it by.
+
+    Args:
+        text: Any text.
+
+    Returns:
+        Tuple[str, ...]: Its distinct lowercase words, in order.
+    """
+    return tuple(dict.fromkeys(_WORD.findall(text.lower())))
+
+
+class Match:
+    """Something a search found, and the room it is in."""
+
+    __slots__ = ("kind", "entity", "room", "room_name")
+
+    def __init__(self, kind: str, entity: Any, room: Room,
+                 room_name: str) -> None:
+        """
+        Initializes the match.
+
+        Args:
+            kind: One of KINDS.
+            entity: The room, door or NPC.
+            room: The room it is in, or the room itself.
+            room_name: The room's name in the world.
+        """
+        self.kind: str = kind
+        self.entity: Any = entity
+        self.room: Room = room
+        self.room_name: str = room_name
+
+    def toJSON(self) -> Dict[str, str]:
+        """
+        Converts the match to a JSON-compatible dictionary.
+
+        Returns:
+            Dict[str, str]: The kind, the description and the room name.
+        """
+        return {"kind": self.kind, "description": self.entity.description,
+                "room": self.room_name}
+
+
+class SearchIndex:
+    """Inverted index of the words describing a world's rooms, doors and
+    NPCs.
+
+    Every indexed thing is an entry, an index into parallel lists of
+    kinds, objects, rooms and words, and each word maps to the set of
+    entries it describes. A sorted vocabulary answers prefix queries
+    with a binary search.
+
+    Rooms and doors never change and are indexed once. NPCs are followed
+    through World.watch(): before each query the rooms that changed since
+    the last one are looked at again, so NPCs that moved are filed under
+    their new room and NPCs that left the world or were defeated are
+    dropped, all without touching anything else in the index.
+    """
+
+    def __init__(self, world: "World") -> None:
+        """
+        Indexes a world.
+
+        Args:
+            world: The world, whose changes the index then follows.
+        """
+        self.world: "World" = world
+        # Watched first, so that nothing changing while the rooms are
+        # indexed is missed.
+        self._changes: Dict[int, Room] = world.watch()
+        self._lock: threading.Lock = threading.Lock()
+        self._kinds: List[str] = []
+        self._entities: List[Any] = []
+        self._rooms: List[Optional[Room]] = []
+        self._words: List[Tuple[str, ...]] = []
+        self._free: List[int] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._built: bool = False
+        # The entry of each indexed NPC, and the NPC entries of each room,
+        # both by id().
+        self._npcs: Dict[int, int] = {}
+        self._room_npcs: Dict[int, Set[int]] = {}
+        for room in world.rooms.values():
+            self._add("room", room, room, room.description)
+            for door in room.doors:
+                self._add("door", door, room, door.description)
+            self._room_npcs[id(room)] = set()
+            for npc in room.npcs:
+                if self._standing(npc):
+                    self._add_npc(npc, room)
+        self._vocabulary = sorted(self._postings)
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._entities) - len(self._free)
+
+    @staticmethod
+    def _standing(npc: NPC) -> bool:
+        """Whether an NPC can be found: every NPC but defeated enemies."""
+        return not isinstance(npc, Enemy) or npc._health > 0
+
+    def _add(self, kind: str, entity: Any, room: Room, text: str) -> int:
+        """
+        Adds an entry.
+
+        Args:
+            kind: One of KINDS.
+            entity: The room, door or NPC.
+            room: The room it is in.
+            text: The text it is found by.
+
+        Returns:
+            int: The entry.
+        """
+        found = words(text)
+        values = (kind, entity, room, found)
+        columns = (self._kinds, self._entities, self._rooms, self._words)
+        if self._free:
+            entry = self._free.pop()
+            for column, value in zip(columns, values):
+                column[entry] = value
+        else:
+            entry = len(self._entities)
+            for column, value in zip(columns, values):
+                column.append(value)
+        postings = self._postings
+        for word in found:
+            entries = postings.get(word)
+            if entries is None:
+                entries = postings[word] = set()
+                # Sorted once the first build is done, then kept sorted.
+                if self._built:
+                    insort(self._vocabulary, word)
+            entries.add(entry)
+        return entry
+
+    def _add_npc(self, npc: NPC, room: Room) -> None:
+        """
+        Adds an NPC, found by its description and what it says.
+
+        Args:
+            npc: The NPC.
+            room: The room it is in.
+        """
+        entry = self._add("npc", npc, room,
+                          f"{npc.description} {npc.interact_message}")
+        self._npcs[id(npc)] = entry
+        self._room_npcs.setdefault(id(room), set()).add(entry)
+
+    def _remove(self, entry: int) -> None:
+        """
+        Removes an NPC's entry.
+
+        Words stay in the vocabulary with fewer or no entries, so removing
+        never reorders it.
+
+        Args:
+            entry: The entry.
+        """
+        postings = self._postings
+        for word in self._words[entry]:
+            postings[word].discard(entry)
+        del self._npcs[id(self._entities[entry])]
+        self._entities[entry] = None
+        self._rooms[entry] = None
+        self._words[entry] = ()
+        self._free.append(entry)
+
+    def refresh(self) -> None:
+        """Brings the NPC entries of every room that changed up to date."""
+        changes = self._changes
+        if not changes:
+            return
+        with self._lock:
+            rooms: List[Room] = []
+            while changes:
+                try:
+                    rooms.append(changes.popitem()[1])
+                except KeyError:
+                    break
+            present: Dict[int, Tuple[NPC, Room]] = {}
+            for room in rooms:
+                for npc in room.npcs:
+                    if self._standing(npc):
+                        present[id(npc)] = (npc, room)
+            # NPCs no longer in a changed room either moved to another
+            # changed room, refiled below, or are gone.
+            for room in rooms:
+                mine = self._room_npcs.setdefault(id(room), set())
+                for entry in list(mine):
+                    where = present.get(id(self._entities[entry]))
+                    if where is None or where[1] is not room:
+                        mine.discard(entry)
+                        if where is None:
+                            self._remove(entry)
+            for npc, room in present.values():
+                entry = self._npcs.get(id(npc))
+                if entry is None:
+                    self._add_npc(npc, room)
+                elif self._rooms[entry] is not room:
+                    self._rooms[entry] = room
+                    self._room_npcs[id(room)].add(entry)
+
+    def _prefixed(self, prefix: str) -> Iterator[int]:
+        """
+        Yields the entries with a word starting with a prefix, each once.
+
+        Args:
+            prefix: The prefix.
+
+        Yields:
+            int: The entries, those of the shortest words first.
+        """
+        vocabulary = self._vocabulary
+        postings = self._postings
+        seen: Set[int] = set()
+        for index in range(bisect_left(vocabulary, prefix),
+                           len(vocabulary)):
+            word = vocabulary[index]
+            if not word.startswith(prefix):
+                return
+            for entry in postings[word]:
+                if entry not in seen:
+                    seen.add(entry)
+                    yield entry
+
+    def _span(self, prefix: str) -> int:
+        """
+        Counts the words of the vocabulary starting with a prefix.
+
+        Args:
+            prefix: The prefix.
+
+        Returns:
+            int: The number of words.
+        """
+        vocabulary = self._vocabulary
+        return (bisect_left(vocabulary, prefix + "\U0010ffff")
+                - bisect_left(vocabulary, prefix))
+
+    def query(self, text: str, limit: int = 10,
+              kinds: Optional[Sequence[str]] = None) -> List[Match]:
+        """
+        Finds what is described by every word of a text.
+
+        All words but the last must match whole words; the last one also
+        matches words it is the start of, so "rival 1" finds "Rival 12".
+
+        Args:
+            text: The words to look for.
+            limit: The most matches to return.
+            kinds: The kinds of things to find, every kind by default.
+
+        Returns:
+            List[Match]: The matches, at most limit of them.
+        """
+        self.refresh()
+        terms = _WORD.findall(text.lower())
+        if not terms or limit <= 0:
+            return []
+        *whole, prefix = terms
+        wanted = set(KINDS if kinds is None else kinds)
+        with self._lock:
+            required: List[Set[int]] = []
+            for term in whole:
+                entries = self._postings.get(term)
+                if not entries:
+                    return []
+                required.append(entries)
+            required.sort(key=len)
+            candidates: Iterable[int]
+            if required and len(required[0]) <= self._span(prefix):
+                # The rarest whole word is the shorter list to go through.
+                smallest = required.pop(0)
+                candidates = (
+                    entry for entry in smallest
+                    if any(word.startswith(prefix)
+                           for word in self._words[entry])
+                )
+            else:
+                candidates = self._prefixed(prefix)
+            matches: List[Match] = []
+            for entry in candidates:
+                if self._kinds[entry] not in wanted or not all(
+                        entry in entries for entries in required):
+                    continue
+                room = self._rooms[entry]
+                matches.append(Match(self._kinds[entry],
+                                     self._entities[entry], room,
+                                     self.world.room_name(room)))
+                if len(matches) >= limit:
+                    break
+            return matches
+
+
+def serve(world_of: Callable[[], "World"], port: int = 9109,
+          host: str = "127.0.0.1"):
+    """
+    Serves search queries as JSON over HTTP from a background thread.
+
+    GET /search?q=<words>[&limit=N][&kind=room|door|npc] answers with
+    {"query": ..., "matches": [...]}, each match as Match.toJSON() gives
+    it.
+
+    Args:
+        world_of: Returns the world to search, asked again on every
+            request, since a game loading a save changes worlds.
+        port: The port to listen on, 0 for any free port.
+        host: The address to listen on, local only by default.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() on it to
+        stop serving.
+    """
+    # Imported here so games that never serve searches skip them.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path != "/search" or "q" not in params:
+                self.send_error(404, "Use /search?q=<words>.")
+                return
+            try:
+                limit = int(params.get("limit", ["10"])[0])
+            except ValueError:
+                self.send_error(400, "The limit must be a number.")
+                return
+            query = params["q"][0]
+            matches = world_of().search.query(query, limit,
+                                              params.get("kind"))
+            body = json.dumps({
+                "query": query,
+                "matches": [match.toJSON() for match in matches],
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type",
+                             "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), SearchHandler)
+    thread = threading.Thread(target=server.serve_forever,
+                              name="search", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,149 @@
+import contextlib
+import functools
+import gc
+import hashlib
+from typing import Hashable, Iterator, Optional, TypeVar
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.npcs.registry import kind_of
+from rpg.room.room import Room
+
+Game = TypeVar("Game")
+World = TypeVar("World")
+
+# State hashes are sums of 64-bit components, wrapped to 64 bits.
+MASK: int = 2**64 - 1
+
+
+@functools.lru_cache(maxsize=2**16)
+def component(*parts: Hashable) -> int:
+    """
+    Maps one fact about the game to a 64-bit number.
+
+    The number comes from BLAKE2b over the repr of the parts, so it is the
+    same in every process and on every machine, unlike Python's hash(),
+    which is salted per process for strings.
+
+    Args:
+        *parts: Strings, integers and None describing the fact.
+
+    Returns:
+        int: The fact's 64-bit component.
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+def npc_component(room_name: str, npc: NPC) -> int:
+    """
+    Returns the component of an NPC standing in a room.
+
+    Args:
+        room_name: The name of the room the NPC is in.
+        npc: The NPC. Enemies include their health.
+
+    Returns:
+        int: The NPC's component.
+    """
+    health: Optional[int] = None
+    if isinstance(npc, Enemy):
+        # Read past pydantic's private attribute lookup, which costs more
+        # than the rest of this function when hashing whole worlds.
+        health = npc.__pydantic_private__["_health"]
+    return component("npc", room_name, kind_of(npc).tag, npc.description,
+                     health)
+
+
+def room_hash(room_name: str, room: Room) -> int:
+    """
+    Sums the components of every NPC in a room.
+
+    Args:
+        room_name: The name of the room.
+        room: The room.
+
+    Returns:
+        int: The room's share of the world hash.
+    """
+    return sum(npc_component(room_name, npc) for npc in room.npcs) & MASK
+
+
+@contextlib.contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pauses the garbage collector while a whole world is hashed.
+
+    Hashing allocates an entry in the component cache per NPC, and in a
+    large world each collection those allocations trigger walks every
+    room and NPC, which costs several times the hashing itself.
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def recompute_world_hash(world: "World") -> int:
+    """
+    Computes a world's hash from scratch, ignoring what it maintains.
+
+    Args:
+        world: The world to hash.
+
+    Returns:
+        int: The hash World.state_hash should hold.
+    """
+    with gc_paused():
+        return sum(room_hash(name, room)
+                   for name, room in world.rooms.items()) & MASK
+
+
+def _player_component(game: "Game") -> int:
+    """
+    Returns the component of a game's own state: where its player is,
+    the player's health and the enemies the player defeated.
+
+    Args:
+        game: The game.
+
+    Returns:
+        int: The component.
+    """
+    private = game.player.__pydantic_private__
+    room = private["_current_room"]
+    room_name = game.world.room_name(room) if room else None
+    return component("player", room_name, private["_health"],
+                     game.enemies_defeated)
+
+
+def game_hash(game: "Game") -> int:
+    """
+    Returns the state hash of a game in constant time.
+
+    The world keeps its share up to date as it changes, and the player's
+    share is a single component.
+
+    Args:
+        game: The game to hash.
+
+    Returns:
+        int: The 64-bit state hash.
+    """
+    return (game.world.state_hash + _player_component(game)) & MASK
+
+
+def recompute_game_hash(game: "Game") -> int:
+    """
+    Computes a game's state hash from scratch, to check game_hash().
+
+    Args:
+        game: The game to hash.
+
+    Returns:
+        int: The 64-bit state hash.
+    """
+    return (recompute_world_hash(game.world)
+            + _player_component(game)) & MASK
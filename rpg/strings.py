@@ -0,0 +1,171 @@
+from typing import Any, Callable, Dict, List, Sequence
+from rpg.statehash import gc_paused
+
+# The keys whose text values are descriptions and dialogue, the text that
+# repeats across a save: a door's description shows up in both rooms it
+# joins, and the player's room is saved a second time with the player.
+TEXT_KEYS: frozenset = frozenset({
+    "description", "interact_message", "leads_to", "current_room"
+})
+
+
+class StringCatalog:
+    """The distinct texts of one save, each stored once and known by ID.
+
+    A text's ID is its position in the catalog. Saving gives every text
+    an ID and writes the catalog once, so a save refers to texts by ID
+    however often they repeat. Loading hands out the catalog's copy of
+    each text, so every room, door and NPC with the same text shares one
+    string instead of owning a copy.
+    """
+
+    def __init__(self, texts: Sequence[str] = ()) -> None:
+        """
+        Initializes the catalog.
+
+        Args:
+            texts: The texts, in ID order, such as a save's catalog.
+        """
+        self.texts: List[str] = list(texts)
+        self._ids: Dict[str, int] = {
+            text: index for index, text in enumerate(self.texts)
+        }
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def id_of(self, text: str) -> int:
+        """
+        Returns the ID of a text, giving new texts the next ID.
+
+        Args:
+            text: The text.
+
+        Returns:
+            int: Its ID.
+        """
+        index = self._ids.get(text)
+        if index is None:
+            index = self._ids[text] = len(self.texts)
+            self.texts.append(text)
+        return index
+
+    def intern(self, text: str) -> str:
+        """
+        Returns the catalog's copy of a text, adding it if it is new.
+
+        Args:
+            text: The text.
+
+        Returns:
+            str: The shared copy, equal to the text.
+        """
+        return self.texts[self.id_of(text)]
+
+    def text(self, index: int) -> str:
+        """
+        Looks up a text by ID.
+
+        Args:
+            index: The ID.
+
+        Returns:
+            str: The text.
+
+        Raises:
+            ValueError: If the catalog has no text with that ID.
+        """
+        if not 0 <= index < len(self.texts):
+            raise ValueError(f"No text with ID {index}.")
+        return self.texts[index]
+
+
+def _convert(value: Any, kind: type, convert: Callable[[Any], Any],
+             copy: bool = True) -> Any:
+    """
+    Converts the values of TEXT_KEYS of one type throughout a JSON tree.
+
+    Args:
+        value: The tree.
+        kind: The exact type of the values to convert, so int leaves
+            booleans alone.
+        convert: Converts one value.
+        copy: Whether to convert a copy, or the tree itself.
+
+    Returns:
+        Any: The converted tree.
+    """
+    keys = TEXT_KEYS
+
+    # Leaves are looked at where they are found rather than in a call of
+    # their own, which is most of the work on a large save.
+    def walk(node: Any) -> Any:
+        if type(node) is dict:
+            out = {} if copy else node
+            for key, item in node.items():
+                found = type(item)
+                if found is kind and key in keys:
+                    out[key] = convert(item)
+                elif found is dict or found is list:
+                    out[key] = walk(item)
+                elif copy:
+                    out[key] = item
+            return out
+        if type(node) is list:
+            if copy:
+                return [walk(item) for item in node]
+            for index, item in enumerate(node):
+                if type(item) is dict or type(item) is list:
+                    node[index] = walk(item)
+        return node
+
+    # A save holds a dict per room, door and NPC; collections set off by
+    # building them would walk them all again and again.
+    with gc_paused():
+        return walk(value)
+
+
+def pack(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rewrites a save to refer to its texts by ID, under "strings".
+
+    Saves without any text are returned as they are.
+
+    Args:
+        data: A save such as Game.toJSON() gives.
+
+    Returns:
+        Dict[str, Any]: The compact save.
+    """
+    catalog = StringCatalog()
+    packed = _convert(data, str, catalog.id_of)
+    if not catalog:
+        return data
+    packed["strings"] = catalog.texts
+    return packed
+
+
+def unpack(data: Any) -> Any:
+    """
+    Turns a save written by pack() back into the form Game.fromJSON()
+    reads, with one shared string per distinct text.
+
+    The save is changed in place, as it is freshly read and that keeps a
+    large save from being held twice. Saves written before pack() existed
+    hold their texts in place; those texts are shared the same way.
+
+    Args:
+        data: The save.
+
+    Returns:
+        Any: The save, with texts in place.
+
+    Raises:
+        ValueError: If the save refers to a text it does not have.
+    """
+    if not isinstance(data, dict):
+        return data
+    if "strings" not in data:
+        return _convert(data, str, StringCatalog().intern, copy=False)
+    strings = StringCatalog(data.pop("strings"))
+    return _convert(data, int, strings.text, copy=False)
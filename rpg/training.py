@@ -0,0 +1,359 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+from rpg.npcs.moves import CATALOG, Move, MovePolicy, MoveSet
+
+# Healths are told apart in buckets of this size, up to LIMIT.
+BUCKET: int = 5
+LIMIT: int = 100
+WIDTH: int = (LIMIT + BUCKET - 1) // BUCKET
+STATES: int = WIDTH * WIDTH
+
+# Health of both contestants when a training battle starts.
+START_HEALTH: int = 100
+
+# A rollout's experience: flat (state * moves + move, next state, reward)
+# triples, with -1 as the next state of the last move of a battle.
+Experience = List[int]
+RolloutJob = Tuple[List[float], List[float], Tuple[Move, ...],
+                   Tuple[Move, ...], float, int, int]
+
+
+def cell(player_health: int, enemy_health: int) -> int:
+    """
+    Returns the state of a battle, as MovePolicy.cell() numbers it.
+
+    Args:
+        player_health: The player's health, at least 1.
+        enemy_health: The enemy's health, at least 1.
+
+    Returns:
+        int: The state's index.
+    """
+    player = (min(player_health, LIMIT) - 1) // BUCKET
+    enemy = (min(enemy_health, LIMIT) - 1) // BUCKET
+    return player * WIDTH + enemy
+
+
+def rollout(job: RolloutJob) -> Tuple[Experience, Experience]:
+    """
+    Plays battles headless, both sides picking moves epsilon-greedily.
+
+    This is a module function so that worker processes can run it.
+
+    Args:
+        job: Snapshots of the player's and the enemy's Q tables, both
+            move sets, the chance of a random move, the number of battles
+            and the seed.
+
+    Returns:
+        Tuple[Experience, Experience]: What the player and the enemy
+        experienced. A win is worth 1 to the winner and -1 to the loser.
+    """
+    q_player, q_enemy, player_moves, enemy_moves, epsilon, battles, \
+        seed = job
+    rng = random.Random(seed)
+    draw = rng.random
+    player_rolls = [(move.low, move.high - move.low + 1 if move.uniform
+                     else 0, move) for move in player_moves]
+    enemy_rolls = [(move.low, move.high - move.low + 1 if move.uniform
+                    else 0, move) for move in enemy_moves]
+    player_count, enemy_count = len(player_rolls), len(enemy_rolls)
+    player_log: Experience = []
+    enemy_log: Experience = []
+    for _ in range(battles):
+        health = enemy_health = START_HEALTH
+        waiting = -1
+        while True:
+            state = cell(health, enemy_health)
+            if draw() < epsilon:
+                move = int(draw() * player_count)
+            else:
+                row = q_player[state * player_count:
+                               (state + 1) * player_count]
+                move = row.index(max(row))
+            low, span, dance = player_rolls[move]
+            enemy_health -= (low + int(draw() * span) if span
+                             else dance.roll(rng))
+            chosen = state * player_count + move
+            if enemy_health <= 0:
+                player_log.extend((chosen, -1, 1))
+                if waiting >= 0:
+                    enemy_log.extend((waiting, -1, -1))
+                break
+
+            reply_state = cell(health, enemy_health)
+            if waiting >= 0:
+                enemy_log.extend((waiting, reply_state, 0))
+            if draw() < epsilon:
+                reply = int(draw() * enemy_count)
+            else:
+                row = q_enemy[reply_state * enemy_count:
+                              (reply_state + 1) * enemy_count]
+                reply = row.index(max(row))
+            low, span, dance = enemy_rolls[reply]
+            health -= (low + int(draw() * span) if span
+                       else dance.roll(rng))
+            waiting = reply_state * enemy_count + reply
+            if health <= 0:
+                player_log.extend((chosen, -1, -1))
+                enemy_log.extend((waiting, -1, 1))
+                break
+            player_log.extend((chosen, cell(health, enemy_health), 0))
+    return player_log, enemy_log
+
+
+class QTrainer:
+    """Learns move policies for both sides of a battle by Q-learning.
+
+    The state of a battle is the pair of health buckets, and each side
+    keeps a table of the value of every move in every state, stored as
+    one flat list. Headless battles are played in worker processes with
+    snapshots of the tables, picking a random move with a chance epsilon
+    that shrinks as training goes on; their experience then updates the
+    tables here. The player learns to win and the enemy learns to stop
+    it, each against the other's current play.
+    """
+
+    def __init__(self, player_moves: Optional[MoveSet] = None,
+                 enemy_moves: Optional[MoveSet] = None,
+                 alpha: float = 0.1, gamma: float = 1.0,
+                 seed: int = 0) -> None:
+        """
+        Initializes untrained tables.
+
+        Args:
+            player_moves: The player's moves, the catalog's by default.
+            enemy_moves: The enemy's moves, the default set by default.
+            alpha: The learning rate.
+            gamma: How much a later reward counts for an earlier move.
+            seed: Seed of the rollouts.
+        """
+        self.player_moves: MoveSet = player_moves or CATALOG.player
+        self.enemy_moves: MoveSet = enemy_moves or CATALOG.get("default")
+        self.alpha: float = alpha
+        self.gamma: float = gamma
+        self.seed: int = seed
+        self.q_player: List[float] = [0.0] * (STATES
+                                              * len(self.player_moves))
+        self.q_enemy: List[float] = [0.0] * (STATES * len(self.enemy_moves))
+        self.episodes: int = 0
+        self.seconds: float = 0.0
+
+    @property
+    def episodes_per_second(self) -> float:
+        """The training throughput so far, in battles per second."""
+        return self.episodes / self.seconds if self.seconds else 0.0
+
+    def _learn(self, table: List[float], experience: Experience,
+               moves: int) -> None:
+        """
+        Applies Q-learning updates to a table.
+
+        Args:
+            table: The Q table.
+            experience: Triples from rollout().
+            moves: The number of moves per state.
+        """
+        alpha, gamma = self.alpha, self.gamma
+        for index in range(0, len(experience), 3):
+            chosen = experience[index]
+            after = experience[index + 1]
+            target = experience[index + 2]
+            if after >= 0:
+                start = after * moves
+                target += gamma * max(table[start:start + moves])
+            table[chosen] += alpha * (target - table[chosen])
+
+    def train(self, episodes: int, workers: Optional[int] = None,
+              batch: int = 2000, rollouts: int = 8,
+              epsilon: Tuple[float, float] = (1.0, 0.05)) -> float:
+        """
+        Plays and learns from a number of battles.
+
+        Training goes in rounds of a fixed number of rollouts, all played
+        with the same snapshot of the tables, so the number of workers
+        changes how fast training goes but not what is learned.
+
+        Args:
+            episodes: The number of battles.
+            workers: The number of rollout processes, one per CPU by
+                default. With 1, everything runs in this process.
+            batch: The battles of one rollout.
+            rollouts: The rollouts of a round.
+            epsilon: The chance of a random move at the start and at the
+                end of training, shrinking linearly in between.
+
+        Returns:
+            float: The throughput of this call, in battles per second.
+        """
+        workers = workers or os.cpu_count() or 1
+        began = time.perf_counter()
+        played = 0
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 \
+            else None
+        try:
+            while played < episodes:
+                fraction = played / episodes
+                chance = epsilon[0] + (epsilon[1] - epsilon[0]) * fraction
+                jobs: List[RolloutJob] = []
+                while played < episodes and len(jobs) < rollouts:
+                    count = min(batch, episodes - played)
+                    jobs.append((self.q_player, self.q_enemy,
+                                 self.player_moves.moves,
+                                 self.enemy_moves.moves, chance, count,
+                                 self.seed * 1000003 + self.episodes
+                                 + played))
+                    played += count
+                # Every rollout of a round sees the same snapshot, so all
+                # of them finish before the tables change.
+                results = list(pool.map(rollout, jobs) if pool
+                               else map(rollout, jobs))
+                for player_log, enemy_log in results:
+                    self._learn(self.q_player, player_log,
+                                len(self.player_moves))
+                    self._learn(self.q_enemy, enemy_log,
+                                len(self.enemy_moves))
+        finally:
+            if pool:
+                pool.shutdown()
+        elapsed = time.perf_counter() - began
+        self.episodes += played
+        self.seconds += elapsed
+        return played / elapsed if elapsed else 0.0
+
+    def policies(self) -> Tuple[MovePolicy, MovePolicy]:
+        """
+        Exports the best move of every state as lookup tables.
+
+        Returns:
+            Tuple[MovePolicy, MovePolicy]: The player's and the enemy's
+            policy.
+        """
+        exported = []
+        for table, moves in ((self.q_player, len(self.player_moves)),
+                             (self.q_enemy, len(self.enemy_moves))):
+            best = bytearray(STATES)
+            for state in range(STATES):
+                row = table[state * moves:(state + 1) * moves]
+                best[state] = row.index(max(row))
+            exported.append(MovePolicy(bytes(best), BUCKET, LIMIT))
+        return exported[0], exported[1]
+
+
+def win_rate(player: Optional[MovePolicy], enemy: Optional[MovePolicy],
+             battles: int = 10000, seed: int = 0,
+             player_moves: Optional[MoveSet] = None,
+             enemy_moves: Optional[MoveSet] = None) -> float:
+    """
+    Measures how often the player wins when both sides follow policies.
+
+    Args:
+        player: The player's policy, or None for random moves.
+        enemy: The enemy's policy, or None for its usual random replies.
+        battles: The number of battles.
+        seed: Seed of the battles.
+        player_moves: The player's moves, the catalog's by default.
+        enemy_moves: The enemy's moves, the default set by default.
+
+    Returns:
+        float: The share of battles the player won.
+    """
+    player_moves = player_moves or CATALOG.player
+    enemy_moves = enemy_moves or CATALOG.get("default")
+    rng = random.Random(seed)
+    wins = 0
+    for _ in range(battles):
+        health = enemy_health = START_HEALTH
+        while True:
+            move = (player.choose(health, enemy_health) if player
+                    else rng.randrange(len(player_moves)))
+            enemy_health -= player_moves.moves[move].roll(rng)
+            if enemy_health <= 0:
+                wins += 1
+                break
+            reply = (enemy_moves.moves[enemy.choose(health, enemy_health)]
+                     if enemy else enemy_moves.pick(rng))
+            health -= reply.roll(rng)
+            if health <= 0:
+                break
+    return wins / battles
+
+
+def export_policies(path: str, player: MovePolicy, enemy: MovePolicy,
+                    moveset: str = "default") -> None:
+    """
+    Writes learned policies to a JSON file for install_policies().
+
+    Args:
+        path: The file.
+        player: The player's policy.
+        enemy: The enemies' policy.
+        moveset: The move set the enemies' policy is for.
+    """
+    with open(path, "w") as file:
+        json.dump({"player": player.toJSON(),
+                   "enemies": {moveset: enemy.toJSON()}}, file)
+
+
+def install_policies(path: str) -> None:
+    """
+    Gives the catalog's move sets the policies stored in a file.
+
+    Args:
+        path: A file written by export_policies().
+
+    Raises:
+        ValueError: If a policy picks moves its set does not have.
+    """
+    with open(path, "r") as file:
+        data: Any = json.load(file)
+    assignments = [(CATALOG.player, MovePolicy.fromJSON(data["player"]))]
+    for name, policy in data.get("enemies", {}).items():
+        assignments.append((CATALOG.get(name), MovePolicy.fromJSON(policy)))
+    for moves, policy in assignments:
+        if max(policy.table) >= len(moves):
+            raise ValueError(f"The policy for {moves.name!r} picks moves "
+                             f"the set does not have.")
+    for moves, policy in assignments:
+        moves.policy = policy
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Learns battle move policies by Q-learning and exports "
+                    "them as lookup tables."
+    )
+    parser.add_argument("--episodes", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=2000,
+                        help="battles per rollout")
+    parser.add_argument("--rollouts", type=int, default=8,
+                        help="rollouts between table updates")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="policies.json")
+    args = parser.parse_args(argv)
+
+    trainer = QTrainer(seed=args.seed)
+    rate = trainer.train(args.episodes, args.workers, args.batch,
+                         args.rollouts)
+    player, enemy = trainer.policies()
+    export_policies(args.output, player, enemy)
+    print(f"Trained on {trainer.episodes} battles at {rate:,.0f} "
+          f"episodes/sec; policies written to {args.output}.")
+    print("Player win rate:")
+    for label, mine, theirs in (("random vs random", None, None),
+                                ("learned vs random", player, None),
+                                ("random vs learned", None, enemy),
+                                ("learned vs learned", player, enemy)):
+        print(f"  {label:<20} {win_rate(mine, theirs):6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,821 @@
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from rpg.room.room import Room
+from rpg.room.door import Door
+from rpg.npcs.npc import NPC
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+from rpg.navigation import WorldGraph
+from rpg.scheduler import HealUp, Patrol, Roam, WorldScheduler
+from rpg.search import SearchIndex
+from rpg.statehash import MASK, gc_paused, npc_component, room_hash
+
+
+PristineNPCs = Tuple[Tuple[int, NPC, Optional[int]], ...]
+
+
+class World:
+    """A set of rooms that one or more players explore together.
+
+    Every room owns its own lock, so a player fighting or removing NPCs in
+    one room never waits on players busy in other rooms.
+
+    The world also remembers the NPCs each room started with. Changes made
+    through its methods mark the room dirty, and reset() restores only the
+    dirty rooms instead of rebuilding every room, door and NPC.
+
+    NPCs can act on their own through the world's scheduler, which moves
+    them between rooms as the game's ticks go by. Once heal_wounded() is
+    called, every enemy that is struck and survives recovers over the
+    following ticks, so only wounded enemies cost the scheduler anything.
+
+    Others can watch() the world to learn which rooms changed, and
+    room_state() and restore_room() take a room's NPCs back to any
+    earlier state, as the game's history does.
+
+    The world can also keep a 64-bit hash of where its NPCs stand and how
+    healthy its enemies are. It is the sum of one component per NPC, so
+    once state_hash has been read, each change made through the world's
+    methods swaps a component or two instead of hashing everything again.
+
+    Its search index finds rooms, doors and NPCs by the words describing
+    them, and follows the NPCs as they move or are defeated.
+    """
+
+    def __init__(self, rooms: Dict[str, Room],
+                 start_room: Optional[Room]) -> None:
+        """
+        Initializes the world and the pristine state that reset()
+        returns to.
+
+        Args:
+            rooms: The rooms of the world, keyed by name.
+            start_room: The room new players enter first.
+        """
+        self.rooms: Dict[str, Room] = rooms
+        self.start_room: Optional[Room] = start_room
+        # Made on each room's first use, since most rooms of a large world
+        # are never locked.
+        self._locks: Dict[int, threading.RLock] = {}
+        self._locks_guard: threading.Lock = threading.Lock()
+        self._pristine: Dict[int, Tuple[Room, PristineNPCs]] = {
+            id(room): (room, self._capture(room)) for room in rooms.values()
+        }
+        self._dirty: Dict[int, Room] = {}
+        self._watchers: List[Dict[int, Room]] = []
+        # The room each NPC was last moved, added or restored to, by id().
+        # NPCs that never left their first room are not in it.
+        self._where: Dict[int, Room] = {}
+        # How wounded enemies recover, and the healing of each enemy that
+        # was wounded, by id().
+        self._healing: Optional[Tuple[int, int, int]] = None
+        self._healers: Dict[int, HealUp] = {}
+        # Built on the first read of state_hash, then kept up to date.
+        self._names: Optional[Dict[int, str]] = None
+        self._room_hashes: Optional[Dict[int, int]] = None
+        self._state_hash: int = 0
+        self._hashed: bool = False
+        self._hash_lock: threading.Lock = threading.Lock()
+        self._hash_build_lock: threading.Lock = threading.Lock()
+        self._graph: Optional[WorldGraph] = None
+        self._search: Optional[SearchIndex] = None
+        self.scheduler: WorldScheduler = WorldScheduler(self)
+
+    @property
+    def graph(self) -> WorldGraph:
+        """The door graph of the world, indexed on first use."""
+        if self._graph is None:
+            self._graph = WorldGraph(self.rooms)
+        return self._graph
+
+    @property
+    def search(self) -> SearchIndex:
+        """The text index of the world, built on first use."""
+        if self._search is None:
+            self._search = SearchIndex(self)
+        return self._search
+
+    @staticmethod
+    def _capture(room: Room) -> PristineNPCs:
+        """
+        Records a room's NPCs with their handles and each enemy's health.
+
+        Args:
+            room: The room to capture.
+
+        Returns:
+            PristineNPCs: Each NPC with its handle and health, or None for
+            NPCs without health.
+        """
+        npcs = room.npcs
+        if not npcs:
+            return ()
+        # Health is read from the private values directly, as pydantic's
+        # lookup of private attributes costs more than the rest of this.
+        return tuple([
+            (handle, npc, npc.__pydantic_private__["_health"]
+             if isinstance(npc, Enemy) else None)
+            for handle, npc in npcs.items()
+        ])
+
+    @property
+    def state_hash(self) -> int:
+        """The 64-bit hash of the NPCs in every room, hashed on first use."""
+        if not self._hashed:
+            with self._hash_build_lock:
+                if not self._hashed:
+                    self._build_hash()
+                    self._hashed = True
+        return self._state_hash
+
+    def _build_hash(self) -> None:
+        """
+        Hashes every room, one room lock at a time.
+
+        Each room's share is published as soon as it is hashed, so changes
+        made meanwhile in hashed rooms update it, and rooms not reached yet
+        are hashed with their changes already made.
+        """
+        self._room_hashes = {}
+        with gc_paused():
+            for name, room in self.rooms.items():
+                with self.lock_for(room):
+                    fresh = room_hash(name, room)
+                    with self._hash_lock:
+                        self._room_hashes[id(room)] = fresh
+                        self._state_hash = (self._state_hash + fresh) & MASK
+
+    def room_name(self, room: Room) -> str:
+        """
+        Returns the name a room has in this world.
+
+        Args:
+            room: The room.
+
+        Returns:
+            str: Its key in rooms, or its description for rooms that are
+            not part of the world.
+        """
+        names = self._names
+        if names is None:
+            names = self._names = {
+                id(candidate): name for name, candidate in self.rooms.items()
+            }
+        return names.get(id(room), room.description)
+
+    def room_of(self, npc: NPC, near: Room) -> Optional[Room]:
+        """
+        Finds the room an NPC is in now.
+
+        Args:
+            npc: The NPC.
+            near: The room the NPC was last known to be in, looked at
+                first.
+
+        Returns:
+            Optional[Room]: The NPC's room, or None if no room of the world
+            holds it.
+        """
+        if npc in near.npcs:
+            return near
+        room = self._where.get(id(npc))
+        if room is not None and npc in room.npcs:
+            return room
+        return None
+
+    def _lock_where(self, npc: NPC,
+                    near: Room) -> Tuple[Room, threading.RLock]:
+        """
+        Acquires the lock of the room an NPC is in.
+
+        The NPC can move while the lock is awaited, so the room is looked
+        up again once the lock is held.
+
+        Args:
+            npc: The NPC.
+            near: The room the NPC was last known to be in, which is also
+                used for NPCs that are in no room of the world.
+
+        Returns:
+            Tuple[Room, threading.RLock]: The room and its lock, which the
+            caller releases.
+        """
+        room = self.room_of(npc, near) or near
+        while True:
+            lock = self.lock_for(room)
+            lock.acquire()
+            current = self.room_of(npc, room) or room
+            if current is room:
+                return room, lock
+            lock.release()
+            room = current
+
+    def _component(self, room: Room, npc: NPC) -> int:
+        """
+        Returns the state hash component of an NPC in a room.
+
+        Callers hold the room's lock, so whether the room is hashed cannot
+        change between reading the components before and after a change.
+
+        Args:
+            room: The room the NPC is in.
+            npc: The NPC.
+
+        Returns:
+            int: The component, or 0 while the room is not hashed.
+        """
+        hashes = self._room_hashes
+        if hashes is None or id(room) not in hashes:
+            return 0
+        return npc_component(self.room_name(room), npc)
+
+    def _shift(self, room: Room, old: int, new: int) -> None:
+        """
+        Replaces one component of a room's share of the state hash.
+
+        Args:
+            room: The room that changed.
+            old: The component to take out, 0 for none.
+            new: The component to put in, 0 for none.
+        """
+        if old == new:
+            return
+        delta = new - old
+        with self._hash_lock:
+            key = id(room)
+            self._room_hashes[key] = (self._room_hashes[key] + delta) & MASK
+            self._state_hash = (self._state_hash + delta) & MASK
+
+    def _rehash(self, room: Room) -> None:
+        """
+        Recomputes a room's share of the state hash from its NPCs.
+
+        Args:
+            room: The room, changed in ways the world did not see.
+        """
+        hashes = self._room_hashes
+        if hashes is None or id(room) not in hashes:
+            return
+        fresh = room_hash(self.room_name(room), room)
+        with self._hash_lock:
+            self._state_hash = (self._state_hash + fresh
+                                - hashes[id(room)]) & MASK
+            hashes[id(room)] = fresh
+
+    def _mark(self, room: Room) -> None:
+        """
+        Records that a room changed, for reset() and for every watcher.
+
+        Args:
+            room: The room that changed.
+        """
+        self._dirty[id(room)] = room
+        for changes in self._watchers:
+            changes[id(room)] = room
+
+    def watch(self) -> Dict[int, Room]:
+        """
+        Starts collecting the rooms that change from now on.
+
+        Returns:
+            Dict[int, Room]: A dictionary the world adds every changed room
+            to, keyed by id(room). The watcher empties it as it sees fit.
+        """
+        changes: Dict[int, Room] = {}
+        self._watchers.append(changes)
+        return changes
+
+    def unwatch(self, changes: Dict[int, Room]) -> None:
+        """
+        Stops collecting changes into a dictionary returned by watch().
+
+        Args:
+            changes: The dictionary.
+        """
+        self._watchers = [watched for watched in self._watchers
+                          if watched is not changes]
+
+    def touch(self, room: Room) -> None:
+        """
+        Marks a room as changed so the next reset() restores it, and
+        recomputes its share of the state hash.
+
+        Args:
+            room: The room that was changed outside the world's methods.
+        """
+        self._mark(room)
+        self._rehash(room)
+
+    def room_state(self, room: Room) -> PristineNPCs:
+        """
+        Captures a room's NPCs, their handles and the enemies' health.
+
+        Args:
+            room: The room to capture.
+
+        Returns:
+            PristineNPCs: An immutable record for restore_room().
+        """
+        with self.lock_for(room):
+            return self._capture(room)
+
+    def _put(self, room: Room, npcs: PristineNPCs) -> None:
+        """
+        Gives a room the NPCs and health of a captured state.
+
+        Args:
+            room: The room to restore. Its lock must be held.
+            npcs: A state returned by _capture().
+        """
+        room.npcs.restore((handle, npc) for handle, npc, _ in npcs)
+        where = self._where
+        for _, npc, health in npcs:
+            where[id(npc)] = room
+            if health is not None:
+                npc._health = health
+        self._rehash(room)
+
+    def restore_room(self, room: Room, npcs: PristineNPCs) -> None:
+        """
+        Puts a room back into a state returned by room_state().
+
+        Args:
+            room: The room to restore.
+            npcs: The captured state.
+        """
+        with self.lock_for(room):
+            self._put(room, npcs)
+            self._mark(room)
+
+    def reset(self, everything: bool = False) -> None:
+        """
+        Restores rooms to the NPCs and enemy health they started with, and
+        rewinds the scheduler to its first tick.
+
+        Args:
+            everything: Restore every room instead of only the rooms marked
+                dirty, for callers that changed rooms directly.
+        """
+        if everything:
+            dirty: List[int] = list(self._pristine)
+        else:
+            dirty = list(self._dirty)
+        self._dirty.clear()
+        for key in dirty:
+            entry = self._pristine.get(key)
+            if entry is None:
+                continue
+            room, npcs = entry
+            with self.lock_for(room):
+                self._put(room, npcs)
+                for changes in self._watchers:
+                    changes[key] = room
+        self.scheduler.reset()
+
+    def lock_for(self, room: Room) -> threading.RLock:
+        """
+        Returns the lock guarding the given room.
+
+        Each room's lock is made on its first use.
+
+        Args:
+            room: The room whose lock is requested.
+
+        Returns:
+            threading.RLock: The lock of that room.
+        """
+        lock = self._locks.get(id(room))
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(id(room), threading.RLock())
+        return lock
+
+    def add_npc(self, room: Room, npc: NPC) -> None:
+        """
+        Adds an NPC to a room while holding the room's lock.
+
+        Args:
+            room: The room the NPC is added to.
+            npc: The NPC to add.
+        """
+        with self.lock_for(room):
+            room.add_npc(npc)
+            self._where[id(npc)] = room
+            self._mark(room)
+            self._shift(room, 0, self._component(room, npc))
+
+    def remove_npc(self, room: Room, npc: NPC) -> bool:
+        """
+        Removes an NPC from a room while holding the room's lock.
+
+        NPCs are matched by identity, so two NPCs with the same
+        description are never confused with each other.
+
+        Args:
+            room: The room the NPC is removed from.
+            npc: The NPC to remove.
+
+        Returns:
+            bool: True if the NPC was removed, False if another player
+            removed it first.
+        """
+        with self.lock_for(room):
+            if room.npcs.discard(npc) is None:
+                return False
+            self._mark(room)
+            self._shift(room, self._component(room, npc), 0)
+            return True
+
+    def strike(self, room: Room, enemy: Enemy,
+               damage: int) -> Optional[int]:
+        """
+        Deals damage to an enemy while holding its room's lock.
+
+        An enemy that moved is struck in the room it is in now.
+
+        Args:
+            room: The room the enemy was last known to be in.
+            enemy: The enemy being hit.
+            damage: The amount of health to remove.
+
+        Returns:
+            Optional[int]: The enemy's remaining health, or None if the
+            enemy had already been defeated by someone else.
+        """
+        room, lock = self._lock_where(enemy, room)
+        try:
+            if enemy._health <= 0:
+                return None
+            self._mark(room)
+            old = self._component(room, enemy)
+            enemy._health -= damage
+            self._shift(room, old, self._component(room, enemy))
+            health = enemy._health
+        finally:
+            lock.release()
+        if health > 0 and self._healing is not None:
+            self._recover(enemy, room)
+        return health
+
+    def strike_many(self, rooms: Sequence[Room], enemies: Sequence[Enemy],
+                    damages: Sequence[int]) -> List[Optional[int]]:
+        """
+        Deals damage to many enemies, as strike() would one at a time.
+
+        Each strike still holds its room's lock, but the lookups strike()
+        repeats on every call are done once for the whole batch. Enemies
+        that moved are struck in the rooms they are in now.
+
+        Args:
+            rooms: The room each enemy was last known to be in.
+            enemies: The enemies being hit.
+            damages: The damage dealt to each enemy.
+
+        Returns:
+            List[Optional[int]]: Each enemy's remaining health, or None
+            where the enemy had already been defeated.
+        """
+        locks = self._locks
+        dirty = self._dirty
+        watchers = self._watchers
+        results: List[Optional[int]] = []
+        append = results.append
+        struck: List[Room] = []
+        for room, enemy, damage in zip(rooms, enemies, damages):
+            lock = locks.get(id(room)) or self.lock_for(room)
+            lock.acquire()
+            if enemy not in room.npcs:
+                lock.release()
+                room, lock = self._lock_where(enemy, room)
+            key = id(room)
+            struck.append(room)
+            try:
+                private = enemy.__pydantic_private__
+                health = private["_health"]
+                if health <= 0:
+                    append(None)
+                    continue
+                dirty[key] = room
+                for changes in watchers:
+                    changes[key] = room
+                hashes = self._room_hashes
+                if hashes is not None and key in hashes:
+                    old = self._component(room, enemy)
+                    private["_health"] = health - damage
+                    self._shift(room, old, self._component(room, enemy))
+                else:
+                    private["_health"] = health - damage
+                append(health - damage)
+            finally:
+                lock.release()
+        if self._healing is not None:
+            for room, enemy, left in zip(struck, enemies, results):
+                if left is not None and left > 0:
+                    self._recover(enemy, room)
+        return results
+
+    def heal_wounded(self, amount: int, every: int,
+                     max_health: int = 100) -> None:
+        """
+        Lets every enemy wounded now or struck later recover until it is
+        healthy.
+
+        Each wounded enemy gets a HealUp woken on the scheduler, which
+        stops once the enemy is back to full health, defeated or gone.
+        The healing of enemies already wounded is scheduled, so reset()
+        starts it again.
+
+        Args:
+            amount: Health restored per run.
+            every: Ticks between two runs.
+            max_health: Health enemies never heal beyond.
+        """
+        self._healing = (amount, every, max_health)
+        for room in self.rooms.values():
+            for enemy in room.npcs.of_type(Enemy):
+                if 0 < enemy._health < max_health:
+                    self.scheduler.schedule(self._healer(enemy, room))
+
+    def _healer(self, enemy: Enemy, room: Room) -> HealUp:
+        """
+        Returns the healing of an enemy, made on first use.
+
+        Args:
+            enemy: The enemy.
+            room: The room the enemy is in.
+
+        Returns:
+            HealUp: The enemy's healing.
+        """
+        healer = self._healers.get(id(enemy))
+        if healer is None:
+            amount, every, max_health = self._healing
+            healer = self._healers.setdefault(
+                id(enemy), HealUp(enemy, room, amount, every, max_health)
+            )
+        return healer
+
+    def _recover(self, enemy: Enemy, room: Room) -> None:
+        """
+        Wakes the healing of a wounded enemy, unless it is under way.
+
+        Called without any room lock held, since the scheduler's lock is
+        taken while actions run under room locks.
+
+        Args:
+            enemy: The wounded enemy.
+            room: The room the enemy was struck in.
+        """
+        self.scheduler.wake(self._healer(enemy, room))
+
+    def heal(self, room: Room, enemy: Enemy, amount: int,
+             max_health: int) -> bool:
+        """
+        Restores health to a wounded enemy while holding its room's lock.
+
+        Defeated enemies stay defeated, and no enemy heals past the cap.
+        An enemy that moved is healed in the room it is in now.
+
+        Args:
+            room: The room the enemy was last known to be in.
+            enemy: The enemy to heal.
+            amount: The amount of health to restore.
+            max_health: The health the enemy never heals beyond.
+
+        Returns:
+            bool: True if the enemy gained health.
+        """
+        room, lock = self._lock_where(enemy, room)
+        try:
+            if not 0 < enemy._health < max_health:
+                return False
+            self._mark(room)
+            old = self._component(room, enemy)
+            enemy._health = min(max_health, enemy._health + amount)
+            self._shift(room, old, self._component(room, enemy))
+            return True
+        finally:
+            lock.release()
+
+    def move_npc(self, npc: NPC, source: Room, target: Room) -> bool:
+        """
+        Moves an NPC from one room to another.
+
+        Both rooms are locked, always in the same order so two NPCs moving
+        in opposite directions cannot deadlock.
+
+        Args:
+            npc: The NPC to move.
+            source: The room the NPC is expected in.
+            target: The room the NPC moves to.
+
+        Returns:
+            bool: True if the NPC moved, False if it was not in the source
+            room, for example because a player defeated it.
+        """
+        first, second = sorted((source, target), key=id)
+        with self.lock_for(first), self.lock_for(second):
+            if source.npcs.discard(npc) is None:
+                return False
+            target.npcs.add(npc)
+            self._where[id(npc)] = target
+            self._mark(source)
+            self._mark(target)
+            self._shift(source, self._component(source, npc), 0)
+            self._shift(target, 0, self._component(target, npc))
+            return True
+
+
+def schedule_default_routines(world: World) -> None:
+    """
+    Gives the NPCs of the default world their routines.
+
+    RM walks between the studio and the jazz room, Momo roams the
+    building, and enemies slowly recover from their wounds. NPCs missing
+    from the world, as in older saves, are skipped.
+
+    Args:
+        world: A world laid out like the default world.
+    """
+    def find(room_name: str, description: str) -> Optional[NPC]:
+        room = world.rooms.get(room_name)
+        if room is None:
+            return None
+        for npc in room.npcs:
+            if npc.description == description:
+                return npc
+        return None
+
+    rm = find("Room 5", "RM")
+    if rm is not None and "Room 4" in world.rooms:
+        world.scheduler.schedule(
+            Patrol(rm, [world.rooms["Room 5"], world.rooms["Room 4"]],
+                   every=5)
+        )
+    momo = find("Room 6", "Momo")
+    if momo is not None:
+        world.scheduler.schedule(
+            Roam(momo, world.rooms["Room 6"], every=8, seed=6)
+        )
+    world.heal_wounded(amount=5, every=3)
+
+
+def build_default_world() -> World:
+    """
+    Builds the six BTS rooms, their doors and NPCs.
+
+    Jimin, who waits in the last room, learns the player's habits with
+    the adaptive move set.
+
+    Returns:
+        World: A fresh copy of the default world.
+    """
+    rooms: Dict[str, Room] = {}
+    start_room: Room = Room(
+        description="Practice room of boy group BTS. "
+                    "The room is fully empty, "
+                    "but you see a lot of mirrors."
+    )
+
+    rooms["Start Room"] = start_room
+    room_2: Room = Room(
+        description="Jungkook's vocal room. You see "
+                    "several musical instruments, "
+                    "a microphone, a camera, and a music sheet."
+    )
+    rooms["Room 2"] = room_2
+
+    room_3: Room = Room(
+        description="Jin's videogame room. The room is "
+                    "a complete mess, with "
+                    "clothes, food, and videogame cases "
+                    "spread everywhere."
+    )
+    rooms["Room 3"] = room_3
+
+    room_4: Room = Room(description="Taehyung's jazz room.")
+    rooms["Room 4"] = room_4
+
+    room_5: Room = Room(
+        description="Recording studio. This is where "
+                    "all the art is produced. "
+                    "You see all sorts of music equipment."
+    )
+    rooms["Room 5"] = room_5
+
+    room_6: Room = Room(
+        description="Jimin's dance studio. All his "
+                    "trophies and gold medals "
+                    "are on display."
+    )
+    rooms["Room 6"] = room_6
+
+    start_room.add_door(
+        Door(description="A black soundproof iron door",
+             leads_to=room_2)
+    )
+    start_room.add_door(
+        Door(description="A door with childish paintings, with a small "
+                         "see-through gap. Has a 'DO NOT ENTER' sign",
+             leads_to=room_3)
+    )
+    start_room.add_npc(
+        NPC(description="Bang PD",
+            interact_message="Hello there! You must "
+                             "be here for the auditions. "
+                             "All I can say is, good luck. "
+                             "Feel free to explore the building.")
+    )
+
+    room_2.add_door(
+        Door(description="A black soundproof iron door",
+             leads_to=start_room)
+    )
+    room_2.add_npc(
+        NPC(description="Jungkook",
+            interact_message="Hi! My name is Jungkook. "
+                             "This is my personal practice "
+                             "studio, but I'm letting the "
+                             "contestants in to get some rest.")
+    )
+    room_2.add_npc(
+        Enemy(description="Vlad",
+              interact_message="I will obliterate you!")
+    )
+
+    room_3.add_door(
+        Door(description="A door with childish paintings, with a small "
+                         "see-through gap. Has a 'DO NOT ENTER' sign",
+             leads_to=start_room)
+    )
+    room_3.add_door(
+        Door(description="A beautiful velvet colored door",
+             leads_to=room_4)
+    )
+    room_3.add_npc(
+        NPC(description="Jin",
+            interact_message="Oh, another one? Ugh. I guess "
+                             "no one takes the 'DO NOT ENTER' "
+                             "sign seriously. I'm busy with "
+                             "Mario Kart, and I'm tired of "
+                             "being interrupted.")
+    )
+
+    room_5.add_door(
+        Door(description="A purple door with handwritten signatures",
+             leads_to=room_4)
+    )
+    room_5.add_door(
+        Door(description="A fully mirrored door", leads_to=room_6)
+    )
+    room_5.add_npc(
+        Healer(description="J-Hope",
+               interact_message="I'm your hope, you're my hope, "
+                                "I'm J-Hope! Let me help you "
+                                "with your next dance battle.")
+    )
+    room_5.add_npc(
+        NPC(description="RM",
+            interact_message="Glad to have you here! I'm RM. "
+                             "Wishing you good luck with the audition.")
+    )
+    room_5.add_npc(
+        NPC(description="SUGA",
+            interact_message="I'm working on this new song, "
+                             "but I can't seem to get it right.")
+    )
+
+    room_4.add_door(
+        Door(description="A beautiful velvet colored door",
+             leads_to=room_3)
+    )
+    room_4.add_door(
+        Door(description="A purple door with handwritten signatures",
+             leads_to=room_5)
+    )
+    room_4.add_npc(
+        Healer(description="Taehyung",
+               interact_message="I see Jin bullied another "
+                                "kid in here. You look tired... "
+                                "I can help with that!")
+    )
+    room_4.add_npc(
+        Enemy(description="Lisa", interact_message="Bring it on!")
+    )
+
+    room_6.add_door(
+        Door(description="A fully mirrored door", leads_to=room_5)
+    )
+    room_6.add_npc(
+        Enemy(description="Jimin",
+              interact_message="Hi! My name is Jimin. Congrats on making "
+              "it into the final stage! Wishing you good luck.",
+              moveset="adaptive")
+    )
+    room_6.add_npc(
+        Enemy(description="Momo", interact_message="You're cooked!")
+    )
+
+    world = World(rooms, start_room)
+    schedule_default_routines(world)
+    return world
@@ -0,0 +1,230 @@
+import random
+import unittest
+from typing import Dict, List
+from rpg.battles import BattleEngine, PartyBattle
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.moves import CATALOG, MoveCatalog
+from rpg.player import Player
+from rpg.room.room import Room
+from rpg.statehash import recompute_world_hash
+from rpg.world import World
+
+
+class TestBattleEngine(unittest.TestCase):
+    """
+    Unit tests for resolving many battles in one step.
+    """
+
+    def setUp(self) -> None:
+        """Set up a world of three rooms with one enemy each."""
+        self.rooms: Dict[str, Room] = {
+            f"Room {i}": Room(description=f"Room {i}") for i in range(3)
+        }
+        self.enemies: List[Enemy] = []
+        for index, room in enumerate(self.rooms.values()):
+            enemy = Enemy(description=f"Rival {index}",
+                          interact_message="Hi")
+            room.add_npc(enemy)
+            self.enemies.append(enemy)
+        self.world = World(self.rooms, self.rooms["Room 0"])
+        self.engine = BattleEngine(self.world, random.Random(5))
+
+    def player(self, room: str, health: int = 100) -> Player:
+        """Create a player standing in a room."""
+        player = Player(name=room)
+        player.enter_room(self.rooms[room])
+        player._health = health
+        return player
+
+    def test_battles_run_to_the_end(self) -> None:
+        """Test that every battle ends and leaves consistent healths."""
+        players = [self.player(name) for name in self.rooms]
+        handles = [self.engine.start(player, enemy)
+                   for player, enemy in zip(players, self.enemies)]
+        outcomes = {}
+        self.world.state_hash
+        while len(self.engine):
+            for handle in handles:
+                if handle not in outcomes:
+                    self.engine.choose(handle, 2)
+            outcomes.update(self.engine.step())
+
+        self.assertEqual(sorted(outcomes), handles)
+        for handle, player, enemy in zip(handles, players, self.enemies):
+            if outcomes[handle] == "won":
+                self.assertLessEqual(enemy._health, 0)
+                self.assertGreater(player._health, 0)
+            else:
+                self.assertEqual(outcomes[handle], "lost")
+                self.assertLessEqual(player._health, 0)
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+
+    def test_waiting_battles_and_taken_enemies(self) -> None:
+        """Test that only chosen moves run and shared enemies fall once."""
+        self.enemies[0]._health = 1
+        first = self.engine.start(self.player("Room 0"), self.enemies[0])
+        second = self.engine.start(self.player("Room 0"), self.enemies[0])
+        idle = self.engine.start(self.player("Room 1"), self.enemies[1])
+        self.engine.choose(first, 0)
+        self.engine.choose(second, 1)
+
+        self.assertEqual(self.engine.step(),
+                         [(first, "won"), (second, "taken")])
+        self.assertEqual(len(self.engine), 1)
+        self.assertEqual(self.enemies[1]._health, 100)
+        self.assertEqual(self.engine.step(), [])
+        self.assertIn("Room 0", [room.description
+                                 for room in self.world._dirty.values()])
+        # The slots of finished battles are reused.
+        self.assertIn(self.engine.start(self.player("Room 2"),
+                                        self.enemies[2]), (first, second))
+        self.assertNotIn(idle, (first, second))
+
+    def test_player_can_lose(self) -> None:
+        """Test a player with almost no health."""
+        player = self.player("Room 1", health=1)
+        handle = self.engine.start(player, self.enemies[1])
+        self.engine.choose(handle, 0)
+        self.assertEqual(self.engine.step(), [(handle, "lost")])
+        self.assertLessEqual(player._health, 0)
+
+    def test_bad_choices(self) -> None:
+        """Test that moves for unknown battles or moves are refused."""
+        handle = self.engine.start(self.player("Room 2"), self.enemies[2])
+        with self.assertRaises(ValueError):
+            self.engine.choose(handle, 3)
+        with self.assertRaises(ValueError):
+            self.engine.choose(handle + 1, 0)
+
+    def test_strike_many_matches_strike(self) -> None:
+        """Test batched strikes against one strike at a time."""
+        rooms = list(self.rooms.values())
+        self.enemies[2]._health = 0
+        self.world.state_hash
+        self.assertEqual(
+            self.world.strike_many(rooms, self.enemies, [10, 20, 30]),
+            [90, 80, None]
+        )
+        self.assertEqual(self.world.strike(rooms[0], self.enemies[0], 5),
+                         85)
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+
+    def test_enemy_that_moved_mid_battle(self) -> None:
+        """Test that an enemy is struck in the room it moved to."""
+        rooms = list(self.rooms.values())
+        enemy = self.enemies[0]
+        handle = self.engine.start(self.player("Room 0"), enemy)
+        self.world.state_hash
+        changes = self.world.watch()
+        self.world.move_npc(enemy, rooms[0], rooms[1])
+        changes.clear()
+
+        self.engine.choose(handle, 2)
+        self.engine.step()
+        self.assertLess(enemy._health, 100)
+        self.assertEqual(list(changes), [id(rooms[1])])
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+
+        self.world.move_npc(enemy, rooms[1], rooms[2])
+        self.assertEqual(self.world.strike(rooms[0], enemy, 5),
+                         enemy._health)
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+
+
+class TestPartyBattle(unittest.TestCase):
+    """
+    Unit tests for battles between a party and a crew.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Add move sets with status effects to the catalog."""
+        catalog = MoveCatalog.fromJSON({
+            "hypnotist": [{"name": "Stare", "damage": [1, 1],
+                           "effect": "dizzy", "turns": 2}],
+            "showoff": [{"name": "Pose", "damage": [10, 10],
+                         "effect": "hyped"}],
+        })
+        for name in ("hypnotist", "showoff"):
+            CATALOG.add(catalog.get(name))
+
+    def arena(self, players: int, enemies: int,
+              moveset: str = "default") -> PartyBattle:
+        """Build a battle in a room holding the crew."""
+        self.room = Room(description="Hall")
+        self.world = World({"Hall": self.room}, self.room)
+        self.party = []
+        for index in range(players):
+            player = Player(name=f"Player {index}")
+            player.enter_room(self.room)
+            self.party.append(player)
+        self.crew = [Enemy(description=f"Rival {index}",
+                           interact_message="Hi", moveset=moveset)
+                     for index in range(enemies)]
+        for enemy in self.crew:
+            self.world.add_npc(self.room, enemy)
+        self.world.state_hash
+        return PartyBattle(self.world, self.party, self.crew,
+                           rng=random.Random(3))
+
+    def test_fight_to_the_end(self) -> None:
+        """Test that a big battle ends with one side defeated."""
+        battle = self.arena(50, 50)
+        outcome = battle.fight()
+
+        side = self.party if outcome == "lost" else self.crew
+        self.assertTrue(all(member._health <= 0 for member in side))
+        self.assertEqual(battle.health,
+                         [player._health for player in self.party]
+                         + [enemy._health for enemy in self.crew])
+        self.assertEqual(battle.round(), outcome)
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+
+    def test_chosen_targets(self) -> None:
+        """Test that players hit the enemy they chose."""
+        battle = self.arena(3, 3)
+        for player in range(3):
+            battle.choose(player, 2, target=1)
+        battle.round()
+
+        self.assertLess(self.crew[1]._health, 100 - 3 * 14)
+        self.assertEqual([self.crew[0]._health, self.crew[2]._health],
+                         [100, 100])
+
+    def test_dizzy_players_skip_turns(self) -> None:
+        """Test that a dizzy player stops dancing."""
+        battle = self.arena(1, 1, "hypnotist")
+        battle.round()
+        after_first = self.crew[0]._health
+        for _ in range(3):
+            battle.round()
+
+        self.assertLess(after_first, 100)
+        self.assertEqual(self.crew[0]._health, after_first)
+        self.assertEqual(self.party[0]._health, 96)
+
+    def test_hyped_enemies_double_damage(self) -> None:
+        """Test that a hyped enemy deals double damage."""
+        battle = self.arena(1, 1, "showoff")
+        self.crew[0]._health = battle.health[1] = 1000
+        for _ in range(3):
+            battle.round()
+        self.assertEqual(self.party[0]._health, 100 - 10 - 20 - 20)
+
+    def test_bad_battles(self) -> None:
+        """Test that empty sides and unknown choices are refused."""
+        battle = self.arena(1, 1)
+        with self.assertRaises(ValueError):
+            PartyBattle(self.world, [], self.crew)
+        for arguments in ((1, 0), (0, 3), (0, 0, 1)):
+            with self.assertRaises(ValueError):
+                battle.choose(*arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from rpg.npcs.enemy import Enemy
+from rpg.world import World
 from itertools import cycle
 
 
@@ -22,6 +23,7 @@ class TestEnemy(unittest.TestCase):
         self.player._health = 100
         self.scanner = MagicMock()
         self.game = MagicMock()
+        self.game.world = World({}, None)
 
     @patch("builtins.print")
     def test_inspect_method(self, mock_print: unittest.mock.Mock) -> None:
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from itertools import cycle
+from unittest.mock import MagicMock, patch
+from rpg import events
+from rpg.events import EventLog, read_events, segments
+from rpg.npcs.enemy import Enemy
+from rpg.world import World
+
+
+class TestEventLog(unittest.TestCase):
+    """
+    Unit tests for the rotating, compressed JSON Lines event log.
+    """
+
+    def setUp(self) -> None:
+        """Set up an empty log directory."""
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = self.temp.name
+
+    def tearDown(self) -> None:
+        """Remove the log directory."""
+        self.temp.cleanup()
+
+    def test_events_round_trip(self) -> None:
+        """Test that events come back in order with their fields."""
+        with EventLog(self.directory, batch=3) as log:
+            for turn in range(10):
+                log.emit("move", turn=turn, move="Spin")
+
+        read = list(read_events(self.directory))
+        self.assertEqual([event["turn"] for event in read], list(range(10)))
+        self.assertEqual(read[0]["event"], "move")
+        self.assertIn("time", read[0])
+
+    def test_events_wait_in_the_buffer(self) -> None:
+        """Test that nothing is written until a batch is full."""
+        log = EventLog(self.directory, batch=100)
+        log.emit("move", turn=1)
+        self.assertEqual(os.path.getsize(log.path), 0)
+        log.close()
+        self.assertGreater(os.path.getsize(log.path), 0)
+
+    def test_rotation_and_compression(self) -> None:
+        """Test that full segments are closed and gzipped."""
+        with EventLog(self.directory, max_bytes=2000, batch=10) as log:
+            for turn in range(500):
+                log.emit("move", turn=turn)
+
+        paths = segments(self.directory)
+        self.assertGreater(len(paths), 3)
+        self.assertTrue(all(path.endswith(".gz") for path in paths[:-1]))
+        self.assertTrue(paths[-1].endswith(".jsonl"))
+        self.assertEqual(
+            [event["turn"] for event in read_events(self.directory)],
+            list(range(500))
+        )
+
+    def test_reopening_continues_numbering(self) -> None:
+        """Test that a new log never overwrites old segments."""
+        with EventLog(self.directory) as log:
+            log.emit("first")
+        with EventLog(self.directory) as log:
+            log.emit("second")
+
+        self.assertEqual(len(segments(self.directory)), 2)
+        self.assertEqual(
+            [event["event"] for event in read_events(self.directory)],
+            ["first", "second"]
+        )
+
+    def test_filter_by_kind(self) -> None:
+        """Test that the reader can keep only some event types."""
+        with EventLog(self.directory) as log:
+            log.emit("battle_start", battle=1)
+            log.emit("move", battle=1)
+            log.emit("battle_end", battle=1)
+
+        kinds = [event["event"] for event in
+                 read_events(self.directory, kinds=["battle_end"])]
+        self.assertEqual(kinds, ["battle_end"])
+
+
+class TestBattleEvents(unittest.TestCase):
+    """
+    Tests that battles write their events to the battle log.
+    """
+
+    @patch("builtins.print")
+    def test_battle_is_logged(self, mock_print) -> None:
+        """Test the start, moves and outcome of a won battle."""
+        enemy = Enemy(description="Lisa", interact_message="Go")
+        player = MagicMock()
+        player._health = 100
+        scanner = MagicMock()
+        scanner.read_int.side_effect = cycle([0])
+        game = MagicMock()
+        game.world = World({}, None)
+
+        with tempfile.TemporaryDirectory() as directory:
+            events.start_battle_log(directory)
+            try:
+                with patch("random.randint", side_effect=cycle([60, 5])):
+                    enemy.interact(player, scanner, game)
+            finally:
+                events.stop_battle_log()
+            logged = list(read_events(directory))
+
+        self.assertEqual(
+            [(event["event"], event.get("actor")) for event in logged],
+            [("battle_start", None), ("move", "player"), ("move", "enemy"),
+             ("move", "player"), ("battle_end", None)]
+        )
+        self.assertEqual(logged[-1]["outcome"], "won")
+        self.assertEqual(logged[2]["player_health"], 95)
+        self.assertEqual(len({event["battle"] for event in logged}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
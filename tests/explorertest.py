@@ -0,0 +1,177 @@
+import functools
+import unittest
+from typing import Dict, Optional
+from rpg.explorer import BattleOdds, components, explore
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.world import World, build_default_world
+
+
+def line_of_rooms(count: int, two_way: bool = True) -> Dict[str, Room]:
+    """Build rooms in a row, each with a door to the next."""
+    rooms = {f"Room {index}": Room(description=f"Room {index}")
+             for index in range(count)}
+    ordered = list(rooms.values())
+    for here, there in zip(ordered, ordered[1:]):
+        here.add_door(Door(description="Onwards", leads_to=there))
+        if two_way:
+            there.add_door(Door(description="Back", leads_to=here))
+    return rooms
+
+
+def enemy(health: int, name: str = "Rival") -> Enemy:
+    """Build an enemy with the given health."""
+    rival = Enemy(description=name, interact_message="Hi")
+    rival._health = health
+    return rival
+
+
+class TestBattleOdds(unittest.TestCase):
+    """
+    Unit tests for the exact battle odds.
+    """
+
+    def test_matches_plain_recursion(self) -> None:
+        """Test the prefix-sum tables against a direct recursion."""
+        player = {"Jab": (1, 3), "Kick": (2, 2)}
+        rival = {"Stomp": (1, 2), "Shove": (2, 3)}
+        odds = BattleOdds(12, 15, player, rival)
+
+        @functools.lru_cache(maxsize=None)
+        def win(health: int, enemy_health: int) -> float:
+            best = 0.0
+            for low, high in player.values():
+                chance = 0.0
+                for damage in range(low, high + 1):
+                    left = enemy_health - damage
+                    if left <= 0:
+                        chance += 1
+                        continue
+                    for reply_low, reply_high in rival.values():
+                        for reply in range(reply_low, reply_high + 1):
+                            if health - reply > 0:
+                                chance += (win(health - reply, left)
+                                           / len(rival)
+                                           / (reply_high - reply_low + 1))
+                best = max(best, chance / (high - low + 1))
+            return best
+
+        @functools.lru_cache(maxsize=None)
+        def left(health: int, enemy_health: int) -> int:
+            best = 0
+            for low, high in player.values():
+                for damage in range(low, high + 1):
+                    if damage >= enemy_health:
+                        best = max(best, health)
+                    elif health > 1:
+                        best = max(best, left(health - 1,
+                                              enemy_health - damage))
+            return best
+
+        for health in range(1, 13):
+            for enemy_health in range(1, 16):
+                self.assertAlmostEqual(odds.chance(health, enemy_health),
+                                       win(health, enemy_health), places=12)
+                self.assertEqual(odds.best_left[health][enemy_health],
+                                 left(health, enemy_health))
+
+    def test_game_odds(self) -> None:
+        """Test a few known facts about the game's own moves."""
+        odds = BattleOdds(max_enemy=300)
+        self.assertGreater(odds.chance(100, 100), 0.9)
+        self.assertEqual(odds.best_left[100][100], 70)
+        self.assertEqual(odds.chance(100, 300), 0.0)
+        self.assertEqual(odds.chance(10, 100), 0.0)
+        with self.assertRaises(ValueError):
+            odds.chance(100, 301)
+
+
+class TestExplorer(unittest.TestCase):
+    """
+    Unit tests for the world explorer.
+    """
+
+    def explore(self, rooms: Dict[str, Room], to_win: int,
+                start: Optional[Room] = None):
+        world = World(rooms, start or next(iter(rooms.values())))
+        return explore(world, to_win)
+
+    def test_default_world_is_winnable(self) -> None:
+        """Test the shipped world."""
+        report = explore(build_default_world())
+
+        self.assertTrue(report.winnable)
+        self.assertEqual(report.unreachable_rooms, [])
+        self.assertEqual(report.unbeatable, [])
+        self.assertEqual(len(report.enemies), 4)
+        self.assertEqual(len(report.winning_line), 3)
+
+    def test_unreachable_rooms_and_enemies(self) -> None:
+        """Test that one-way doors leave rooms behind the start unseen."""
+        rooms = line_of_rooms(4, two_way=False)
+        rooms["Room 0"].add_npc(enemy(100, "Left behind"))
+        report = self.explore(rooms, 1, start=rooms["Room 2"])
+
+        self.assertEqual(report.unreachable_rooms, ["Room 0", "Room 1"])
+        self.assertEqual([rival.description for rival in report.unbeatable],
+                         ["Left behind"])
+        self.assertFalse(report.winnable)
+
+    def test_unbeatable_enemy(self) -> None:
+        """Test that an enemy with too much health is reported."""
+        rooms = line_of_rooms(2)
+        rooms["Room 1"].add_npc(enemy(300, "Giant"))
+        rooms["Room 1"].add_npc(enemy(100, "Rival"))
+        report = self.explore(rooms, 1)
+
+        self.assertTrue(report.winnable)
+        self.assertEqual([rival.description for rival in report.unbeatable],
+                         ["Giant"])
+        self.assertFalse(self.explore(rooms, 2).winnable)
+
+    def test_healer_placement_decides(self) -> None:
+        """Test that tough enemies need a healer within reach."""
+        def world(healer_room: Optional[int], two_way: bool) -> bool:
+            rooms = line_of_rooms(4, two_way)
+            rooms["Room 2"].add_npc(enemy(150, "First"))
+            rooms["Room 3"].add_npc(enemy(150, "Second"))
+            if healer_room is not None:
+                rooms[f"Room {healer_room}"].add_npc(
+                    Healer(description="Medic", interact_message="Hi")
+                )
+            return self.explore(rooms, 2).winnable
+
+        self.assertFalse(world(None, True))
+        self.assertTrue(world(1, True))
+        self.assertTrue(world(3, False))
+        self.assertFalse(world(1, False))
+
+    def test_components_order(self) -> None:
+        """Test that doors never lead to a part with a higher number."""
+        rooms = line_of_rooms(5, two_way=False)
+        rooms["Room 3"].add_door(Door(description="Loop",
+                                      leads_to=rooms["Room 1"]))
+        graph = World(rooms, rooms["Room 0"]).graph
+        part, parts = components(graph, 0)
+
+        self.assertEqual(parts, 3)
+        self.assertEqual(part[1], part[2])
+        self.assertEqual(part[2], part[3])
+        for source, target in zip(graph.sources, graph.targets):
+            self.assertLessEqual(part[target], part[source])
+
+    def test_thousands_of_rooms(self) -> None:
+        """Test that a generated world is explored quickly."""
+        from rpg.generator import generate_world
+
+        report = explore(generate_world(3000, seed=2), enemies_to_win=20)
+
+        self.assertTrue(report.winnable)
+        self.assertTrue(report.complete)
+        self.assertLess(report.seconds, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from rpg.game import Game
+from rpg.generator import generate_rooms, generate_world
+from rpg.navigation import UNREACHABLE
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+
+
+class TestWorldGenerator(unittest.TestCase):
+    """
+    Unit tests for the procedural world generator.
+    """
+
+    def test_same_seed_same_world(self) -> None:
+        """Test that a seed always produces the same rooms and NPCs."""
+        first = generate_world(200, seed=7)
+        second = generate_world(200, seed=7)
+        other = generate_world(200, seed=8)
+
+        def layout(world):
+            return [
+                (name, [door.leads_to.description for door in room.doors],
+                 [npc.description for npc in room.npcs])
+                for name, room in world.rooms.items()
+            ]
+
+        self.assertEqual(layout(first), layout(second))
+        self.assertNotEqual(layout(first), layout(other))
+
+    def test_batches_do_not_change_the_world(self) -> None:
+        """Test that building rooms in batches gives the same rooms."""
+        def layout(rooms):
+            return [
+                (name, [door.description for door in room.doors],
+                 [npc.description for npc in room.npcs])
+                for name, room in rooms
+            ]
+
+        whole = layout(list(generate_rooms(300, seed=4, batch=300)))
+        for batch in (7, 1):
+            rooms = list(generate_rooms(300, seed=4, batch=batch))
+            self.assertEqual(layout(rooms), whole)
+
+    def test_world_is_connected(self) -> None:
+        """Test that every room can be reached from the start room."""
+        world = generate_world(500, seed=3)
+        graph = world.graph
+        start = graph.room_id(world.start_room)
+
+        for goal in range(len(graph.rooms)):
+            self.assertNotEqual(graph.distance(start, goal), UNREACHABLE)
+
+    def test_doors_come_in_pairs(self) -> None:
+        """Test that each door has a matching door leading back."""
+        world = generate_world(300, seed=1, shortcuts=0.5)
+        for room in world.rooms.values():
+            for door in room.doors:
+                self.assertTrue(any(
+                    back.leads_to is room for back in door.leads_to.doors
+                ))
+
+    def test_population_mix(self) -> None:
+        """Test that generated rooms hold enemies, healers and others."""
+        world = generate_world(1000, npcs_per_room=2.0)
+        npcs = [npc for room in world.rooms.values() for npc in room.npcs]
+        enemies = [npc for npc in npcs if isinstance(npc, Enemy)]
+
+        self.assertGreater(len(npcs), 1500)
+        self.assertTrue(enemies)
+        self.assertTrue(all(enemy._health == 100 for enemy in enemies))
+        adaptive = [enemy for enemy in enemies
+                    if enemy.moveset == "adaptive"]
+        self.assertTrue(0 < len(adaptive) < len(enemies))
+        self.assertTrue(any(isinstance(npc, Healer) for npc in npcs))
+
+    def test_rooms_are_streamed(self) -> None:
+        """Test that rooms arrive one at a time, named like the default."""
+        rooms = generate_rooms(10**9)
+        self.assertEqual(next(rooms)[0], "Start Room")
+        self.assertEqual(next(rooms)[0], "Room 2")
+
+    def test_generated_world_survives_a_save(self) -> None:
+        """Test that a generated world round-trips through a save."""
+        game = Game(world=generate_world(50, seed=2))
+        loaded = Game.fromJSON(game.toJSON())
+
+        self.assertEqual(len(loaded.rooms), 50)
+        room = loaded.rooms["Room 10"]
+        self.assertEqual(
+            [door.leads_to.description for door in room.doors],
+            [door.leads_to.description
+             for door in game.rooms["Room 10"].doors]
+        )
+
+    def test_empty_world_is_rejected(self) -> None:
+        """Test that a world needs at least one room."""
+        with self.assertRaises(ValueError):
+            generate_world(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
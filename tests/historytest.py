@@ -0,0 +1,164 @@
+import random
+import unittest
+from typing import List
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.history import History, PersistentVector
+from rpg.npcs.enemy import Enemy
+from rpg.replay import ReplayScanner, state_hash
+
+
+class TestPersistentVector(unittest.TestCase):
+    """
+    Unit tests for the structurally shared vector behind the history.
+    """
+
+    def test_set_leaves_old_version_alone(self) -> None:
+        """Test that set() returns a new version and keeps the old one."""
+        old = PersistentVector(list(range(1000)))
+        new = old.set(777, "changed")
+
+        self.assertEqual(old.get(777), 777)
+        self.assertEqual(new.get(777), "changed")
+        self.assertEqual([new.get(i) for i in range(1000) if i != 777],
+                         [i for i in range(1000) if i != 777])
+        with self.assertRaises(IndexError):
+            old.set(1000, None)
+
+    def test_differences_finds_changed_indexes(self) -> None:
+        """Test that only replaced items are reported."""
+        base = PersistentVector(list(range(5000)))
+        changed = base
+        for index in (0, 31, 32, 1024, 4999):
+            changed = changed.set(index, str(index))
+
+        self.assertEqual(sorted(base.differences(changed)),
+                         [0, 31, 32, 1024, 4999])
+        self.assertEqual(list(changed.differences(changed)), [])
+
+    def test_versions_share_untouched_nodes(self) -> None:
+        """Test that a change copies one path, not the whole tree."""
+        base = PersistentVector(list(range(5000)))
+        changed = base.set(10, "x")
+        shared = sum(1 for a, b in zip(base.root, changed.root) if a is b)
+        self.assertEqual(shared, len(base.root) - 1)
+
+    def test_append_grows_like_a_new_vector(self) -> None:
+        """Test that appending builds the tree a new vector would have."""
+        vector = PersistentVector()
+        versions = [vector]
+        for item in range(1100):
+            vector = vector.append(item)
+            versions.append(vector)
+
+        built = PersistentVector(list(range(1100)))
+        self.assertEqual((vector.size, vector.shift, vector.root),
+                         (built.size, built.shift, built.root))
+        self.assertEqual(len(versions[33]), 33)
+        self.assertEqual(versions[33].get(32), 32)
+        self.assertEqual(len(versions[1024]), 1024)
+        self.assertEqual(versions[1024].shift, 5)
+        self.assertIs(versions[1025].root[0], versions[1024].root)
+
+
+class TestHistory(unittest.TestCase):
+    """
+    Unit tests for rewinding a game through its history.
+    """
+
+    def setUp(self) -> None:
+        """Set up a game in the default world with a history."""
+        random.seed(3)
+        self.game = Game()
+        self.history = History(self.game)
+
+    def play(self, choice: int, *answers: int) -> None:
+        """Carry out one menu command the way the main loop does."""
+        self.game.scanner = ReplayScanner(list(answers))
+        with patch("builtins.print"):
+            self.game.dispatch(choice)
+        self.game.world.scheduler.advance()
+        self.history.record(self.game, str(choice))
+
+    def wander(self, commands: int) -> List[str]:
+        """Travel around for a while, returning the state after each."""
+        hashes = [state_hash(self.game)]
+        rng = random.Random(commands)
+        for _ in range(commands):
+            self.play(6, rng.randrange(1, 7))
+            hashes.append(state_hash(self.game))
+        return hashes
+
+    def test_goto_restores_every_state(self) -> None:
+        """Test that each recorded state can be returned to, any order."""
+        room_2 = self.game.rooms["Room 2"]
+        vlad = room_2.npcs.of_type(Enemy)[0]
+        self.game.world.strike(room_2, vlad, 40)
+        self.history.record(self.game, "strike")
+        hashes = self.wander(40)
+
+        order = list(range(len(hashes)))
+        random.Random(1).shuffle(order)
+        for position in order:
+            self.history.goto(self.game, position + 1)
+            self.assertEqual(state_hash(self.game), hashes[position])
+
+    def test_rewound_game_plays_on_the_same(self) -> None:
+        """Test that NPC routines are rewound with the rooms."""
+        hashes = self.wander(30)
+        self.history.goto(self.game, 0)
+        self.assertEqual(self.wander(30), hashes)
+
+    def test_undo_and_redo(self) -> None:
+        """Test going back and forth, and recording after going back."""
+        hashes = self.wander(5)
+
+        self.assertEqual(self.history.undo(self.game, 2), 2)
+        self.assertEqual(state_hash(self.game), hashes[3])
+        self.assertEqual(self.history.redo(self.game, 9), 2)
+        self.assertEqual(state_hash(self.game), hashes[5])
+
+        self.history.undo(self.game, 3)
+        self.play(0)
+        self.assertEqual(len(self.history), 4)
+        self.assertEqual(self.history.redo(self.game), 0)
+
+    def test_capacity_drops_oldest(self) -> None:
+        """Test that the history keeps only its newest snapshots."""
+        history = History(self.game, capacity=3)
+        self.history = history
+        self.wander(5)
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.undo(self.game, 10), 2)
+
+    def test_rewind_command(self) -> None:
+        """Test rewinding from the main menu."""
+        self.game.history = self.history
+        start = state_hash(self.game)
+        inputs = ["6", "2", "6", "3", "7", "2", "5"]
+        with patch("builtins.input", side_effect=inputs), \
+                patch("builtins.print"):
+            with self.assertRaises(SystemExit):
+                self.game.play()
+
+        self.assertEqual(self.history.labels,
+                         ["start", "travel", "travel"])
+        self.assertEqual(self.history.position, 0)
+        self.assertEqual(state_hash(self.game), start)
+
+    def test_quickload_starts_over(self) -> None:
+        """Test that a history follows the world of a loaded game."""
+        self.game.history = self.history
+        loaded = Game()
+        with patch.object(self.game.saver, "quick_load",
+                          return_value=loaded), patch("builtins.print"):
+            self.game.dispatch(4)
+        self.history.record(self.game, "quick_load")
+
+        self.assertIs(self.history.world, loaded.world)
+        self.assertEqual(self.history.labels, ["start"])
+
+
+if __name__ == "__main__":
+    unittest.main()
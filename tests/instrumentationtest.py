@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.instrumentation import Histogram, Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests for the per-command latency instrumentation.
+    """
+
+    def setUp(self) -> None:
+        """Set up fresh instrumentation and a game."""
+        self.instruments = Instrumentation()
+        self.game = Game()
+        self.original_dispatch = Game.__dict__["dispatch"]
+
+    def tearDown(self) -> None:
+        """Make sure no test leaves the methods patched."""
+        self.instruments.disable()
+
+    def play(self, inputs) -> None:
+        """Plays the game with the given typed inputs, then quits."""
+        with patch("builtins.input", side_effect=inputs + ["5"]), \
+                patch("builtins.print"):
+            try:
+                self.game.play()
+            except SystemExit:
+                pass
+
+    def test_disabled_leaves_methods_untouched(self) -> None:
+        """Test that nothing is wrapped until enable() is called."""
+        self.play(["0"])
+        self.assertIs(Game.__dict__["dispatch"], self.original_dispatch)
+        self.assertEqual(self.instruments.histograms, {})
+
+    def test_commands_are_counted(self) -> None:
+        """Test that every menu choice lands in its own histogram."""
+        self.instruments.enable()
+        self.play(["0", "0", "1", "0", "42"])
+        self.instruments.disable()
+
+        counts = {name: hist.count
+                  for name, hist in self.instruments.histograms.items()}
+        self.assertEqual(counts["command.look_around"], 2)
+        self.assertEqual(counts["command.way_out"], 1)
+        self.assertEqual(counts["command.invalid"], 1)
+        self.assertEqual(counts["command.quit"], 1)
+        self.assertIs(Game.__dict__["dispatch"], self.original_dispatch)
+
+    def test_input_wait_is_excluded(self) -> None:
+        """Test that time spent typing does not count as latency."""
+        def slow_input(prompt: str = "") -> str:
+            time.sleep(0.05)
+            return "0"
+
+        self.instruments.enable()
+        with patch("builtins.input", side_effect=slow_input), \
+                patch("builtins.print"):
+            self.game.dispatch(1)
+        self.instruments.disable()
+
+        self.assertLess(
+            self.instruments.histograms["command.way_out"].largest, 0.04
+        )
+
+    def test_report_file_with_profile(self) -> None:
+        """Test that the capture mode writes latencies and a profile."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.txt")
+            self.instruments.enable(path, profile=True, memory=True)
+            self.play(["0"])
+            self.instruments.disable()
+
+            with open(path) as file:
+                report = file.read()
+        self.assertIn("command.look_around", report)
+        self.assertIn("Profile (cumulative time)", report)
+        self.assertIn("Largest allocation sites", report)
+
+
+class TestHistogram(unittest.TestCase):
+    """
+    Unit tests for the power-of-two latency histogram.
+    """
+
+    def test_percentiles(self) -> None:
+        """Test that percentiles fall in the right bucket."""
+        hist = Histogram()
+        for _ in range(99):
+            hist.add(0.000010)
+        hist.add(0.5)
+
+        self.assertEqual(hist.count, 100)
+        self.assertLessEqual(hist.percentile(0.5), 0.000016)
+        self.assertEqual(hist.percentile(1.0), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
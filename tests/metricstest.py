@@ -0,0 +1,131 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.io_utils import Saver
+from rpg.metrics import (
+    ACTIVE_SESSIONS, COMMANDS, SAVE_BYTES, SAVES, MetricsRegistry
+)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """
+    Unit tests for the metrics registry and its Prometheus exposition.
+    """
+
+    def setUp(self) -> None:
+        """Set up a registry with one metric of each kind."""
+        self.registry = MetricsRegistry()
+        self.battles = self.registry.counter("battles_total", "Battles.")
+        self.sessions = self.registry.gauge("sessions", "Sessions.")
+        self.commands = self.registry.counter(
+            "commands_total", "Commands.", ("command",)
+        )
+        self.sizes = self.registry.summary("save_bytes", "Save sizes.")
+
+    def test_counts_from_many_threads(self) -> None:
+        """Test that increments from concurrent threads are never lost."""
+        def work() -> None:
+            for _ in range(10000):
+                self.battles.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.battles.value, 80000)
+
+    def test_exposition_format(self) -> None:
+        """Test the text format of every kind of metric."""
+        self.battles.inc()
+        self.sessions.inc(2)
+        self.sessions.dec()
+        self.commands.labels("travel").inc(3)
+        self.commands.labels('say "hi"').inc()
+        self.sizes.observe(100)
+        self.sizes.observe(50)
+
+        text = self.registry.exposition()
+
+        self.assertIn("# TYPE battles_total counter\nbattles_total 1\n",
+                      text)
+        self.assertIn("# HELP sessions Sessions.\n", text)
+        self.assertIn("sessions 1\n", text)
+        self.assertIn('commands_total{command="travel"} 3\n', text)
+        self.assertIn('commands_total{command="say \\"hi\\""} 1\n', text)
+        self.assertIn("# TYPE save_bytes summary\n", text)
+        self.assertIn("save_bytes_count 2\nsave_bytes_sum 150\n", text)
+
+    def test_same_name_returns_same_metric(self) -> None:
+        """Test that registering a name twice shares the metric."""
+        self.assertIs(self.registry.counter("battles_total", "x"),
+                      self.battles)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("battles_total", "x")
+
+    def test_wrong_number_of_labels(self) -> None:
+        """Test that label values must match the label names."""
+        with self.assertRaises(ValueError):
+            self.commands.labels("a", "b")
+
+    def test_dump_and_serve(self) -> None:
+        """Test the file dump and the HTTP endpoint."""
+        self.battles.inc(5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rpg.prom")
+            self.registry.dump(path)
+            with open(path) as file:
+                self.assertIn("battles_total 5\n", file.read())
+            self.assertEqual(os.listdir(directory), ["rpg.prom"])
+
+        server = self.registry.serve(port=0)
+        try:
+            port = server.server_address[1]
+            url = f"http://127.0.0.1:{port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn("battles_total 5\n", body)
+        self.assertTrue(content_type.startswith("text/plain"))
+
+
+class TestGameMetrics(unittest.TestCase):
+    """
+    Tests that the game feeds the process-wide metrics.
+    """
+
+    @patch("builtins.print")
+    def test_session_updates_metrics(self, mock_print) -> None:
+        """Test that commands, sessions and saves are counted."""
+        with tempfile.TemporaryDirectory() as directory:
+            game = Game()
+            game.saver = Saver(directory)
+            looks = COMMANDS.labels("look_around").value
+            saves = SAVES.labels("ok").value
+            saved_bytes = SAVE_BYTES._sum.value
+            sessions = ACTIVE_SESSIONS.value
+
+            with patch("builtins.input", side_effect=["0", "3", "5"]):
+                with self.assertRaises(SystemExit):
+                    game.play()
+
+            self.assertEqual(COMMANDS.labels("look_around").value,
+                             looks + 1)
+            self.assertEqual(SAVES.labels("ok").value, saves + 1)
+            self.assertEqual(
+                SAVE_BYTES._sum.value - saved_bytes,
+                os.path.getsize(game.saver.save_file)
+            )
+            self.assertEqual(ACTIVE_SESSIONS.value, sessions)
+
+
+if __name__ == "__main__":
+    unittest.main()
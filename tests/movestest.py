@@ -0,0 +1,251 @@
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+from rpg.npcs.enemy import Enemy
+from rpg.battles import BattleEngine
+from rpg.game import Game
+from rpg.npcs.moves import (
+    CATALOG, AliasTable, Move, MoveCatalog, MoveSet, MOVE_DATA,
+    OpponentModel
+)
+from rpg.player import Player
+from rpg.room.room import Room
+from rpg.npcs.registry import dump_npc, load_npc
+from rpg.world import World
+
+
+class TestAliasTable(unittest.TestCase):
+    """
+    Unit tests for constant-time weighted picks.
+    """
+
+    def test_frequencies_follow_weights(self) -> None:
+        """Test that each index comes up as often as its weight says."""
+        weights = [1, 0, 3, 6, 10]
+        table = AliasTable(weights)
+        rng = random.Random(4)
+        counts = [0] * len(weights)
+        for _ in range(40000):
+            counts[table.sample(rng)] += 1
+
+        self.assertEqual(counts[1], 0)
+        for weight, count in zip(weights, counts):
+            self.assertAlmostEqual(count / 40000, weight / 20, delta=0.01)
+
+    def test_equal_weights_match_choice(self) -> None:
+        """Test that equal weights draw exactly like random.choice()."""
+        table = AliasTable([1] * 7)
+        rng, same = random.Random(9), random.Random(9)
+        picks = [table.sample(rng) for _ in range(200)]
+        self.assertEqual(picks, [same.choice(range(7)) for _ in range(200)])
+
+    def test_bad_weights(self) -> None:
+        """Test that unusable weights are refused."""
+        for weights in ([], [0, 0], [1, -1]):
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+
+
+class TestMoves(unittest.TestCase):
+    """
+    Unit tests for moves, move sets and the catalog.
+    """
+
+    def test_weighted_damage(self) -> None:
+        """Test damage drawn from explicit weights."""
+        move = Move("Stomp", damage_weights={"40": 1, "10": 3})
+        rng = random.Random(1)
+        rolls = [move.roll(rng) for _ in range(4000)]
+
+        self.assertFalse(move.uniform)
+        self.assertEqual((move.low, move.high), (10, 40))
+        self.assertEqual(move.distribution, ((10, 0.75), (40, 0.25)))
+        self.assertEqual(set(rolls), {10, 40})
+        self.assertAlmostEqual(rolls.count(10) / 4000, 0.75, delta=0.03)
+
+    def test_uniform_damage(self) -> None:
+        """Test that a damage range goes through random.randint()."""
+        move = Move("Spin", damage=[5, 15])
+        self.assertTrue(move.uniform)
+        self.assertAlmostEqual(sum(p for _, p in move.distribution), 1.0)
+        with patch("random.randint", return_value=7) as randint:
+            self.assertEqual(move.roll(), 7)
+        randint.assert_called_once_with(5, 15)
+        with self.assertRaises(ValueError):
+            Move("Nothing")
+        with self.assertRaises(ValueError):
+            Move("Backwards", damage=[9, 3])
+        with self.assertRaises(ValueError):
+            Move("Yawn", damage=[1, 2], effect="sleepy")
+
+    def test_catalog(self) -> None:
+        """Test the catalog built from the game's move data."""
+        self.assertEqual(len(CATALOG.player), len(MOVE_DATA["player"]))
+        self.assertEqual(CATALOG.get("default").names,
+                         ("Spin", "Flip", "Body roll"))
+        self.assertIn("default", CATALOG)
+        with self.assertRaises(KeyError):
+            CATALOG.get("missing")
+
+    def test_large_sets(self) -> None:
+        """Test picking from a set with a hundred thousand moves."""
+        rng = random.Random(0)
+        big = MoveSet("big", [Move(str(i), damage=[1, 2], weight=i % 7 + 1)
+                              for i in range(100000)])
+        picks = {big.pick(rng).name for _ in range(200)}
+        self.assertGreater(len(picks), 100)
+        self.assertTrue(picks <= set(big.names))
+
+
+class TestEnemyMoveSets(unittest.TestCase):
+    """
+    Unit tests for enemies that use a move set of their own.
+    """
+
+    def setUp(self) -> None:
+        """Add a one-move set for the enemy to use."""
+        catalog = MoveCatalog.fromJSON({
+            "crusher": [{"name": "Crush", "damage_weights": {"50": 1}}]
+        })
+        CATALOG.add(catalog.get("crusher"))
+        self.enemy = Enemy(description="Crusher", interact_message="Hi",
+                           moveset="crusher")
+
+    def test_battle_uses_enemy_moves(self) -> None:
+        """Test that the enemy replies with the moves of its set."""
+        player = MagicMock()
+        player._health = 100
+        player.player_death.return_value = "ALIVE"
+        scanner = MagicMock()
+        scanner.read_int.return_value = 0
+        game = MagicMock()
+        game.world = World({}, None)
+
+        with patch("random.randint", return_value=5), \
+                patch("builtins.print") as mock_print:
+            self.enemy.interact(player, scanner, game)
+
+        mock_print.assert_any_call("Crusher performs a Crush! "
+                                   "It deals 50 damage.")
+        self.assertLessEqual(player._health, 0)
+
+    def test_move_set_is_saved(self) -> None:
+        """Test that only a non-default move set is written to saves."""
+        data = dump_npc(self.enemy)
+        self.assertEqual(data["moveset"], "crusher")
+        self.assertEqual(load_npc(data).moveset, "crusher")
+        plain = dump_npc(Enemy(description="Plain", interact_message="Hi"))
+        self.assertNotIn("moveset", plain)
+
+
+class TestOpponentModel(unittest.TestCase):
+    """
+    Unit tests for enemies that learn the player's habits.
+    """
+
+    def test_recent_moves_count_most(self) -> None:
+        """Test the decayed shares of the player's moves."""
+        model = OpponentModel(3, decay=0.5)
+        self.assertEqual(model.frequencies(), [0.0, 0.0, 0.0])
+        self.assertEqual(model.predict(), -1)
+        for move in [0] * 10 + [1] * 3:
+            model.observe(move)
+
+        self.assertEqual(model.frequencies(),
+                         [1023 / 8191, 7168 / 8191, 0.0])
+        guesses = [model.predict(random.Random(seed)) for seed in range(50)]
+        self.assertGreater(guesses.count(1), 35)
+        self.assertNotIn(2, guesses)
+
+    def test_long_battles_stay_finite(self) -> None:
+        """Test that the counts are scaled down instead of overflowing."""
+        model = OpponentModel(2, decay=0.5)
+        for index in range(5000):
+            model.observe(index % 2)
+        self.assertLessEqual(model.weight, OpponentModel.RESCALE)
+        self.assertAlmostEqual(model.frequencies()[1], 2 / 3)
+
+    def test_catalog_links_counters(self) -> None:
+        """Test that counters resolve to player moves, or are refused."""
+        adaptive = CATALOG.get("adaptive")
+        self.assertTrue(adaptive.adaptive)
+        self.assertFalse(CATALOG.get("default").adaptive)
+        self.assertEqual(adaptive.counters, (0, 1, 2))
+        self.assertEqual(adaptive.braces, (0, 1, 2))
+        with self.assertRaises(ValueError):
+            MoveCatalog.fromJSON({
+                "player": MOVE_DATA["player"],
+                "odd": [{"name": "Dab", "damage": [1, 2],
+                         "counters": "Moonwalk"}],
+            })
+
+    def test_enemy_counters_habits(self) -> None:
+        """Test that an enemy braces for the move the player repeats."""
+        enemy = Enemy(description="Mime", interact_message="...",
+                      moveset="adaptive")
+        player = MagicMock()
+        player._health = 100
+        player.player_death.return_value = "ALIVE"
+        scanner = MagicMock()
+        scanner.read_int.return_value = 1
+        game = MagicMock()
+        game.world = World({}, None)
+
+        with patch("random.randint", return_value=10), \
+                patch("builtins.print") as mock_print:
+            enemy.interact(player, scanner, game)
+
+        printed = [call.args[0] for call in mock_print.call_args_list
+                   if call.args]
+        self.assertEqual(printed.count("Mime saw your Flip coming!"), 9)
+        self.assertEqual(printed.count("Mime performs a Moonwalk! "
+                                       "It deals 10 damage."), 10)
+        self.assertEqual(enemy._health, 100 - 10 - 9 * 5)
+
+    def test_default_world_enemy_adapts(self) -> None:
+        """Test a battle against the default world's adaptive enemy."""
+        random.seed(4)
+        game = Game()
+        room = game.rooms["Room 6"]
+        jimin = room.npcs[0]
+        game.player.enter_room(room)
+        self.assertEqual(jimin.moveset, "adaptive")
+
+        with patch("builtins.input", return_value="1"), \
+                patch("builtins.print") as mock_print:
+            jimin.interact(game.player, game.scanner, game)
+
+        printed = [call.args[0] for call in mock_print.call_args_list
+                   if call.args]
+        self.assertIn("Jimin saw your Flip coming!", printed)
+        self.assertTrue(any(text.startswith("Jimin performs a Moonwalk!")
+                            for text in printed))
+
+    def test_engine_counters_habits(self) -> None:
+        """Test that the battle engine keeps a model per battle."""
+        room = Room(description="Hall")
+        world = World({"Hall": room}, room)
+        enemy = Enemy(description="Mime", interact_message="...",
+                      moveset="adaptive")
+        world.add_npc(room, enemy)
+        enemy._health = 1000
+        player = Player(name="Dancer")
+        player.enter_room(room)
+        player._health = 1000
+        engine = BattleEngine(world, random.Random(2))
+
+        handle = engine.start(player, enemy)
+        engine.choose(handle, 0)
+        engine.step()
+        before = enemy._health
+        engine.choose(handle, 0)
+        engine.step()
+
+        self.assertLessEqual(before - enemy._health, 15 // 2)
+        self.assertEqual(engine._models[handle].frequencies(),
+                         [1.0, 0.0, 0.0])
+        self.assertEqual(engine._models[handle].braced, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import random
+import unittest
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.navigation import UNREACHABLE, WorldGraph, has_undefeated_enemy
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.world import build_default_world
+
+
+class TestWorldGraph(unittest.TestCase):
+    """
+    Unit tests for the door graph index and its route queries.
+    """
+
+    def setUp(self) -> None:
+        """Index the default world."""
+        self.world = build_default_world()
+        self.graph = self.world.graph
+        self.start = self.graph.room_id(self.world.rooms["Start Room"])
+        self.room_6 = self.graph.room_id(self.world.rooms["Room 6"])
+
+    def test_adjacency_matches_doors(self) -> None:
+        """Test that each room's neighbours follow its doors."""
+        for room_id, room in enumerate(self.graph.rooms):
+            expected = [self.graph.room_id(door.leads_to)
+                        for door in room.doors]
+            self.assertEqual(list(self.graph.neighbours(room_id)), expected)
+
+    def test_distance_and_route(self) -> None:
+        """Test the shortest route from the start room to Room 6."""
+        self.assertEqual(self.graph.distance(self.start, self.room_6), 4)
+        doors = self.graph.route(self.start, self.room_6)
+        self.assertEqual(len(doors), 4)
+        self.assertIs(doors[-1].leads_to, self.world.rooms["Room 6"])
+        self.assertEqual(self.graph.route(self.start, self.start), [])
+
+    def test_unreachable_room(self) -> None:
+        """Test that rooms without a way in are reported unreachable."""
+        island = Room(description="Island")
+        rooms = dict(self.world.rooms, Island=island)
+        graph = WorldGraph(rooms)
+        island_id = graph.room_id(island)
+        self.assertEqual(graph.distance(0, island_id), UNREACHABLE)
+        self.assertIsNone(graph.route(0, island_id))
+
+    def test_nearest_undefeated_enemy(self) -> None:
+        """Test that defeated enemies are skipped by the search."""
+        room_2 = self.world.rooms["Room 2"]
+        self.assertEqual(
+            self.graph.nearest(self.start, has_undefeated_enemy),
+            self.graph.room_id(room_2)
+        )
+        room_2.npcs[1]._health = 0
+        self.assertEqual(
+            self.graph.nearest(self.start, has_undefeated_enemy),
+            self.graph.room_id(self.world.rooms["Room 4"])
+        )
+
+    def test_bidirectional_search_matches_cached_trees(self) -> None:
+        """Test that large-world searches find routes as short as BFS."""
+        rng = random.Random(7)
+        rooms = {f"Room {i}": Room(description=f"Room {i}")
+                 for i in range(300)}
+        ordered = list(rooms.values())
+        for i, room in enumerate(ordered[1:], start=1):
+            other = ordered[rng.randrange(i)]
+            room.add_door(Door(description="Back", leads_to=other))
+            if rng.random() < 0.7:
+                other.add_door(Door(description="On", leads_to=room))
+        graph = WorldGraph(rooms)
+
+        for _ in range(50):
+            source, goal = rng.randrange(300), rng.randrange(300)
+            expected = graph.distance(source, goal)
+            with patch("rpg.navigation.ALL_PAIRS_LIMIT", 0):
+                self.assertEqual(graph.distance(source, goal), expected)
+                route = graph.route(source, goal)
+            if expected == UNREACHABLE:
+                self.assertIsNone(route)
+            else:
+                self.assertEqual(len(route), expected)
+                current = graph.rooms[source]
+                for door in route:
+                    self.assertTrue(any(door is d for d in current.doors))
+                    current = door.leads_to
+                self.assertIs(current, graph.rooms[goal])
+
+
+class TestTravelCommand(unittest.TestCase):
+    """
+    Tests for the travel option of the main menu.
+    """
+
+    @patch("builtins.print")
+    @patch("builtins.input", side_effect=["6", "5", "5"])
+    def test_travel_to_room(self, _, __) -> None:
+        """Test that travelling walks the player to the chosen room."""
+        game = Game()
+        with self.assertRaises(SystemExit):
+            game.play()
+        self.assertIs(game.player._current_room, game.rooms["Room 5"])
+
+    @patch("builtins.print")
+    @patch("builtins.input", side_effect=["6", "0", "5"])
+    def test_travel_to_nearest_contestant(self, _, __) -> None:
+        """Test that the nearest contestant is found from the start."""
+        game = Game()
+        with self.assertRaises(SystemExit):
+            game.play()
+        self.assertIs(game.player._current_room, game.rooms["Room 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
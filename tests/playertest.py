@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import patch
 from rpg.player import Player
 from rpg.room.room import Room
+from rpg.room.door import Door
+from rpg.npcs.npc import NPC
 
 
 class TestPlayer(unittest.TestCase):
@@ -61,17 +63,48 @@ class TestPlayer(unittest.TestCase):
 
     def test_get_current_room_property(self) -> None:
         """
-        Test get_current_room property returns a deepcopy of the room.
+        Test get_current_room property returns a read-only view of the room.
         """
         current_room = self.player.get_current_room
         self.assertEqual(
             current_room.description, "A magical forest glade"
         )
 
-        current_room.description = "A completely different room"
-        self.assertNotEqual(
+        with self.assertRaises(AttributeError):
+            current_room.description = "A completely different room"
+        self.assertEqual(
             self.player._current_room.description,
-            current_room.description
+            "A magical forest glade"
+        )
+
+    def test_get_current_room_shares_structure(self) -> None:
+        """
+        Test the view reflects later changes to the live room.
+        """
+        current_room = self.player.get_current_room
+        npc = NPC(description="An owl", interact_message="Hoot")
+        self.room.add_npc(npc)
+        self.assertEqual(current_room.npcs, (npc,))
+        self.assertEqual(current_room, self.room)
+
+    def test_clone_current_room_is_isolated(self) -> None:
+        """
+        Test clone_current_room copies one room but not its neighbours.
+        """
+        neighbour = Room(description="A quiet meadow")
+        self.room.add_door(Door(description="A gate", leads_to=neighbour))
+        self.room.add_npc(NPC(description="An owl", interact_message="Hoot"))
+
+        copy = self.player.clone_current_room()
+        copy.description = "A completely different room"
+        copy.npcs[0].description = "A fox"
+        copy.doors.clear()
+
+        self.assertEqual(self.room.description, "A magical forest glade")
+        self.assertEqual(self.room.npcs[0].description, "An owl")
+        self.assertEqual(len(self.room.doors), 1)
+        self.assertIs(
+            self.player.clone_current_room().doors[0].leads_to, neighbour
         )
 
 
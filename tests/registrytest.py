@@ -0,0 +1,128 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from rpg.game import Game
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+from rpg.npcs.npc import NPC
+from rpg.npcs.registry import (
+    _KINDS_BY_CLASS, _KINDS_BY_TAG, dump_npc, kind_of, load_npc,
+    register_npc_kind
+)
+
+
+class Bouncer(Enemy):
+    """An Enemy subclass that is never registered on its own."""
+
+
+class Fan(NPC):
+    """An NPC subclass registered by the tests."""
+
+
+class TestNPCRegistry(unittest.TestCase):
+    """
+    Unit tests for NPC kind lookup, saving and loading.
+    """
+
+    def tearDown(self) -> None:
+        """Forget kinds registered by a test."""
+        _KINDS_BY_TAG.pop("fan", None)
+        for cls in (Fan, Bouncer):
+            _KINDS_BY_CLASS.pop(cls, None)
+
+    def test_kind_of_built_in_npcs(self) -> None:
+        """Test that each built-in class maps to its own tag."""
+        self.assertEqual(
+            kind_of(NPC(description="a", interact_message="b")).tag, "npc"
+        )
+        self.assertEqual(
+            kind_of(Enemy(description="a", interact_message="b")).tag,
+            "enemy"
+        )
+        self.assertEqual(
+            kind_of(Healer(description="a", interact_message="b")).tag,
+            "healer"
+        )
+
+    def test_unregistered_subclass_uses_base_kind(self) -> None:
+        """Test that subclasses fall back to their registered base."""
+        bouncer = Bouncer(description="Bouncer", interact_message="No")
+        self.assertEqual(kind_of(bouncer).tag, "enemy")
+        self.assertIsInstance(load_npc(dump_npc(bouncer)), Enemy)
+
+    def test_enemy_round_trip_keeps_health(self) -> None:
+        """Test that saving and loading an enemy keeps its health."""
+        enemy = Enemy(description="Lisa", interact_message="Bring it on!")
+        enemy._health = -5
+        data = json.loads(json.dumps(dump_npc(enemy)))
+
+        loaded = load_npc(data)
+
+        self.assertIsInstance(loaded, Enemy)
+        self.assertEqual(loaded._health, -5)
+        self.assertEqual(data["type"], "enemy")
+
+    def test_healer_round_trip_keeps_class(self) -> None:
+        """Test that healers reload as healers."""
+        healer = Healer(description="J-Hope", interact_message="Hope!")
+        self.assertIsInstance(load_npc(dump_npc(healer)), Healer)
+
+    def test_untagged_data_loads_as_plain_npc(self) -> None:
+        """Test that saves from before tagging still load."""
+        loaded = load_npc({"description": "RM", "interact_message": "Hi"})
+        self.assertIs(type(loaded), NPC)
+
+    def test_unknown_tag_is_rejected(self) -> None:
+        """Test that unknown kinds raise a ValueError."""
+        with self.assertRaises(ValueError):
+            load_npc({"type": "dragon", "description": "d",
+                      "interact_message": "m"})
+
+    def test_registering_a_new_kind(self) -> None:
+        """Test that new kinds get their own handler and tag."""
+        encounter = MagicMock()
+        register_npc_kind("fan", Fan, encounter=encounter)
+        fan = Fan(description="ARMY", interact_message="Borahae!")
+
+        kind_of(fan).encounter(fan, "game")
+
+        encounter.assert_called_once_with(fan, "game")
+        self.assertIsInstance(load_npc(dump_npc(fan)), Fan)
+
+
+class TestLosslessSave(unittest.TestCase):
+    """
+    Tests that a whole game survives a save and load unchanged.
+    """
+
+    @patch("builtins.print")
+    def test_game_round_trip(self, _) -> None:
+        """Test classes, health, doors and progress after reloading."""
+        game = Game()
+        room_2 = game.rooms["Room 2"]
+        room_2.npcs[1]._health = 0
+        game.rooms["Room 4"].npcs[1]._health = 35
+        game.player._health = 60
+        game.enemies_defeated = 1
+        game.player.enter_room(room_2)
+
+        data = json.loads(json.dumps(game.toJSON()))
+        loaded = Game.fromJSON(data)
+
+        self.assertEqual(loaded.toJSON(), game.toJSON())
+        vlad = loaded.rooms["Room 2"].npcs[1]
+        self.assertIsInstance(vlad, Enemy)
+        self.assertEqual(vlad._health, 0)
+        self.assertIsInstance(loaded.rooms["Room 4"].npcs[0], Healer)
+        self.assertEqual(loaded.rooms["Room 4"].npcs[1]._health, 35)
+        self.assertEqual(loaded.player._health, 60)
+        self.assertEqual(loaded.enemies_defeated, 1)
+        self.assertIs(loaded.player._current_room, loaded.rooms["Room 2"])
+        self.assertIs(
+            loaded.rooms["Start Room"].doors[0].leads_to,
+            loaded.rooms["Room 2"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
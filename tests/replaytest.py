@@ -0,0 +1,137 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.history import History
+from rpg.io_utils import Saver
+from rpg.replay import (
+    Recording, ReplayScanner, ReplayFinished, replay, state_hash, verify,
+    verify_files
+)
+
+
+# Walk to Room 2, fight Vlad with body rolls, save, look around, load and
+# travel to the nearest contestant.
+SESSION = ["1", "0", "2", "1", "0"] + ["2"] * 12 + ["3", "0", "4", "6", "0"]
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Unit tests for recording sessions and replaying them.
+    """
+
+    def setUp(self) -> None:
+        """Set up a directory for saves and recordings."""
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = self.temp.name
+
+    def tearDown(self) -> None:
+        """Remove the directory."""
+        self.temp.cleanup()
+
+    def record(self, seed: int, inputs=SESSION,
+               history: int = 0) -> Recording:
+        """Plays a session with typed inputs and records it."""
+        game = Game()
+        game.saver = Saver(self.directory)
+        if history:
+            game.history = History(game, history)
+        recording = Recording.start(game, seed=seed)
+        with patch("builtins.input", side_effect=inputs), \
+                patch("builtins.print"):
+            try:
+                game.play()
+            except StopIteration:
+                pass
+        recording.finish(game)
+        return recording
+
+    def test_replay_reaches_the_recorded_state(self) -> None:
+        """Test that a replay ends in exactly the recorded state."""
+        recording = self.record(seed=42)
+
+        self.assertEqual(recording.inputs[:5], [1, 0, 2, 1, 0])
+        ok, found = verify(recording)
+        self.assertTrue(ok)
+        self.assertEqual(found, recording.final_hash)
+
+    def test_changed_input_is_detected(self) -> None:
+        """Test that a replay with different inputs is caught."""
+        recording = self.record(seed=42)
+        recording.inputs[3] = 0
+
+        self.assertFalse(verify(recording)[0])
+
+    def test_seed_matters(self) -> None:
+        """Test that the battle depends on the recorded seed."""
+        first = self.record(seed=1)
+        second = self.record(seed=2)
+        self.assertNotEqual(first.final_hash, second.final_hash)
+
+        first.seed = 2
+        self.assertFalse(verify(first)[0])
+
+    def test_rewinds_are_replayed(self) -> None:
+        """Test that a session that rewound replays with its history."""
+        # Travel twice, rewind one command, fight in the room reached.
+        inputs = ["6", "2", "6", "3", "7", "1", "2", "1", "0", "2", "2"]
+        recording = self.record(seed=3, inputs=inputs, history=20)
+        path = os.path.join(self.directory, "session.json")
+        recording.save(path)
+
+        loaded = Recording.load(path)
+        self.assertEqual(loaded.history, 20)
+        self.assertTrue(verify(loaded)[0])
+        loaded.history = None
+        self.assertFalse(verify(loaded)[0])
+
+    def test_recording_file_round_trip(self) -> None:
+        """Test that recordings survive being written to disk."""
+        recording = self.record(seed=7)
+        path = os.path.join(self.directory, "session.json")
+        recording.save(path)
+
+        loaded = Recording.load(path)
+        self.assertEqual(loaded.inputs, recording.inputs)
+        self.assertEqual(loaded.final_hash, recording.final_hash)
+        self.assertTrue(verify(loaded)[0])
+
+    def test_batch_verification(self) -> None:
+        """Test that files are verified in parallel, in order."""
+        paths = []
+        for seed in range(4):
+            recording = self.record(seed=seed)
+            if seed == 2:
+                recording.final_hash = "0" * 64
+            path = os.path.join(self.directory, f"{seed}.json")
+            recording.save(path)
+            paths.append(path)
+
+        results = verify_files(paths, workers=2)
+
+        self.assertEqual([path for path, _, _ in results], paths)
+        self.assertEqual([ok for _, ok, _ in results],
+                         [True, True, False, True])
+
+    def test_replay_does_not_touch_global_state(self) -> None:
+        """Test that replays leave print and saves alone."""
+        recording = self.record(seed=3)
+        game = replay(recording)
+        self.assertEqual(state_hash(game), recording.final_hash)
+        with patch("builtins.print") as mock_print:
+            print("still printing")
+        mock_print.assert_called_once_with("still printing")
+        random.random()
+
+    def test_replay_scanner_runs_out(self) -> None:
+        """Test that asking past the recording ends the replay."""
+        scanner = ReplayScanner([4])
+        self.assertEqual(scanner.read_int(), 4)
+        with self.assertRaises(ReplayFinished):
+            scanner.read_int()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.healer import Healer
+from rpg.npcs.npc import NPC
+from rpg.npcs.roster import NPCRoster
+from rpg.room.room import Room
+
+
+class TestNPCRoster(unittest.TestCase):
+    """
+    Unit tests for the handle-based NPC container of a room.
+    """
+
+    def setUp(self) -> None:
+        """Set up a roster with one NPC of each kind."""
+        self.talker = NPC(description="RM", interact_message="Hi")
+        self.healer = Healer(description="J-Hope", interact_message="Hope")
+        self.enemy = Enemy(description="Lisa", interact_message="Go")
+        self.roster = NPCRoster([self.talker, self.healer, self.enemy])
+
+    def test_handles_follow_arrival_order(self) -> None:
+        """Test that fresh rosters hand out handles 0, 1, 2..."""
+        self.assertEqual(
+            list(self.roster.items()),
+            [(0, self.talker), (1, self.healer), (2, self.enemy)]
+        )
+        self.assertEqual(self.roster.handle_of(self.enemy), 2)
+
+    def test_handles_stay_stable_after_removal(self) -> None:
+        """Test that removing one NPC does not renumber the others."""
+        self.assertIs(self.roster.remove(0), self.talker)
+        self.assertIs(self.roster.get(2), self.enemy)
+        self.assertIsNone(self.roster.get(0))
+
+        newcomer = NPC(description="SUGA", interact_message="Yo")
+        self.assertEqual(self.roster.add(newcomer), 3)
+        self.assertEqual(list(self.roster), [self.healer, self.enemy,
+                                             newcomer])
+
+    def test_discard_matches_identity(self) -> None:
+        """Test that an equal but different NPC is not removed."""
+        twin = NPC(description="RM", interact_message="Hi")
+        self.assertIsNone(self.roster.discard(twin))
+        self.assertNotIn(twin, self.roster)
+        self.assertEqual(self.roster.discard(self.talker), 0)
+        self.assertEqual(len(self.roster), 2)
+
+    def test_adding_twice_is_rejected(self) -> None:
+        """Test that one NPC cannot sit in the roster twice."""
+        with self.assertRaises(ValueError):
+            self.roster.add(self.enemy)
+
+    def test_of_type_sub_index(self) -> None:
+        """Test that NPCs are grouped by class, subclasses included."""
+        self.assertEqual(self.roster.of_type(Enemy), [self.enemy])
+        self.assertEqual(len(self.roster.of_type(NPC)), 3)
+        self.roster.discard(self.enemy)
+        self.assertEqual(self.roster.of_type(Enemy), [])
+
+    def test_positional_access(self) -> None:
+        """Test that indexing counts positions, like a list."""
+        self.assertIs(self.roster[0], self.talker)
+        self.assertIs(self.roster[-1], self.enemy)
+        with self.assertRaises(IndexError):
+            self.roster[3]
+
+    def test_restore_keeps_handles_unique(self) -> None:
+        """Test that restoring old entries never reuses a handle."""
+        self.roster.add(NPC(description="SUGA", interact_message="Yo"))
+        self.roster.restore([(1, self.healer)])
+        self.assertEqual(list(self.roster.items()), [(1, self.healer)])
+        self.assertEqual(self.roster.add(self.talker), 4)
+
+
+class TestRoomRoster(unittest.TestCase):
+    """
+    Tests for rooms built on the NPC roster.
+    """
+
+    def test_room_accepts_a_list(self) -> None:
+        """Test that rooms still accept plain lists of NPCs."""
+        npc = NPC(description="Jin", interact_message="Busy")
+        room = Room(description="Game room", npcs=[npc])
+        self.assertIsInstance(room.npcs, NPCRoster)
+        self.assertIs(room.npcs.get(0), npc)
+
+    @patch("builtins.print")
+    def test_listing_shows_handles(self, mock_print) -> None:
+        """Test that list_npcs labels NPCs with their stable handles."""
+        room = Room(description="Studio")
+        first = NPC(description="RM", interact_message="Hi")
+        room.add_npc(first)
+        room.add_npc(NPC(description="SUGA", interact_message="Yo"))
+        room.npcs.discard(first)
+
+        room.list_npcs()
+
+        mock_print.assert_any_call("  (1) SUGA")
+
+
+if __name__ == "__main__":
+    unittest.main()
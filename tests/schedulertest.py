@@ -0,0 +1,230 @@
+import unittest
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.room.door import Door
+from rpg.room.room import Room
+from rpg.scheduler import Action, HealUp, Patrol, Roam
+from rpg.statehash import recompute_world_hash
+from rpg.world import World, build_default_world
+
+
+class Counter(Action):
+    """An action that records the ticks it ran at."""
+
+    def __init__(self, every: int, runs: int) -> None:
+        super().__init__(every)
+        self.runs = runs
+        self.ticks = []
+
+    def __call__(self, world: World):
+        self.ticks.append(world.scheduler.now)
+        return self.every if len(self.ticks) < self.runs else None
+
+    def reset(self) -> None:
+        self.ticks = []
+
+
+class TestWorldScheduler(unittest.TestCase):
+    """
+    Unit tests for the tick-based scheduler of NPC actions.
+    """
+
+    def setUp(self) -> None:
+        """Set up two connected rooms with an NPC and an enemy."""
+        self.hall = Room(description="Hall")
+        self.studio = Room(description="Studio")
+        self.hall.add_door(Door(description="Arch", leads_to=self.studio))
+        self.studio.add_door(Door(description="Arch", leads_to=self.hall))
+        self.dancer = NPC(description="RM", interact_message="Hi")
+        self.enemy = Enemy(description="Lisa", interact_message="Go")
+        self.hall.add_npc(self.dancer)
+        self.studio.add_npc(self.enemy)
+        self.world = World(
+            {"Hall": self.hall, "Studio": self.studio}, self.hall
+        )
+
+    def test_actions_run_only_when_due(self) -> None:
+        """Test that actions fire at their ticks and stop on None."""
+        counter = Counter(every=3, runs=2)
+        self.world.scheduler.schedule(counter)
+
+        self.assertEqual(self.world.scheduler.advance(2), 0)
+        self.assertEqual(self.world.scheduler.advance(10), 2)
+        self.assertEqual(counter.ticks, [3, 6])
+        self.assertEqual(len(self.world.scheduler), 0)
+
+    def test_actions_must_be_callable(self) -> None:
+        """Test that an action without __call__ cannot be created."""
+        with self.assertRaises(TypeError):
+            Action(every=1)
+
+    def test_patrol_walks_back_and_forth(self) -> None:
+        """Test that a patrol moves its NPC along the route and back."""
+        self.world.scheduler.schedule(
+            Patrol(self.dancer, [self.hall, self.studio], every=1)
+        )
+
+        self.world.scheduler.advance()
+        self.assertIn(self.dancer, self.studio.npcs)
+        self.assertNotIn(self.dancer, self.hall.npcs)
+        self.world.scheduler.advance()
+        self.assertIn(self.dancer, self.hall.npcs)
+
+    def test_roam_is_reproducible(self) -> None:
+        """Test that a roaming NPC follows the doors of its room."""
+        self.world.scheduler.schedule(
+            Roam(self.dancer, self.hall, every=2, seed=4)
+        )
+
+        self.world.scheduler.advance(2)
+        self.assertIn(self.dancer, self.studio.npcs)
+
+    def test_removed_npc_stops_patrolling(self) -> None:
+        """Test that a defeated NPC is not brought back by its patrol."""
+        self.world.scheduler.schedule(
+            Patrol(self.dancer, [self.hall, self.studio], every=1)
+        )
+        self.world.remove_npc(self.hall, self.dancer)
+
+        self.world.scheduler.advance(3)
+        self.assertNotIn(self.dancer, self.studio.npcs)
+        self.assertEqual(len(self.world.scheduler), 0)
+
+    def test_heal_up_skips_defeated_and_caps(self) -> None:
+        """Test that only wounded, standing enemies recover."""
+        self.world.scheduler.schedule(
+            HealUp(self.enemy, self.studio, amount=30, every=1)
+        )
+        self.world.strike(self.studio, self.enemy, 40)
+
+        self.world.scheduler.advance(5)
+        self.assertEqual(self.enemy._health, 100)
+
+        self.world.strike(self.studio, self.enemy, 100)
+        self.world.scheduler.advance(5)
+        self.assertEqual(self.enemy._health, 0)
+
+    def test_wounded_enemies_heal_until_healthy(self) -> None:
+        """Test that healing starts on a wound and stops when done."""
+        self.world.heal_wounded(amount=30, every=1)
+        self.assertEqual(len(self.world.scheduler), 0)
+
+        self.world.strike(self.studio, self.enemy, 40)
+        self.world.strike(self.studio, self.enemy, 5)
+        self.assertEqual(len(self.world.scheduler), 1)
+        self.world.scheduler.advance(1)
+        self.assertEqual(self.enemy._health, 85)
+        self.world.scheduler.advance(1)
+        self.assertEqual(self.enemy._health, 100)
+        self.assertEqual(len(self.world.scheduler), 0)
+
+        self.world.strike(self.studio, self.enemy, 100)
+        self.assertEqual(len(self.world.scheduler), 0)
+
+    def test_healing_follows_a_roaming_enemy(self) -> None:
+        """Test that an enemy that moved is healed in its new room."""
+        world = build_default_world()
+        rooms = world.rooms
+        momo = rooms["Room 6"].npcs[1]
+        changes = world.watch()
+        world.state_hash
+        world.scheduler.advance(6)
+        world.strike(rooms["Room 6"], momo, 20)
+
+        # Momo roams on tick 8 and heals on tick 9.
+        world.scheduler.advance(2)
+        room = world.room_of(momo, rooms["Room 6"])
+        self.assertIsNot(room, rooms["Room 6"])
+        changes.clear()
+        world.scheduler.advance(1)
+        self.assertEqual(momo._health, 85)
+        self.assertIn(id(room), changes)
+        self.assertEqual(world.state_hash, recompute_world_hash(world))
+
+        world.strike(room, momo, 20)
+        world.scheduler.advance(3)
+        self.assertEqual(momo._health, 70)
+        self.assertEqual(world.state_hash, recompute_world_hash(world))
+
+    def test_loaded_worlds_keep_their_own_routines(self) -> None:
+        """Test that only saves of the default world get its routines."""
+        generated = Game(world=generate_world(50, seed=2)).toJSON()
+        self.assertEqual(len(Game.fromJSON(generated).world.scheduler), 0)
+
+        game = Game()
+        game.world.strike(game.rooms["Room 2"],
+                          game.rooms["Room 2"].npcs[1], 30)
+        loaded = Game.fromJSON(game.toJSON())
+        vlad = loaded.rooms["Room 2"].npcs[1]
+        self.assertEqual(len(loaded.world.scheduler), 3)
+        loaded.world.scheduler.advance(3)
+        self.assertEqual(vlad._health, 75)
+
+    def test_captures_share_idle_actions(self) -> None:
+        """Test that a capture only replaces the actions that ran."""
+        scheduler = self.world.scheduler
+        sleepers = [Counter(every=1000, runs=1) for _ in range(100)]
+        for sleeper in sleepers:
+            scheduler.schedule(sleeper)
+        scheduler.schedule(Patrol(self.dancer, [self.hall, self.studio],
+                                  every=1))
+        before = scheduler.capture()
+
+        scheduler.advance()
+        after = scheduler.capture()
+        self.assertEqual(list(after[2].differences(before[2])), [100])
+        self.assertIs(scheduler.capture()[2], after[2])
+        self.assertIs(after[2].root[0], before[2].root[0])
+
+    def test_restore_rewinds_the_queue(self) -> None:
+        """Test that restoring replays the same runs as the first time."""
+        scheduler = self.world.scheduler
+        counter = Counter(every=2, runs=10)
+        patrol = Patrol(self.dancer, [self.hall, self.studio], every=3)
+        scheduler.schedule(counter)
+        scheduler.schedule(patrol)
+        scheduler.advance(3)
+        saved = scheduler.capture()
+
+        scheduler.advance(4)
+        late = Counter(every=1, runs=5)
+        scheduler.wake(late)
+        ticks = list(counter.ticks)
+        scheduler.restore(saved)
+        self.assertEqual((scheduler.now, len(scheduler)), (3, 2))
+        self.assertEqual(patrol.capture(), (1, 1))
+
+        counter.ticks = ticks[:1]
+        scheduler.advance(4)
+        self.assertEqual(counter.ticks, ticks)
+        self.assertEqual(late.ticks, [])
+
+    def test_reset_rewinds_npcs_and_clock(self) -> None:
+        """Test that a world reset undoes moves and restarts the clock."""
+        self.world.scheduler.schedule(
+            Patrol(self.dancer, [self.hall, self.studio], every=1)
+        )
+        self.world.scheduler.advance()
+
+        self.world.reset()
+
+        self.assertEqual(self.world.scheduler.now, 0)
+        self.assertIn(self.dancer, self.hall.npcs)
+        self.assertNotIn(self.dancer, self.studio.npcs)
+        self.world.scheduler.advance()
+        self.assertIn(self.dancer, self.studio.npcs)
+
+    def test_default_world_has_routines(self) -> None:
+        """Test that RM leaves the studio after a few ticks."""
+        world = build_default_world()
+        rm = world.rooms["Room 5"].npcs[1]
+
+        world.scheduler.advance(5)
+
+        self.assertIn(rm, world.rooms["Room 4"].npcs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from urllib.request import urlopen
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.npcs.enemy import Enemy
+from rpg.replay import RecordingScanner, ReplayScanner
+from rpg.search import serve, words
+from rpg.world import build_default_world
+
+
+class TestSearchIndex(unittest.TestCase):
+    """
+    Unit tests for finding rooms, doors and NPCs by their words.
+    """
+
+    def setUp(self) -> None:
+        """Index the default world."""
+        self.world = build_default_world()
+        self.index = self.world.search
+        self.vlad = self.world.rooms["Room 2"].npcs[1]
+
+    def find(self, text: str, **options) -> list:
+        """Search and return each match's kind, description and room."""
+        return [(match.kind, match.entity.description, match.room_name)
+                for match in self.index.query(text, **options)]
+
+    def test_words(self) -> None:
+        """Test that texts split into distinct lowercase words."""
+        self.assertEqual(words("Hi! My name is Jimin. Hi, Jimin's"),
+                         ("hi", "my", "name", "is", "jimin", "s"))
+
+    def test_prefix_and_whole_words(self) -> None:
+        """Test that the last word is a prefix and the others are whole."""
+        self.assertEqual(self.find("vla"), [("npc", "Vlad", "Room 2")])
+        self.assertEqual(self.find("obliterate"),
+                         [("npc", "Vlad", "Room 2")])
+        self.assertEqual(self.find("jimin DANCE"),
+                         [("room", "Jimin's dance studio. All his trophies "
+                                   "and gold medals are on display.",
+                           "Room 6")])
+        self.assertEqual(self.find("vla obliterate"), [])
+        self.assertEqual(self.find("   "), [])
+        self.assertEqual(self.find("unheard of"), [])
+
+    def test_kinds_and_limit(self) -> None:
+        """Test that searches keep to the kinds and limit asked for."""
+        doors = self.find("door", limit=100)
+        self.assertEqual(len(doors), 10)
+        self.assertEqual({kind for kind, _, _ in doors}, {"door"})
+        self.assertEqual(len(self.find("door", limit=3)), 3)
+        self.assertEqual(self.find("mirror", kinds=["room"]),
+                         [("room", "Practice room of boy group BTS. The "
+                                   "room is fully empty, but you see a lot "
+                                   "of mirrors.", "Start Room")])
+
+    def test_follows_moves_and_defeats(self) -> None:
+        """Test that the index keeps up with the world's NPCs."""
+        room_2, room_6 = self.world.rooms["Room 2"], self.world.rooms["Room 6"]
+        self.world.move_npc(self.vlad, room_2, room_6)
+        self.assertEqual(self.find("vlad"), [("npc", "Vlad", "Room 6")])
+
+        self.world.strike(room_6, self.vlad, 100)
+        self.assertEqual(self.find("vlad"), [])
+        momo = room_6.npcs[1]
+        self.world.remove_npc(room_6, momo)
+        self.assertEqual(self.find("momo"), [])
+
+        newcomer = Enemy(description="Zelda", interact_message="Zoom!")
+        self.world.add_npc(room_2, newcomer)
+        self.assertEqual(self.find("zo"), [("npc", "Zelda", "Room 2")])
+
+        self.world.reset()
+        self.assertEqual(self.find("vlad"), [("npc", "Vlad", "Room 2")])
+        self.assertEqual(self.find("momo"), [("npc", "Momo", "Room 6")])
+        self.assertEqual(self.find("zelda"), [])
+
+    def test_matches_a_scan_of_a_large_world(self) -> None:
+        """Test queries on a generated world against reading every room."""
+        world = generate_world(3000, seed=3)
+        index = world.search
+        rooms = list(world.rooms.values())
+        for room in rooms[::7]:
+            if room.npcs:
+                world.move_npc(room.npcs[0], room, rooms[0])
+
+        for text in ("rival 1", "medic 2", "door to room 12", "fan"):
+            *whole, prefix = words(text)
+            expected = set()
+            for name, room in world.rooms.items():
+                for kind, entity, said in (
+                        [("room", room, "")]
+                        + [("door", door, "") for door in room.doors]
+                        + [("npc", npc, npc.interact_message)
+                           for npc in room.npcs]):
+                    found = words(f"{entity.description} {said}")
+                    if all(word in found for word in whole) and any(
+                            word.startswith(prefix) for word in found):
+                        expected.add((kind, entity.description, name))
+            found = {(match.kind, match.entity.description, match.room_name)
+                     for match in index.query(text, limit=10 ** 6)}
+            self.assertEqual(found, expected, text)
+
+
+class TestSearchCommand(unittest.TestCase):
+    """
+    Unit tests for searching from the game and over HTTP.
+    """
+
+    def test_menu_command(self) -> None:
+        """Test that the search command lists what it found."""
+        game = Game()
+        game.scanner = MagicMock()
+        game.scanner.read_line.return_value = "soundproof"
+        with patch("builtins.print") as mock_print:
+            game.dispatch(8)
+        mock_print.assert_any_call("  Door: A black soundproof iron door "
+                                   "(in Start Room)")
+
+        game.scanner.read_line.return_value = "xylophone"
+        with patch("builtins.print") as mock_print:
+            game.dispatch(8)
+        mock_print.assert_called_once_with("Nothing you know of matches "
+                                           "that.")
+
+    def test_texts_are_recorded_and_replayed(self) -> None:
+        """Test that search texts go into recordings like numbers."""
+        scanner = RecordingScanner()
+        with patch("builtins.input", side_effect=["8", " jimin "]):
+            scanner.read_int()
+            scanner.read_line()
+        self.assertEqual(scanner._inputs, [8, "jimin"])
+        replayed = ReplayScanner(scanner._inputs)
+        self.assertEqual((replayed.read_int(), replayed.read_line()),
+                         (8, "jimin"))
+
+    def test_admin_api(self) -> None:
+        """Test searching over HTTP."""
+        world = build_default_world()
+        server = serve(lambda: world, port=0)
+        try:
+            port = server.server_address[1]
+            with urlopen(f"http://127.0.0.1:{port}/search?q=Lisa"
+                         f"&kind=npc") as response:
+                data = json.load(response)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(data, {"query": "Lisa", "matches": [
+            {"kind": "npc", "description": "Lisa", "room": "Room 4"}
+        ]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(unittest.TestCase):
+    """
+    Tests that keep the production import path lean.
+    """
+
+    def run_in_fresh_interpreter(self, code: str) -> str:
+        """
+        Runs Python code in a new interpreter and returns its output.
+
+        Args:
+            code (str): The code to run.
+
+        Returns:
+            str: The stripped standard output.
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+
+    def test_game_import_skips_test_modules(self) -> None:
+        """Test that importing the game never loads unittest or tests."""
+        output = self.run_in_fresh_interpreter(
+            "import sys, rpg.game; "
+            "print(sorted(m for m in sys.modules "
+            "if m.split('.')[0] in ('unittest', 'tests')))"
+        )
+        self.assertEqual(output, "[]")
+
+    def test_model_schemas_are_deferred(self) -> None:
+        """Test that pydantic schemas are built on first use, not import."""
+        output = self.run_in_fresh_interpreter(
+            "from rpg.npcs.npc import NPC; "
+            "before = NPC.__pydantic_complete__; "
+            "NPC(description='d', interact_message='m'); "
+            "print(before, NPC.__pydantic_complete__)"
+        )
+        self.assertEqual(output, "False True")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import threading
+import unittest
+from rpg.game import Game
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.statehash import (
+    component, game_hash, recompute_game_hash, recompute_world_hash
+)
+
+
+class TestStateHash(unittest.TestCase):
+    """
+    Unit tests for the incrementally maintained game state hash.
+    """
+
+    def setUp(self) -> None:
+        """Set up a game in the default world."""
+        self.game = Game()
+        self.world = self.game.world
+        self.room_2 = self.world.rooms["Room 2"]
+        self.vlad = self.room_2.npcs.of_type(Enemy)[0]
+
+    def assertConsistent(self) -> None:
+        """Assert that the maintained hash matches a full recompute."""
+        self.assertEqual(self.world.state_hash,
+                         recompute_world_hash(self.world))
+        self.assertEqual(game_hash(self.game),
+                         recompute_game_hash(self.game))
+
+    def test_components_are_stable(self) -> None:
+        """Test that components do not depend on the process's salt."""
+        self.assertEqual(component("npc", "Room 2", "enemy", "Vlad", 100),
+                         13941913593893922329)
+
+    def test_world_changes_keep_hash_consistent(self) -> None:
+        """Test every kind of world change against a full recompute."""
+        room_4 = self.world.rooms["Room 4"]
+        self.world.strike(self.room_2, self.vlad, 30)
+        self.assertConsistent()
+        self.world.heal(self.room_2, self.vlad, 5, 100)
+        self.assertConsistent()
+        self.world.move_npc(self.vlad, self.room_2, room_4)
+        self.assertConsistent()
+        self.world.remove_npc(room_4, self.vlad)
+        self.assertConsistent()
+        self.world.add_npc(room_4, NPC(description="Fan",
+                                       interact_message="Hi"))
+        self.assertConsistent()
+        self.world.reset()
+        self.assertConsistent()
+
+    def test_hash_follows_state_not_history(self) -> None:
+        """Test that undoing a change restores the original hash."""
+        start = game_hash(self.game)
+        room_4 = self.world.rooms["Room 4"]
+
+        self.world.move_npc(self.vlad, self.room_2, room_4)
+        self.assertNotEqual(game_hash(self.game), start)
+        self.world.move_npc(self.vlad, room_4, self.room_2)
+        self.assertEqual(game_hash(self.game), start)
+
+    def test_player_state_is_covered(self) -> None:
+        """Test that the player's room and health change the hash."""
+        start = game_hash(self.game)
+        self.game.player._health = 60
+        wounded = game_hash(self.game)
+        self.assertNotEqual(wounded, start)
+        self.game.player.enter_room(self.room_2)
+        self.assertNotEqual(game_hash(self.game), wounded)
+        self.assertConsistent()
+
+    def test_identical_npcs_do_not_cancel(self) -> None:
+        """Test that two equal NPCs count twice instead of cancelling."""
+        lobby = self.world.rooms["Room 3"]
+        start = self.world.state_hash
+        for _ in range(2):
+            self.world.add_npc(lobby, NPC(description="Twin",
+                                          interact_message="Hi"))
+        self.assertNotEqual(self.world.state_hash, start)
+        self.assertConsistent()
+
+    def test_changes_before_first_read(self) -> None:
+        """Test that changes made before the world is hashed count."""
+        self.world.strike(self.room_2, self.vlad, 30)
+        self.world.move_npc(self.vlad, self.room_2, self.world.start_room)
+        self.assertConsistent()
+
+    def test_concurrent_changes(self) -> None:
+        """Test that changes from many threads keep the hash consistent."""
+        self.world.state_hash
+        rooms = list(self.world.rooms.values())
+
+        def wander(npc: NPC, home: int) -> None:
+            here = rooms[home]
+            for step in range(200):
+                there = rooms[(home + step + 1) % len(rooms)]
+                if self.world.move_npc(npc, here, there):
+                    here = there
+
+        threads = []
+        for index, room in enumerate(rooms):
+            npc = NPC(description=f"Walker {index}", interact_message="Hi")
+            self.world.add_npc(room, npc)
+            threads.append(threading.Thread(target=wander,
+                                            args=(npc, index)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertConsistent()
+
+    def test_saved_game_has_same_hash(self) -> None:
+        """Test that a save and its reload hash the same."""
+        self.world.strike(self.room_2, self.vlad, 45)
+        self.game.player._health = 70
+        self.game.player.enter_room(self.room_2)
+
+        loaded = Game.fromJSON(self.game.toJSON())
+
+        self.assertEqual(game_hash(loaded), game_hash(self.game))
+
+    def test_direct_changes_are_picked_up_by_touch(self) -> None:
+        """Test that touch() rehashes a room changed behind the world."""
+        self.world.state_hash
+        self.vlad._health = 10
+        self.assertNotEqual(self.world.state_hash,
+                            recompute_world_hash(self.world))
+        self.world.touch(self.room_2)
+        self.assertConsistent()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.generator import generate_world
+from rpg.io_utils import Saver
+from rpg.strings import StringCatalog, pack, unpack
+
+
+class TestStringCatalog(unittest.TestCase):
+    """
+    Unit tests for the catalog of shared texts.
+    """
+
+    def test_ids_and_shared_copies(self) -> None:
+        """Test that equal texts get one ID and one shared copy."""
+        catalog = StringCatalog()
+        self.assertEqual(catalog.id_of("Hello"), 0)
+        self.assertEqual(catalog.id_of("Bye"), 1)
+        self.assertEqual(catalog.id_of("".join(["Hel", "lo"])), 0)
+        self.assertEqual(len(catalog), 2)
+        copy = "".join(["By", "e"])
+        self.assertIs(catalog.intern(copy), catalog.text(1))
+        self.assertEqual(catalog.texts, ["Hello", "Bye"])
+
+    def test_unknown_id(self) -> None:
+        """Test that looking up a missing ID fails."""
+        catalog = StringCatalog(["Hello"])
+        with self.assertRaises(ValueError):
+            catalog.text(1)
+        with self.assertRaises(ValueError):
+            catalog.text(-1)
+
+
+class TestPacking(unittest.TestCase):
+    """
+    Unit tests for writing texts once per save.
+    """
+
+    def setUp(self) -> None:
+        """Take the state of a new game."""
+        self.data = Game().toJSON()
+
+    def test_round_trip(self) -> None:
+        """Test that unpacking a packed save gives the save back."""
+        packed = pack(self.data)
+        self.assertEqual(len(packed["strings"]),
+                         len(set(packed["strings"])))
+        self.assertEqual(unpack(json.loads(json.dumps(packed))), self.data)
+
+    def test_texts_are_written_once(self) -> None:
+        """Test that every text is in the save once, and smaller for it."""
+        packed = json.dumps(pack(self.data), indent=4)
+        plain = json.dumps(self.data, indent=4)
+        self.assertLess(len(packed), len(plain))
+        start = self.data["current_room"]
+        self.assertEqual(packed.count(json.dumps(start)), 1)
+        self.assertGreater(plain.count(json.dumps(start)), 1)
+
+    def test_loaded_texts_are_shared(self) -> None:
+        """Test that every use of a text loads as the same string."""
+        data = unpack(json.loads(json.dumps(pack(self.data))))
+        start = data["rooms"]["Start Room"]
+        first = start["doors"][0]["leads_to"]
+        room = [room for room in data["rooms"].values()
+                if room["description"] == first][0]
+        back = [door for door in room["doors"]
+                if door["leads_to"] == start["description"]][0]
+        self.assertIs(first, room["description"])
+        self.assertIs(back["leads_to"], start["description"])
+        self.assertIs(data["current_room"], start["description"])
+
+    def test_old_saves(self) -> None:
+        """Test that saves without a catalog load, with shared texts."""
+        data = unpack(json.loads(json.dumps(self.data)))
+        self.assertEqual(data, self.data)
+        start = data["rooms"]["Start Room"]
+        self.assertIs(data["current_room"], start["description"])
+
+    def test_saves_without_text(self) -> None:
+        """Test that saves without any text are left as they are."""
+        data = {"player": None, "enemies_defeated": 3}
+        self.assertIs(pack(data), data)
+        self.assertEqual(unpack(data), data)
+        self.assertEqual(unpack("state"), "state")
+
+    def test_generated_doors_share_labels(self) -> None:
+        """Test that doors into the same generated room share a label."""
+        world = generate_world(200, seed=5)
+        labels = {}
+        for room in world.rooms.values():
+            for door in room.doors:
+                label = labels.setdefault(door.description,
+                                          door.description)
+                self.assertIs(door.description, label)
+
+
+class TestSaver(unittest.TestCase):
+    """
+    Unit tests for saving and loading games with a catalog.
+    """
+
+    def test_save_and_load(self) -> None:
+        """Test that a saved game loads as it was."""
+        game = Game()
+        game.player.enter_room(game.rooms["Room 2"])
+        game.enemies_defeated = 2
+        with tempfile.TemporaryDirectory() as directory:
+            with patch("builtins.print"):
+                saver = Saver(save_directory=directory)
+                saver.quick_save(game)
+                with open(saver.save_file) as file:
+                    self.assertIn("strings", json.load(file))
+                loaded = saver.quick_load()
+        self.assertEqual(loaded.toJSON(), game.toJSON())
+        self.assertIs(loaded.player._current_room, loaded.rooms["Room 2"])
+
+    def test_load_old_save(self) -> None:
+        """Test that a save written without a catalog still loads."""
+        game = Game()
+        with tempfile.TemporaryDirectory() as directory:
+            with patch("builtins.print"):
+                saver = Saver(save_directory=directory)
+                with open(os.path.join(directory, "quicksave.json"),
+                          "w") as file:
+                    json.dump(game.toJSON(), file, indent=4)
+                loaded = saver.quick_load()
+        self.assertEqual(loaded.toJSON(), game.toJSON())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import random
+import tempfile
+import unittest
+from itertools import cycle
+from unittest.mock import MagicMock, patch
+from rpg.battles import BattleEngine
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.moves import CATALOG, MoveCatalog, MovePolicy
+from rpg.player import Player
+from rpg.room.room import Room
+from rpg.training import (STATES, QTrainer, export_policies,
+                          install_policies, win_rate)
+from rpg.world import World
+
+
+class TestMovePolicy(unittest.TestCase):
+    """
+    Unit tests for move lookup tables.
+    """
+
+    def test_lookup(self) -> None:
+        """Test that healths land in the right cells."""
+        policy = MovePolicy(bytes(range(16)), bucket=25, limit=100)
+        self.assertEqual(policy.choose(1, 1), 0)
+        self.assertEqual(policy.choose(25, 26), 1)
+        self.assertEqual(policy.choose(26, 100), 7)
+        self.assertEqual(policy.choose(1000, 1000), 15)
+
+    def test_json_round_trip(self) -> None:
+        """Test that a saved policy loads back the same."""
+        policy = MovePolicy(bytes(i % 3 for i in range(400)))
+        loaded = MovePolicy.fromJSON(policy.toJSON())
+        self.assertEqual(loaded.table, policy.table)
+        self.assertEqual((loaded.bucket, loaded.limit), (5, 100))
+
+    def test_wrong_size(self) -> None:
+        """Test that a table of the wrong size is refused."""
+        with self.assertRaises(ValueError):
+            MovePolicy(bytes(10))
+
+
+class TestQTrainer(unittest.TestCase):
+    """
+    Unit tests for learning and installing move policies.
+    """
+
+    def tearDown(self) -> None:
+        """Take learned policies off the shared catalog."""
+        CATALOG.player.policy = None
+        CATALOG.get("default").policy = None
+
+    def test_learned_player_beats_random_play(self) -> None:
+        """Test that training makes the player win far more often."""
+        trainer = QTrainer(seed=1)
+        rate = trainer.train(20000, workers=1)
+        player, enemy = trainer.policies()
+
+        self.assertEqual(trainer.episodes, 20000)
+        self.assertGreater(rate, 0)
+        self.assertEqual(len(player.table), STATES)
+        baseline = win_rate(None, None, 3000)
+        self.assertGreater(win_rate(player, None, 3000), baseline + 0.3)
+        self.assertLess(win_rate(None, enemy, 3000), baseline)
+
+    def test_workers_do_not_change_results(self) -> None:
+        """Test that parallel rollouts learn exactly what one process does."""
+        tables = []
+        for workers in (1, 2):
+            trainer = QTrainer(seed=4)
+            trainer.train(2000, workers=workers, batch=250, rollouts=4)
+            tables.append((trainer.q_player, trainer.q_enemy))
+        self.assertEqual(tables[0], tables[1])
+
+    def test_install_policies(self) -> None:
+        """Test exporting, installing and refusing bad policies."""
+        player = MovePolicy(bytes([2]) * STATES)
+        enemy = MovePolicy(bytes([1]) * STATES)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policies.json")
+            export_policies(path, player, enemy)
+            install_policies(path)
+            self.assertEqual(CATALOG.player.policy.table, player.table)
+            self.assertEqual(CATALOG.get("default").policy.table,
+                             enemy.table)
+
+            self.tearDown()
+            export_policies(path, player, MovePolicy(bytes([7]) * STATES))
+            with self.assertRaises(ValueError):
+                install_policies(path)
+            self.assertIsNone(CATALOG.player.policy)
+
+    @patch("builtins.print")
+    def test_enemy_replies_by_policy(self, mock_print: MagicMock) -> None:
+        """Test that enemies follow the policy and the player is coached."""
+        CATALOG.player.policy = MovePolicy(bytes([1]) * STATES)
+        CATALOG.get("default").policy = MovePolicy(bytes([2]) * STATES)
+        enemy = Enemy(description="Rival", interact_message="Hi")
+        player = MagicMock()
+        player._health = 100
+        player.player_death.return_value = "ALIVE"
+        scanner = MagicMock()
+        scanner.read_int.side_effect = cycle([0])
+        game = MagicMock()
+        game.world = World({}, None)
+
+        with patch("random.randint", side_effect=cycle([15, 5])):
+            enemy.interact(player, scanner, game)
+
+        names = CATALOG.get("default").names
+        coach = f"Coach suggests: {CATALOG.player.names[1]}"
+        mock_print.assert_any_call(coach)
+        replies = [call.args[0] for call in mock_print.call_args_list
+                   if "performs a" in str(call.args[0])]
+        self.assertTrue(replies)
+        self.assertTrue(all(f"performs a {names[2]}!" in reply
+                            for reply in replies))
+
+    def test_engine_replies_by_policy(self) -> None:
+        """Test that the battle engine looks replies up in the policy."""
+        catalog = MoveCatalog.fromJSON({
+            "trained": [{"name": "Tap", "damage": [1, 1]},
+                        {"name": "Slam", "damage": [50, 50]}],
+        })
+        CATALOG.add(catalog.get("trained"))
+        CATALOG.get("trained").policy = MovePolicy(bytes([1]) * STATES)
+        room = Room(description="Hall")
+        world = World({"Hall": room}, room)
+        enemy = Enemy(description="Rival", interact_message="Hi",
+                      moveset="trained")
+        world.add_npc(room, enemy)
+        enemy._health = 1000
+        player = Player(name="Dancer")
+        player.enter_room(room)
+        engine = BattleEngine(world, random.Random(0))
+
+        handle = engine.start(player, enemy)
+        engine.choose(handle, 0)
+        engine.step()
+        self.assertEqual(player._health, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
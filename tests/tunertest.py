@@ -0,0 +1,98 @@
+import os
+import random
+import tempfile
+import unittest
+from rpg.npcs.enemy import ENEMY_MOVES, PLAYER_MOVES
+from rpg.tuner import (
+    Candidate, Targets, TuningCache, sample_candidates, simulate, table, tune
+)
+
+ONE_HIT = {"Spin": (100, 100), "Flip": (100, 100), "Body roll": (100, 100)}
+SCRATCH = {"Spin": (1, 1), "Flip": (1, 1), "Body roll": (1, 1)}
+
+
+class TestSimulate(unittest.TestCase):
+    """
+    Unit tests for the batched battles.
+    """
+
+    def test_one_sided_battles(self) -> None:
+        """Test battles whose outcome does not depend on luck."""
+        self.assertEqual(simulate(ONE_HIT, SCRATCH, 50, random.Random(1)),
+                         (50, 50, 50, 50))
+        self.assertEqual(simulate(SCRATCH, ONE_HIT, 50, random.Random(1)),
+                         (50, 0, 50, 50))
+
+    def test_game_tables(self) -> None:
+        """Test the game's own tables for a plausible outcome."""
+        battles, wins, exchanges, _ = simulate(
+            PLAYER_MOVES, ENEMY_MOVES, 2000, random.Random(2)
+        )
+        self.assertTrue(0.2 < wins / battles < 0.8)
+        self.assertTrue(4 < exchanges / battles < 10)
+
+
+class TestTuner(unittest.TestCase):
+    """
+    Unit tests for the balance tuner.
+    """
+
+    def setUp(self) -> None:
+        """Pick a small, fixed set of candidates."""
+        self.candidates = sample_candidates(40, seed=5)
+
+    def test_sample_candidates(self) -> None:
+        """Test that the game's tables come first and none repeat."""
+        self.assertEqual(self.candidates[0].player_moves, PLAYER_MOVES)
+        self.assertEqual(len({c.key for c in self.candidates}), 40)
+
+    def test_loss(self) -> None:
+        """Test the loss and its lower bound."""
+        targets = Targets(win_rate=0.5, exchanges=4)
+        self.assertEqual(targets.loss((100, 50, 400, 1600)), 0.0)
+        self.assertAlmostEqual(targets.loss((100, 60, 500, 2600)), 0.35)
+        self.assertLess(targets.loss((100, 60, 500, 2600), slack=3), 0.35)
+
+    def test_ranking_and_early_stopping(self) -> None:
+        """Test that results are ranked and hopeless ones cut short."""
+        hopeless = Candidate(SCRATCH, ONE_HIT)
+        results = tune(self.candidates + [hopeless], battles=1000,
+                       batch=100, top=3, workers=1)
+
+        finished = [r for r in results if not r.stopped]
+        self.assertGreaterEqual(len(finished), 3)
+        self.assertEqual([r.loss for r in finished],
+                         sorted(r.loss for r in finished))
+        self.assertEqual([r.stopped for r in results],
+                         sorted(r.stopped for r in results))
+        last = next(r for r in results if r.candidate is hopeless)
+        self.assertTrue(last.stopped)
+        self.assertLess(last.stats[0], 1000)
+        self.assertIn("rank", table(results, top=3).splitlines()[0])
+        self.assertEqual(len(table(results, top=3).splitlines()), 4)
+
+    def test_cache_resumes(self) -> None:
+        """Test that a second run reuses the first run's battles."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.json")
+            first = tune(self.candidates, battles=600, batch=100, top=3,
+                         workers=1, cache=TuningCache(path))
+            cache = TuningCache(path)
+            self.assertEqual(len(cache), 40)
+            second = tune(self.candidates, battles=600, batch=100, top=3,
+                          workers=1, cache=cache)
+
+        self.assertEqual(sum(r.simulated for r in second), 0)
+        self.assertEqual([r.candidate.key for r in first],
+                         [r.candidate.key for r in second])
+
+    def test_parallel_matches_serial(self) -> None:
+        """Test that worker processes play exactly the same battles."""
+        serial = tune(self.candidates[:8], battles=300, workers=1)
+        parallel = tune(self.candidates[:8], battles=300, workers=2)
+        self.assertEqual([(r.candidate.key, r.stats) for r in serial],
+                         [(r.candidate.key, r.stats) for r in parallel])
+
+
+if __name__ == "__main__":
+    unittest.main()
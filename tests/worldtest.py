@@ -0,0 +1,158 @@
+import threading
+import unittest
+from unittest.mock import patch
+from rpg.game import Game
+from rpg.npcs.enemy import Enemy
+from rpg.npcs.npc import NPC
+from rpg.room.room import Room
+from rpg.world import World, build_default_world
+
+
+class TestWorld(unittest.TestCase):
+    """
+    Unit tests for the shared World and its per-room locking.
+    """
+
+    def setUp(self) -> None:
+        """Set up a two-room world with an enemy in the first room."""
+        self.arena = Room(description="Arena")
+        self.lobby = Room(description="Lobby")
+        self.enemy = Enemy(description="Vlad", interact_message="Hi!")
+        self.arena.add_npc(self.enemy)
+        self.world = World(
+            {"Arena": self.arena, "Lobby": self.lobby}, self.lobby
+        )
+
+    def test_each_room_has_its_own_lock(self) -> None:
+        """Test that different rooms never share a lock."""
+        self.assertIsNot(
+            self.world.lock_for(self.arena), self.world.lock_for(self.lobby)
+        )
+        self.assertIs(
+            self.world.lock_for(self.arena), self.world.lock_for(self.arena)
+        )
+
+    def test_lock_for_room_added_later(self) -> None:
+        """Test that rooms created after the world still get a lock."""
+        cellar = Room(description="Cellar")
+        self.assertIs(
+            self.world.lock_for(cellar), self.world.lock_for(cellar)
+        )
+
+    def test_remove_npc_matches_identity(self) -> None:
+        """Test that removal picks the exact NPC, not an equal one."""
+        twin = NPC(description="Twin", interact_message="Hi")
+        other_twin = NPC(description="Twin", interact_message="Hi")
+        self.lobby.add_npc(twin)
+        self.lobby.add_npc(other_twin)
+
+        self.assertTrue(self.world.remove_npc(self.lobby, other_twin))
+        self.assertIs(self.lobby.npcs[0], twin)
+        self.assertFalse(self.world.remove_npc(self.lobby, other_twin))
+
+    def test_strike_reports_already_defeated(self) -> None:
+        """Test that hitting a defeated enemy is refused."""
+        self.assertEqual(self.world.strike(self.arena, self.enemy, 60), 40)
+        self.assertEqual(self.world.strike(self.arena, self.enemy, 60), -20)
+        self.assertIsNone(self.world.strike(self.arena, self.enemy, 60))
+        self.assertEqual(self.enemy._health, -20)
+
+    def test_concurrent_removal_succeeds_once(self) -> None:
+        """Test that only one of many racing players removes an NPC."""
+        results = []
+
+        def remove() -> None:
+            results.append(self.world.remove_npc(self.arena, self.enemy))
+
+        threads = [threading.Thread(target=remove) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(len(self.arena.npcs), 0)
+
+    def test_reset_restores_changed_rooms(self) -> None:
+        """Test that reset brings back removed NPCs and enemy health."""
+        self.world.strike(self.arena, self.enemy, 150)
+        self.world.remove_npc(self.arena, self.enemy)
+        self.world.add_npc(
+            self.lobby, NPC(description="Visitor", interact_message="Yo")
+        )
+
+        self.world.reset()
+
+        self.assertEqual(len(self.arena.npcs), 1)
+        self.assertIs(self.arena.npcs[0], self.enemy)
+        self.assertEqual(self.enemy._health, 100)
+        self.assertEqual(len(self.lobby.npcs), 0)
+
+    def test_reset_skips_untouched_rooms(self) -> None:
+        """Test that direct changes need touch() or a full reset."""
+        self.enemy._health = 10
+        self.world.reset()
+        self.assertEqual(self.enemy._health, 10)
+
+        self.world.touch(self.arena)
+        self.world.reset()
+        self.assertEqual(self.enemy._health, 100)
+
+        self.enemy._health = 10
+        self.world.reset(everything=True)
+        self.assertEqual(self.enemy._health, 100)
+
+
+class TestSharedGame(unittest.TestCase):
+    """
+    Tests for several Game sessions playing in one shared world.
+    """
+
+    @patch("builtins.print")
+    def test_players_share_rooms_and_enemies(self, _) -> None:
+        """Test that damage dealt by one player is seen by the other."""
+        world = build_default_world()
+        first = Game(world=world, player_name="First")
+        second = Game(world=world, player_name="Second")
+
+        self.assertIs(first.rooms, second.rooms)
+        self.assertIs(first.player._current_room, world.start_room)
+        vlad = world.rooms["Room 2"].npcs[1]
+        world.strike(world.rooms["Room 2"], vlad, 30)
+        self.assertEqual(second.rooms["Room 2"].npcs[1]._health, 70)
+
+    @patch("builtins.print")
+    def test_shared_reset_keeps_world(self, _) -> None:
+        """Test that resetting one player leaves the shared world alone."""
+        world = build_default_world()
+        game = Game(world=world)
+        game.player.enter_room(world.rooms["Room 6"])
+        world.rooms["Room 6"].npcs[0]._health = 0
+
+        game.reset_game()
+
+        self.assertIs(game.world, world)
+        self.assertIs(game.player._current_room, world.start_room)
+        self.assertEqual(world.rooms["Room 6"].npcs[0]._health, 0)
+
+    @patch("builtins.print")
+    def test_private_reset_reuses_default_world(self, _) -> None:
+        """Test that a private game resets its world instead of rebuilding."""
+        game = Game()
+        world = game.world
+        room_2 = world.rooms["Room 2"]
+        vlad = room_2.npcs[1]
+        world.strike(room_2, vlad, 200)
+        world.remove_npc(room_2, vlad)
+        game.player.enter_room(room_2)
+
+        game.reset_game()
+
+        self.assertIs(game.world, world)
+        self.assertIs(room_2.npcs[1], vlad)
+        self.assertEqual(vlad._health, 100)
+        self.assertIs(game.player._current_room, world.start_room)
+
+
+if __name__ == "__main__":
+    unittest.main()